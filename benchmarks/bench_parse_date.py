@@ -0,0 +1,70 @@
+"""
+Benchmark of parsing the date items found in configs with
+:func:`~inicheck.utilities.parse_date` against calling dateparser directly.
+
+Run from the repo with inicheck installed, e.g. pip install -e .
+
+    python benchmarks/bench_parse_date.py
+"""
+import timeit
+
+import dateparser
+
+from inicheck.utilities import (DATEPARSER_SETTINGS, parse_date,
+                                parse_date_string)
+
+# Date items as they appear in configs, e.g. start_date, end_date and the
+# decay dates of tests/test_configs/full_config.ini
+DATES = [
+    '2016-10-01 00:00:00',
+    '2017-1-01 00:00:00',
+    '2017-04-15 00:00:00+00:00',
+    '2017-08-15 00:00:00+00:00',
+    '10-01-2019',
+    '09-04-2019',
+    '2019-10-1',
+    '2019-10-1 10:00',
+    '1998-01-14 15:00:00',
+    '10/01/2019 10:00',
+    '2019-10-1 10:00 MST',
+    '1 October 2019',
+]
+
+
+def parse_with_dateparser():
+    for value in DATES:
+        dateparser.parse(value, settings=DATEPARSER_SETTINGS)
+
+
+def parse_cold():
+    parse_date_string.cache_clear()
+
+    for value in DATES:
+        parse_date(value)
+
+
+def parse_warm():
+    for value in DATES:
+        parse_date(value)
+
+
+def main(number=50):
+    # Keep dateparser's first call warm up out of the timings
+    parse_with_dateparser()
+
+    print("Parsing {} date items {} times".format(len(DATES), number))
+
+    results = []
+    for name, fn in [('dateparser', parse_with_dateparser),
+                     ('parse_date, no memo', parse_cold),
+                     ('parse_date, memoized', parse_warm)]:
+        seconds = timeit.timeit(fn, number=number)
+        results.append(seconds)
+
+        per_item = seconds / (number * len(DATES)) * 1e6
+        print("{: <25} {: >10.4f} s {: >10.1f} us/item {: >8.1f}x".format(
+            name, seconds, per_item, results[0] / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+Benchmark suite timing the main stages of inicheck on the synthetic
+workloads of :mod:`workloads`, so performance changes can be measured
+against the same configs every time. Results can be saved as a baseline and
+later runs compared against it.
+
+Run from the repo with inicheck installed, e.g. pip install -e .
+
+    python benchmarks/bench_suite.py --size small medium
+    python benchmarks/bench_suite.py --save benchmarks/baselines/mine.json
+    python benchmarks/bench_suite.py --compare benchmarks/baselines/mine.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from collections import OrderedDict
+
+from inicheck.changes import ChangeLog
+from inicheck.cli import current_version, inidiff_main
+from inicheck.config import MasterConfig, UserConfig, copy_sections
+from inicheck.iniparse import read_config
+from inicheck.output import generate_config
+from inicheck.tools import cast_all_variables, check_config, get_user_config
+from workloads import SIZES, generate_workload
+
+# Ratio of the current to the baseline time beyond which a result is
+# reported as a change
+THRESHOLD = 1.10
+
+
+def benchmarks(workload, out_dir):
+    """
+    The benchmarks of a workload, each prepared so only the stage itself is
+    timed
+
+    Args:
+        workload: Workload written by generate_workload
+        out_dir: Directory for the files written by the benchmarks
+
+    Returns:
+        OrderedDict: benchmark names and functions to time
+    """
+    master = [workload.master, workload.recipes]
+    mcfg = MasterConfig(path=master, changelogs=workload.changelog)
+
+    ucfg = UserConfig(workload.config, mcfg=mcfg)
+    ucfg.apply_recipes()
+
+    casted = get_user_config(workload.config, mcfg=mcfg)
+
+    old_ucfg = UserConfig(workload.old_config, mcfg=mcfg)
+    changelog = ChangeLog(paths=mcfg.changelogs, mcfg=mcfg)
+
+    out_file = os.path.join(out_dir, 'generated.ini')
+
+    def cast():
+        # Casting replaces the values, so start over from the recipes
+        ucfg.cfg = copy_sections(ucfg.recipe_cfg)
+        cast_all_variables(ucfg, mcfg)
+
+    def inidiff():
+        with contextlib.redirect_stdout(io.StringIO()):
+            inidiff_main([workload.config, workload.other_config],
+                         master=master)
+
+    return OrderedDict([
+        ('read_config', lambda: read_config(workload.config)),
+        ('MasterConfig', lambda: MasterConfig(
+            path=master, changelogs=workload.changelog)),
+        ('apply_recipes', ucfg.apply_recipes),
+        ('check_config', lambda: check_config(ucfg)),
+        ('cast_all_variables', cast),
+        ('get_active_changes', lambda: changelog.get_active_changes(
+            old_ucfg)),
+        ('generate_config', lambda: generate_config(casted, out_file)),
+        ('get_user_config', lambda: get_user_config(workload.config,
+                                                    mcfg=mcfg,
+                                                    changelog=changelog)),
+        ('inidiff_main', inidiff),
+    ])
+
+
+def time_function(fn, repeat=5, min_time=0.2):
+    """
+    Times a function the way timeit does, calling it enough times per
+    repeat to take at least min_time
+
+    Returns:
+        dict: best and median seconds per call, calls per repeat and repeats
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+
+    while True:
+        seconds = timer.timeit(number)
+
+        if seconds >= min_time or number >= 1000:
+            break
+
+        number *= 10 if seconds < min_time / 10 else 2
+
+    times = sorted(t / number for t in timer.repeat(repeat, number))
+
+    return OrderedDict([('best', times[0]),
+                        ('median', times[len(times) // 2]),
+                        ('number', number),
+                        ('repeat', repeat)])
+
+
+def run_suite(sizes, names=None, repeat=5, min_time=0.2, out=None):
+    """
+    Runs the benchmarks on workloads of the given sizes
+
+    Args:
+        sizes: list of names of SIZES
+        names: list of benchmark names to run, None runs all of them
+        repeat: Number of times each benchmark is repeated
+        min_time: Seconds each repeat should at least take
+        out: file to print progress to, defaults to stdout
+
+    Returns:
+        OrderedDict: results with the versions used and a dictionary of the
+                     timings of each benchmark keyed by size/benchmark
+    """
+    if out is None:
+        out = sys.stdout
+
+    results = OrderedDict([
+        ('inicheck', current_version() or 'unknown'),
+        ('python', platform.python_version()),
+        ('machine', platform.machine()),
+        ('workloads', OrderedDict((s, SIZES[s]) for s in sizes)),
+        ('benchmarks', OrderedDict()),
+    ])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            directory = os.path.join(tmp, size)
+            workload = generate_workload(directory, **SIZES[size])
+
+            for name, fn in benchmarks(workload, directory).items():
+                if names is not None and name not in names:
+                    continue
+
+                key = '{}/{}'.format(size, name)
+                result = time_function(fn, repeat=repeat, min_time=min_time)
+                results['benchmarks'][key] = result
+
+                print("{: <30} {: >12}".format(key,
+                                               format_time(result['best'])),
+                      file=out, flush=True)
+
+    return results
+
+
+def format_time(seconds):
+    """
+    Formats seconds with a unit that keeps the number readable
+    """
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if seconds >= scale:
+            return "{:0.2f} {}".format(seconds / scale, unit)
+
+    return "{:0.2f} ns".format(seconds / 1e-9)
+
+
+def compare_results(baseline, current, threshold=THRESHOLD):
+    """
+    Compares the best times of two runs of the suite
+
+    Args:
+        baseline: results of run_suite to compare against
+        current: results of run_suite being compared
+        threshold: ratio of the times beyond which a result is reported as
+                   slower or faster
+
+    Returns:
+        list: tuples of the benchmark, baseline seconds, current seconds,
+              ratio and status of slower, faster or same for each benchmark
+              of the current run. Benchmarks missing from the baseline have
+              a status of new and None for the baseline and ratio.
+    """
+    comparison = []
+    old = baseline['benchmarks']
+    new = current['benchmarks']
+
+    for key in new.keys():
+        if key not in old:
+            comparison.append((key, None, new[key]['best'], None, 'new'))
+            continue
+
+        b = old[key]['best']
+        c = new[key]['best']
+        ratio = c / b
+
+        if ratio > threshold:
+            status = 'slower'
+        elif ratio < 1 / threshold:
+            status = 'faster'
+        else:
+            status = 'same'
+
+        comparison.append((key, b, c, ratio, status))
+
+    return comparison
+
+
+def print_comparison(comparison, baseline, out=None):
+    """
+    Prints a table of compare_results
+    """
+    if out is None:
+        out = sys.stdout
+
+    msg = "{: <30} {: >12} {: >12} {: >8}  {}"
+
+    print("\nComparison against inicheck {} on python {}".format(
+        baseline['inicheck'], baseline['python']), file=out)
+    print(msg.format("Benchmark", "Baseline", "Current", "Ratio", "Status"),
+          file=out)
+    print("-" * 80, file=out)
+
+    for key, b, c, ratio, status in comparison:
+        print(msg.format(key,
+                         '-' if b is None else format_time(b),
+                         '-' if c is None else format_time(c),
+                         '-' if ratio is None else "{:0.2f}x".format(ratio),
+                         status.upper() if status == 'slower' else status),
+              file=out)
+
+    slower = len([c for c in comparison if c[4] == 'slower'])
+    faster = len([c for c in comparison if c[4] == 'faster'])
+    print("\n{} benchmarks: {} slower, {} faster".format(len(comparison),
+                                                         slower, faster),
+          file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Times inicheck on synthetic workloads and compares the"
+                    " results against a saved baseline")
+    parser.add_argument('--size', '-s', nargs='+', choices=SIZES.keys(),
+                        default=['small', 'medium'],
+                        help="Sizes of the workloads to run")
+    parser.add_argument('--bench', '-b', nargs='+', default=None,
+                        help="Names of the benchmarks to run, default all")
+    parser.add_argument('--repeat', '-r', type=int, default=5,
+                        help="Number of times to repeat each benchmark")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="Seconds each repeat should at least take")
+    parser.add_argument('--save', metavar='FILE',
+                        help="Save the results as JSON to use as a baseline")
+    parser.add_argument('--compare', metavar='FILE',
+                        help="Baseline JSON to compare the results against")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="Ratio of the times reported as a change")
+    parser.add_argument('--fail', action='store_true',
+                        help="Exit with 1 if any benchmark is slower than "
+                             "the baseline")
+    args = parser.parse_args()
+
+    results = run_suite(args.size, names=args.bench, repeat=args.repeat,
+                        min_time=args.min_time)
+
+    if args.save:
+        directory = os.path.dirname(os.path.abspath(args.save))
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+        print("\nResults saved to {}".format(args.save))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f, object_pairs_hook=OrderedDict)
+
+        comparison = compare_results(baseline, results,
+                                     threshold=args.threshold)
+        print_comparison(comparison, baseline)
+
+        if args.fail and any(c[4] == 'slower' for c in comparison):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Synthetic workloads for the inicheck benchmarks. A workload is a master
+config, its recipes and change log and user configs written to a directory,
+scaled by the number of sections, items per section, length of list values,
+recipes and change log entries so each part of inicheck can be pushed
+independently.
+
+    python benchmarks/workloads.py out_dir --sections 50 --items 40
+"""
+import argparse
+import os
+from collections import OrderedDict, namedtuple
+
+# Sizes of the workloads the suite runs by default
+SIZES = OrderedDict([
+    ('small', dict(sections=5, items=10, list_length=3, recipes=5,
+                   changes=10)),
+    ('medium', dict(sections=20, items=25, list_length=10, recipes=20,
+                    changes=50)),
+    ('large', dict(sections=60, items=40, list_length=50, recipes=60,
+                   changes=200)),
+])
+
+# Paths of a generated workload
+Workload = namedtuple('Workload', ['directory', 'master', 'recipes',
+                                   'changelog', 'config', 'other_config',
+                                   'old_config', 'params'])
+
+# Item types cycled through in every section with a function returning the
+# master default and user value for the item number and list length
+ITEM_TYPES = [
+    ('int', lambda j, n: ('{}'.format(j), '{}'.format(j + 1))),
+    ('float', lambda j, n: ('{}.5'.format(j), '{}.25'.format(j))),
+    ('bool', lambda j, n: ('False', 'True')),
+    ('string', lambda j, n: ('value_{}'.format(j), 'user_{}'.format(j))),
+    ('datetime', lambda j, n: ('2019-10-01',
+                               '2020-{:02d}-15 12:00'.format(j % 12 + 1))),
+    ('int list', lambda j, n: (' '.join(str(k) for k in range(n)),
+                               ', '.join(str(k * j) for k in range(n)))),
+    ('string list', lambda j, n: (' '.join('a{}'.format(k)
+                                           for k in range(n)),
+                                  ', '.join('b{}'.format(k)
+                                            for k in range(n)))),
+    ('filename', lambda j, n: ('file_{}.txt'.format(j),
+                               './out/file_{}.txt'.format(j))),
+    ('float', lambda j, n: ('0.5', '1.5')),
+]
+
+
+def section_name(k):
+    return 'section_{:03d}'.format(k)
+
+
+def item_name(j):
+    return 'item_{:03d}'.format(j)
+
+
+def item_type(j):
+    return ITEM_TYPES[j % len(ITEM_TYPES)]
+
+
+def master_lines(sections, items, list_length):
+    """
+    Lines of a master config with every item type, bounded floats and
+    options
+    """
+    lines = ['# Synthetic master config for benchmarking inicheck', '']
+
+    for k in range(sections):
+        lines.append('[{}]'.format(section_name(k)))
+        lines.append('')
+
+        for j in range(items):
+            type_name, values = item_type(j)
+            default = values(j, list_length)[0]
+
+            lines.append('{}:'.format(item_name(j)))
+            lines.append('default = {},'.format(default))
+            lines.append('type = {},'.format(type_name))
+
+            # Every last float of the cycle is bounded
+            if j % len(ITEM_TYPES) == len(ITEM_TYPES) - 1:
+                lines.append('min = 0,')
+                lines.append('max = 1.0,')
+
+            # Strings are restricted to a set of options in every other
+            # section
+            if type_name == 'string' and k % 2 == 0:
+                lines.append('options = [value_{0} user_{0} other],'
+                             ''.format(j))
+
+            lines.append('description = Item {} of section {}'.format(j, k))
+            lines.append('')
+
+    return lines
+
+
+def recipe_lines(sections, items, recipes):
+    """
+    Lines of recipes alternating between applying the defaults of a section
+    and setting items when another item has a value
+    """
+    lines = []
+
+    for r in range(recipes):
+        s = section_name(r % sections)
+        lines.append('[recipe_{:03d}_recipe]'.format(r))
+
+        if r % 2 == 0:
+            lines.append('trigger_section:')
+            lines.append('  has_section = {}'.format(s))
+            lines.append('')
+            lines.append('{}:'.format(s))
+            lines.append('  apply_defaults = True')
+
+        else:
+            trigger = item_name(2 % items)
+            lines.append('trigger_item:')
+            lines.append('  has_value = [{} {} True]'.format(s, trigger))
+            lines.append('')
+            lines.append('{}:'.format(s))
+
+            adjusted = [item_name(j) for j in range(min(items, 4))
+                        if item_name(j) != trigger]
+            lines.append('  ' + ',\n  '.join('{} = default'.format(i)
+                                             for i in adjusted))
+
+        lines.append('')
+
+    return lines
+
+
+def changelog_lines(sections, items, changes):
+    """
+    Lines of a change log renaming and removing items of the master config
+    """
+    lines = ['[meta]',
+             'info: Synthetic change log for benchmarking inicheck',
+             'date: 10-01-2019',
+             '',
+             '[changes]']
+
+    for c in range(changes):
+        s = section_name(c % sections)
+
+        if c % 4 == 3:
+            lines.append('{}/removed_{:03d} -> REMOVED'.format(s, c))
+        else:
+            lines.append('{}/old_{:03d} -> {}/{}'.format(s, c, s,
+                                                        item_name(c % items)))
+
+    lines.append('')
+
+    return lines
+
+
+def config_lines(sections, items, list_length, seed=0, deprecated=0):
+    """
+    Lines of a user config setting two out of every three items, leaving the
+    rest to the recipes
+
+    Args:
+        seed: Number shifting which items are set, to make configs that
+              differ for inidiff
+        deprecated: Number of change log entries to add the old items of
+    """
+    lines = ['# Synthetic user config for benchmarking inicheck', '']
+
+    for k in range(sections):
+        lines.append('[{}]'.format(section_name(k)))
+
+        for j in range(items):
+            if (j + seed) % 3 == 1:
+                continue
+
+            value = item_type(j)[1](j, list_length)[1]
+            lines.append('{:<20}{}'.format(item_name(j) + ':', value))
+
+        for c in range(k, deprecated, sections):
+            if c % 4 == 3:
+                lines.append('removed_{:03d}:       1'.format(c))
+            else:
+                lines.append('old_{:03d}:           1'.format(c))
+
+        lines.append('')
+
+    return lines
+
+
+def write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+    return path
+
+
+def generate_workload(directory, sections=10, items=20, list_length=5,
+                      recipes=10, changes=20):
+    """
+    Writes a synthetic workload to a directory
+
+    Args:
+        directory: Directory to write the files to, created if needed
+        sections: Number of sections in the master and user configs
+        items: Number of items in each section
+        list_length: Number of values in list items
+        recipes: Number of recipes
+        changes: Number of change log entries
+
+    Returns:
+        Workload: paths of the files written and the parameters used
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    items = max(items, 3)
+    params = OrderedDict([('sections', sections), ('items', items),
+                          ('list_length', list_length), ('recipes', recipes),
+                          ('changes', changes)])
+
+    def path(name):
+        return os.path.join(os.path.abspath(directory), name)
+
+    return Workload(
+        directory=os.path.abspath(directory),
+        master=write_lines(path('master.ini'),
+                           master_lines(sections, items, list_length)),
+        recipes=write_lines(path('recipes.ini'),
+                            recipe_lines(sections, items, recipes)),
+        changelog=write_lines(path('changelog.ini'),
+                              changelog_lines(sections, items, changes)),
+        config=write_lines(path('config.ini'),
+                           config_lines(sections, items, list_length)),
+        other_config=write_lines(path('other_config.ini'),
+                                 config_lines(sections, items, list_length,
+                                              seed=1)),
+        old_config=write_lines(path('old_config.ini'),
+                               config_lines(sections, items, list_length,
+                                            deprecated=changes)),
+        params=params)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Writes a synthetic master config, recipes, change log"
+                    " and user configs for benchmarking inicheck")
+    parser.add_argument('directory', help="Directory to write the files to")
+
+    for name, value in SIZES['medium'].items():
+        parser.add_argument('--' + name, type=int, default=value,
+                            help="Default {}".format(value))
+
+    args = parser.parse_args()
+    params = {name: getattr(args, name) for name in SIZES['medium'].keys()}
+    workload = generate_workload(args.directory, **params)
+
+    for name in Workload._fields[1:-1]:
+        print(getattr(workload, name))
+
+
+if __name__ == '__main__':
+    main()
@@ -138,50 +138,79 @@ class ChangeLog(object):
 
         for change in self.changes:
 
-            # Go through the sections
-            for s in cfg.keys():
+            # Go through the sections and items that could match
+            for s, i in self.get_candidates(ucfg, change[0]):
+
+                # Assign original changes to any's
+                assumed = change[0].copy()
+                new = change[1].copy()
+
+                # Swap out anys with section names
+                if change[0][0] == "any":
+                    assumed[0] = s
+                    if change[1][0] != "removed":
+                        new[0] = s
+
+                # swap out anys with item names
+                if change[0][1] == "any":
+                    assumed[1] = i
+                    if change[1][0] != "removed":
+                        new[1] = i
+
+                # If we have a match from the changelog and the ucfg
+                if assumed[0] == s and assumed[1] == i:
+                    if "removed" in new:
+                        required_changes.append([assumed, "removed"])
+
+                    # Make sure "any" doesn't disagree with master
+                    elif new[0] in ucfg.mcfg.cfg.keys():
+                        if new[1] in ucfg.mcfg.cfg[new[0]].keys():
+
+                            # Check for an old default match and suggest a
+                            # change
+                            if assumed[2] == "default":
+
+                                value = str(mk_lst(cfg[s][i], unlst=True))
+                                if value == assumed[3]:
+                                    potential_changes.append(
+                                        [assumed, new])
+
+                            else:
+                                required_changes.append([assumed, new])
 
-                # Go through the items
-                for i in cfg[s].keys():
-
-                    # Assign original changes to any's
-                    assumed = change[0].copy()
-                    new = change[1].copy()
-
-                    # Swap out anys with section names
-                    if change[0][0] == "any":
-                        assumed[0] = s
-                        if change[1][0] != "removed":
-                            new[0] = s
+        return potential_changes, required_changes
 
-                    # swap out anys with item names
-                    if change[0][1] == "any":
-                        assumed[1] = i
-                        if change[1][0] != "removed":
-                            new[1] = i
+    def get_candidates(self, ucfg, old):
+        """
+        Finds the section and item pairs in the users config that could
+        match the old side of a change. The config is read directly rather
+        than through ucfg.index so edits made straight to ucfg.cfg are seen.
 
-                    # If we have a match from the changelog and the ucfg
-                    if assumed[0] == s and assumed[1] == i:
-                        if "removed" in new:
-                            required_changes.append([assumed, "removed"])
+        Args:
+            ucfg: UserConfig Object
+            old: List of len 4 describing the old config entry
 
-                        # Make sure "any" doesn't disagree with master
-                        elif new[0] in ucfg.mcfg.cfg.keys():
-                            if new[1] in ucfg.mcfg.cfg[new[0]].keys():
+        Returns:
+            list: (section, item) tuples in the order of the users config
+        """
+        cfg = ucfg.cfg
+        section, item = old[0], old[1]
 
-                                # Check for an old default match and suggest a
-                                # change
-                                if assumed[2] == "default":
+        if section != 'any':
+            sections = [section] if section in cfg.keys() else []
+        else:
+            sections = cfg.keys()
 
-                                    value = str(mk_lst(cfg[s][i], unlst=True))
-                                    if value == assumed[3]:
-                                        potential_changes.append(
-                                            [assumed, new])
+        candidates = []
 
-                                else:
-                                    required_changes.append([assumed, new])
+        for s in sections:
+            if item != 'any':
+                if item in cfg[s].keys():
+                    candidates.append((s, item))
+            else:
+                candidates += [(s, i) for i in cfg[s].keys()]
 
-        return potential_changes, required_changes
+        return candidates
 
     def apply_changes(self, ucfg, potentials, changes):
         """
@@ -195,7 +224,7 @@ class ChangeLog(object):
                     representing detected changes
 
         Returns:
-            cfg: Config dictionary
+            cfg: Config dictionary, ucfg.index is updated to match it
         """
 
         cfg = ucfg.cfg.copy()
@@ -207,6 +236,7 @@ class ChangeLog(object):
 
             # assign the new defaults
             cfg[s_o][i_o] = p[1][3]
+            ucfg.index.set(s_o, i_o, p[1][3])
 
         for c in changes:
             removal = False
@@ -225,10 +255,12 @@ class ChangeLog(object):
             if not removal:
                 if s_n not in ucfg.cfg.keys():
                     cfg[s_n] = OrderedDict()
+                    ucfg.index.add_section(s_n)
 
             # Its been deprecated
             if removal:
                 del cfg[s_o][i_o]
+                ucfg.index.discard(s_o, i_o)
 
             # Item or section is a name transfer.
             elif s_o in ucfg.cfg.keys():
@@ -236,12 +268,15 @@ class ChangeLog(object):
 
                     if s_n != "removed":
                         cfg[s_n][i_n] = cfg[s_o][i_o]
+                        ucfg.index.set(s_n, i_n, cfg[s_n][i_n])
 
                     del cfg[s_o][i_o]
+                    ucfg.index.discard(s_o, i_o)
 
                 # look to remove a whole section
                 if len(cfg[s_o].keys()
                        ) == 0 and s_o not in ucfg.mcfg.cfg.keys():
                     del(cfg[s_o])
+                    ucfg.index.discard_section(s_o)
 
         return cfg
@@ -3,12 +3,109 @@ Functions for checking values in a config file and producing
 errors and warnings
 '''
 
+import hashlib
+import atexit
+import json
 import os
+import stat
+import threading
+import time
+from collections import OrderedDict
 
 import requests
 
-from .utilities import (get_kw_match, is_kw_matched, is_valid, mk_lst,
-                        parse_date)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .timings import count
+from .utilities import get_ordered_pairs, is_valid, mk_lst, parse_date
+
+
+# Entry point group packages can list their checker classes under
+CHECKER_ENTRY_POINT_GROUP = 'inicheck.checkers'
+
+# Type names to checker classes registered with register_checker
+registered_checkers = OrderedDict()
+
+
+def register_checker(cls=None, name=None):
+    """
+    Registers a checker class for a type name in the master config. The
+    name is used as given, lower cased, instead of being derived from the
+    class name. Can be used as a decorator with or without a name:
+
+    .. code-block:: python
+
+        @register_checker
+        class CheckStation(CheckType):
+            ...
+
+        @register_checker(name='station id')
+        class StationIdChecker(CheckType):
+            ...
+
+    Args:
+        cls: Checker class to register
+        name: Type name for the checker, defaults to the class name without
+              the word check. Spaces are removed like in the master config.
+
+    Returns:
+        cls: The class registered, or a decorator when no class is given
+    """
+    if cls is None:
+        return lambda c: register_checker(c, name=name)
+
+    if not (isinstance(cls, type) and issubclass(cls, GenericCheck)):
+        raise TypeError("Checkers must be subclasses of GenericCheck, "
+                        "received {}".format(cls))
+
+    if name is None:
+        name = cls.__name__.lower().replace('check', '', 1)
+
+    registered_checkers[name.lower().replace(' ', '')] = cls
+
+    return cls
+
+
+def load_entry_point_checkers():
+    """
+    Registers the checker classes installed packages list under the entry
+    point group inicheck.checkers, named by the type name they check, e.g.
+
+    .. code-block:: python
+
+        entry_points={
+            'inicheck.checkers': ['station = mypackage.checkers:CheckStation']
+        }
+
+    Entry points are only loaded once.
+    """
+    global _entry_points_loaded
+
+    if _entry_points_loaded:
+        return
+
+    _entry_points_loaded = True
+
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return
+
+    found = entry_points()
+
+    if hasattr(found, 'select'):
+        found = found.select(group=CHECKER_ENTRY_POINT_GROUP)
+    else:
+        found = found.get(CHECKER_ENTRY_POINT_GROUP, [])
+
+    for ep in found:
+        register_checker(ep.load(), name=ep.name)
+
+
+_entry_points_loaded = False
 
 
 class GenericCheck(object):
@@ -36,6 +133,19 @@ class GenericCheck(object):
                 log.info(b.message)
     """
 
+    # Whether the check depends on other items in the same section, used to
+    # determine what needs re-checking when a single item changes
+    cross_item = False
+
+    # Whether the check mostly waits on the file system or network, these
+    # are run concurrently by check_config
+    io_bound = False
+
+    # Whether a single checker can be pointed at one entry after another by
+    # set_entry, used by check_many and friends. Only set this when __init__
+    # has no state depending on the section or item.
+    batched = False
+
     def __init__(self, **kwargs):
         """
         Instatiates the check and setups the message, value and msg_level.
@@ -69,18 +179,113 @@ class GenericCheck(object):
             raise ValueError("msg_level = {0} not allowed."
                              "".format(self.msg_level))
 
+        self.set_entry(self.config, self.section, self.item)
+
+        # Auto retrieve the type name from the class name which is always
+        # Check<type name>
+        self.type = type(self).__name__.lower().replace('check', '', 1)
+
+    def set_entry(self, config, section, item):
+        """
+        Points the checker at an entry of a config, setting up everything
+        that depends on the item.
+
+        Args:
+            config: UserConfig object containing the entry
+            section: Name of the section containing the item
+            item: Name of the item being evaluated
+        """
+        self.config = config
+        self.section = section
+        self.item = item
+
         # Initial values are set from the config directly, can be a list
         self.values = self.config.cfg[self.section][self.item]
 
+        entry = self.config.mcfg.cfg[self.section][self.item]
+
         # Are the values received supposed to be a list?
-        self.is_list = self.config.mcfg.cfg[self.section][self.item].listed
+        self.is_list = entry.listed
 
         # Allow None as a value?
-        self.allow_none = self.config.mcfg.cfg[self.section][self.item].allow_none  # noqa
+        self.allow_none = entry.allow_none
 
-        # Auto retrieve the type name from the class name which is always
-        # Check<type name>
-        self.type = type(self).__name__.lower().replace('check', '')
+    @classmethod
+    def run_many(cls, entries, method, **kwargs):
+        """
+        Calls a method of a checker for each entry. Batched checkers reuse a
+        single checker, and anything it remembers such as casted values, for
+        all the entries, others make a checker per entry.
+
+        Args:
+            entries: List of (config, section, item) tuples
+            method: Function taking a checker pointed at an entry
+            kwargs: Keywords passed on to the checker e.g. path_cache
+
+        Returns:
+            list: The results of method for each entry
+        """
+        results = []
+        checker = None
+
+        for config, section, item in entries:
+            if checker is None or not cls.batched:
+                checker = cls(config=config, section=section, item=item,
+                              **kwargs)
+            else:
+                checker.set_entry(config, section, item)
+
+            results.append(method(checker))
+
+        return results
+
+    @classmethod
+    def check_many(cls, entries, **kwargs):
+        """
+        Checks several entries of this type at once, which can come from
+        different configs.
+
+        Args:
+            entries: List of (config, section, item) tuples
+            kwargs: Keywords passed on to the checker
+
+        Returns:
+            list: The issues from check() for each entry
+        """
+        return cls.run_many(entries, lambda b: b.check(), **kwargs)
+
+    @classmethod
+    def cast_many(cls, entries, strict=True, **kwargs):
+        """
+        Casts several entries of this type at once, see check_many.
+
+        Args:
+            entries: List of (config, section, item) tuples
+            strict: Boolean, when False values that cannot be casted are
+                    returned as they are instead of raising
+            kwargs: Keywords passed on to the checker
+
+        Returns:
+            list: The casted values for each entry
+        """
+        return cls.run_many(entries, lambda b: b.cast(strict=strict),
+                            **kwargs)
+
+    @classmethod
+    def check_and_cast_many(cls, entries, **kwargs):
+        """
+        Checks and casts several entries of this type at once, see
+        check_many.
+
+        Args:
+            entries: List of (config, section, item) tuples
+            kwargs: Keywords passed on to the checker
+
+        Returns:
+            list: Tuples of (issues, casted values) from check_and_cast() for
+                  each entry
+        """
+        return cls.run_many(entries, lambda b: b.check_and_cast(), **kwargs)
 
     def is_it_a_lst(self, values):
         """
@@ -138,6 +343,24 @@ class GenericCheck(object):
 
         return issues
 
+    def check_and_cast(self):
+        """
+        Checks the values and returns them alongside the issues. Generic
+        checkers do not cast so the values are returned as they are.
+
+        Returns:
+            tuple:
+                **msgs** - list of issues same as check()
+                **values** - self.values
+        """
+        return self.check(), self.values
+
+    def cast(self, strict=True):
+        """
+        Generic checkers do not cast so the values are returned as they are.
+        """
+        return self.values
+
 
 class CheckType(GenericCheck):
     """
@@ -151,8 +374,15 @@ class CheckType(GenericCheck):
                       Default - str()
             bounded: Boolean indicating if a value can be limited by a
                 min or max.
+            array_dtype: NumPy dtype used to check long lists all at once
+                when NumPy is installed, None checks one value at a time.
     """
 
+    array_dtype = None
+
+    # Shortest list checked all at once
+    array_threshold = 32
+
     def __init__(self, **kwargs):
         super(CheckType, self).__init__(**kwargs)
 
@@ -168,12 +398,26 @@ class CheckType(GenericCheck):
         # Default Function used for casting to types
         self.type_func = str
 
+        # Results of type_func for values already casted by this checker
+        self._casted = {}
+
         # Allow developers to specify bounds for certain types
         self.bounded = False
 
         # Default issue for type check is error
         self.msg_level = 'error'
 
+    def set_entry(self, config, section, item):
+        """
+        Points the checker at an entry of a config, see
+        :meth:`~inicheck.checkers.GenericCheck.set_entry`. Casted values are
+        kept since they do not depend on the entry.
+        """
+        super(CheckType, self).set_entry(config, section, item)
+
+        # Values and the array they were parsed to, see to_array
+        self._array = (None, None)
+
     def check_bounds(self, value):
         """
         Checks the users values to see if its in the bounds specified by the
@@ -206,10 +450,10 @@ class CheckType(GenericCheck):
 
             # Check upper and lower bounds
             if value is not None:
-                value = self.type_func(value)
+                value = self.cast_value(value)
 
                 if min_value is not None:
-                    min_value = self.type_func(min_value)
+                    min_value = self.cast_value(min_value)
                     msg += " greater than {}".format(min_value)
 
                     if value < min_value:
@@ -219,7 +463,7 @@ class CheckType(GenericCheck):
                     if min_value is not None:
                         msg += " and"
 
-                    max_value = self.type_func(max_value)
+                    max_value = self.cast_value(max_value)
                     msg += " less than {}".format(max_value)
 
                     if value > max_value:
@@ -311,7 +555,7 @@ class CheckType(GenericCheck):
                 **valid** - Boolean whether the value was acceptable
                 **msg** - string to print if value is not valid.
         """
-        valid, msg = is_valid(value, self.type_func, self.type,
+        valid, msg = is_valid(value, self.cast_value, self.type,
                               allow_none=self.allow_none)
         return valid, msg
 
@@ -359,54 +603,200 @@ class CheckType(GenericCheck):
             list: A list equal to the len(self.values) of either None or
                   strings relaying the issues found
         """
-        msgs = []
-        valids = []
-
         # 1. Check for lists
         valid, msg = self.check_list()
-        msgs.append(msg)
-        valids.append(valid)
 
-        if valid:
-            # We clear the nones since check_list is only checking the whole
-            # entry
-            msgs = []
-            valids = []
+        if not valid:
+            return [msg]
+
+        # Long numeric lists are checked all at once
+        msgs = self.check_array()
+
+        if msgs is None:
+            msgs = [self.check_value(v)[1] for v in mk_lst(self.values)]
+
+        return msgs
+
+    def check_value(self, value):
+        """
+        Runs steps 2-5 of check() on a single value.
+
+        Args:
+            value: Single value to be evaluated
+
+        Returns:
+            tuple:
+                **valid** - Boolean whether the value was acceptable
+                **msg** - string to print if value is not valid.
+        """
+        # 2. Check if none is allowed.
+        valid, msg = self.check_none(value)
+
+        if str(value).lower() != "none":
+            # 3. Check for option constraints
+            if valid:
+                valid, msg = self.check_options(value)
+
+            # 4. Check for type constraints
+            if valid:
+                valid, msg = self.is_valid(value)
+
+            # 5. Check for bounding constraints
+            if valid:
+                valid, msg = self.check_bounds(value)
+
+        return valid, msg
+
+    def to_array(self):
+        """
+        Parses self.values into a NumPy array in one call. Only used for
+        lists of at least array_threshold values of a type with an
+        array_dtype, without options and when NumPy is installed.
+
+        Returns:
+            array: self.values as an array or None when they need to be
+                   handled one at a time, e.g. they contain a None
+        """
+        values = self.values
+
+        if self._array[0] is values:
+            return self._array[1]
+
+        arr = None
+
+        if (np is not None and self.array_dtype is not None and
+                self.is_list and isinstance(values, list) and
+                len(values) >= self.array_threshold and
+                not self.config.mcfg.cfg[self.section][self.item].options):
+
+            try:
+                arr = np.array(values, dtype=self.array_dtype)
 
-            for v in mk_lst(self.values):
+            except (TypeError, ValueError, OverflowError):
+                arr = None
 
-                # 2. Check if none is allowed.
-                valid, msg = self.check_none(v)
+        self._array = (values, arr)
 
-                if str(v).lower() != "none":
-                    # 3. Check for option constraints
-                    if valid:
-                        valid, msg = self.check_options(v)
+        return arr
 
-                    # 4. Check for type constraints
-                    if valid:
-                        valid, msg = self.is_valid(v)
+    def array_issues(self, arr):
+        """
+        Finds the values of a parsed array that are out of bounds.
+
+        Args:
+            arr: self.values parsed by to_array
+
+        Returns:
+            array: Boolean array that is True for values with an issue
+        """
+        issues = np.zeros(arr.shape, dtype=bool)
+
+        if self.bounded:
+            entry = self.config.mcfg.cfg[self.section][self.item]
+
+            if entry.min is not None:
+                issues |= arr < self.cast_value(entry.min)
+
+            if entry.max is not None:
+                issues |= arr > self.cast_value(entry.max)
+
+        return issues
+
+    def check_array(self):
+        """
+        Checks long numeric lists with array operations. Only the values
+        found to have an issue are run through check_value for their message.
+
+        Returns:
+            list: Same as check(), or None when the values need to be checked
+                  one at a time
+        """
+        arr = self.to_array()
+
+        if arr is None:
+            return None
 
-                    # 5. Check for bounding constraints
-                    if valid:
-                        valid, msg = self.check_bounds(v)
+        msgs = [None] * len(arr)
 
-                msgs.append(msg)
-                valids.append(valid)
+        for i in np.flatnonzero(self.array_issues(arr)):
+            msgs[i] = self.check_value(self.values[i])[1]
 
         return msgs
 
-    def cast(self):
+    def cast_array(self, arr):
+        """
+        Casts the values parsed by to_array.
+
+        Args:
+            arr: self.values parsed by to_array
+
+        Returns:
+            list: The casted values or None when they need to be casted one at
+                  a time
+        """
+        return arr.tolist()
+
+    def cast_value(self, value):
+        """
+        Casts a single value using self.type_func. Results are remembered so
+        a value that is checked, bounded and then casted is only converted
+        once.
+
+        Args:
+            value: Single value to be casted
+
+        Returns:
+            value: The value casted by self.type_func
+        """
+        key = (type(value), value)
+
+        try:
+            cast_ok, result = self._casted[key]
+
+        # Unhashable values are just casted
+        except TypeError:
+            return self.type_func(value)
+
+        except KeyError:
+            try:
+                result = self.type_func(value)
+                cast_ok = True
+
+            except Exception as e:
+                result = e
+                cast_ok = False
+
+            self._casted[key] = (cast_ok, result)
+
+        if not cast_ok:
+            raise result
+
+        return result
+
+    def cast(self, strict=True):
         """
         Attempts to return the casted values of the each value in self.values.
 
         This is performed with self.type_func unless the value is none in which
         we return None (NoneType)
 
+        Args:
+            strict: Boolean, when False values that cannot be casted are
+                    returned as they are instead of raising
+
         Returns:
             list: All values from self.values casted correctly
         """
 
+        # Long numeric lists are casted all at once
+        arr = self.to_array()
+
+        if arr is not None:
+            result = self.cast_array(arr)
+
+            if result is not None:
+                return result
+
         result = []
 
         for v in mk_lst(self.values):
@@ -417,7 +807,13 @@ class CheckType(GenericCheck):
 
             # 2. Manage the value types
             else:
-                result.append(self.type_func(v))
+                try:
+                    result.append(self.cast_value(v))
+
+                except Exception:
+                    if strict:
+                        raise
+                    result.append(v)
 
         # 3. Manage the list
         if not self.is_list or (len(result) == 1 and result[0] is None):
@@ -425,6 +821,23 @@ class CheckType(GenericCheck):
 
         return result
 
+    def check_and_cast(self):
+        """
+        Checks and casts self.values in a single pass, reusing the casted
+        values from checking. Values that cannot be casted are returned as
+        they are.
+
+        Returns:
+            tuple:
+                **msgs** - list of issues same as check()
+                **values** - casted values same as cast()
+        """
+        # Single values read from a file are still in a list
+        if not self.is_list:
+            self.values = mk_lst(self.values, unlst=True)
+
+        return self.check(), self.cast(strict=False)
+
 
 class CheckDatetime(CheckType):
     """
@@ -432,6 +845,8 @@ class CheckDatetime(CheckType):
     dateparser can parse.
     """
 
+    batched = True
+
     def __init__(self, **kwargs):
 
         super(CheckDatetime, self).__init__(**kwargs)
@@ -459,6 +874,9 @@ class CheckDatetimeOrderedPair(CheckDatetime):
     Then it will attempt to determine them to be before.
     """
 
+    cross_item = True
+    batched = False
+
     def __init__(self, **kwargs):
         super(CheckDatetimeOrderedPair, self).__init__(**kwargs)
 
@@ -473,66 +891,63 @@ class CheckDatetimeOrderedPair(CheckDatetime):
              if we are checking start_simulation, then we look for
              end_simulation
 
+        Pairs are resolved once per section by
+        :func:`~inicheck.utilities.get_ordered_pairs` so sections with
+        several pairs are each compared with their own match.
+
         Returns:
-            corresponding: item name in the config section corresponding with
-                           item being checked
+            tuple:
+                **valid** - Boolean whether the value is in order
+                **msg** - string to print if value is not valid.
         Raises:
             ValueError: raises an error if the name contains both sets or None
                         of keywords
         """
-        init_kw = ["start", 'begin']
-        final_kw = ['stop', 'end']
-
-        # First check whether our item has a kw
-        is_start = is_kw_matched(self.item, init_kw)
-        is_end = is_kw_matched(self.item, final_kw)
+        pairs = get_ordered_pairs(tuple(self.cfg_dict.keys()))
 
-        # The current item is the beginning of an ordered datetime pair
-        if is_start and not is_end:
-            # Look for a corresponding end
-            corresponding = get_kw_match(self.cfg_dict.keys(), final_kw)
-
-        # The current item is the end of an ordered datetime pair
-        elif is_end and not is_start:
-            # Look for the corresponding start
-            corresponding = get_kw_match(self.cfg_dict.keys(), init_kw)
-
-        else:
+        if self.item not in pairs.keys():
             raise ValueError("Ordered Datetime pairs must be distinguishable "
                              " by item name. {} was either found to have both "
                              " sets of keywords or none of them."
                              " ".format(self.item))
 
-        # Is corresponding castable?
-        corresponding_val = self.cfg_dict[corresponding]
-        valid, msg = is_valid(corresponding_val, self.type_func, self.type)
+        corresponding, is_start = pairs[self.item]
+
+        if corresponding is None:
+            return False, "No corresponding {} date found".format(
+                'end' if is_start else 'start')
+
+        # Is corresponding castable? Uncasted single values come in a list
+        corresponding_val = mk_lst(self.cfg_dict[corresponding], unlst=True)
+        valid, msg = is_valid(corresponding_val, self.cast_value, self.type)
 
         if valid:
-            corresponding_val = self.type_func(corresponding_val)
-            value = self.type_func(value)
+            corresponding_val = self.cast_value(corresponding_val)
+            value = self.cast_value(value)
 
             # Check for equal value entries
             if value == corresponding_val:
                 # Message context stating start value is euqla to end value
                 incorrect_context = 'equal to'
-                order_valid = False
+                valid = False
 
             # Check start value is before end value
             elif is_start:
-                order_valid = value < corresponding_val
+                valid = value < corresponding_val
                 # Message context stating start value is after end value
                 incorrect_context = "after"
 
             # Check end value is after start value
-            elif is_end:
-                order_valid = value > corresponding_val
+            else:
+                valid = value > corresponding_val
                 # Message context stating end value is before start value
                 incorrect_context = "before"
 
-            msg = "Date is {} {} value".format(
-                incorrect_context, corresponding)
-
-        valid = valid and order_valid
+            if valid:
+                msg = None
+            else:
+                msg = "Date is {} {} value".format(
+                    incorrect_context, corresponding)
 
         return valid, msg
 
@@ -548,7 +963,7 @@ class CheckDatetimeOrderedPair(CheckDatetime):
                 **valid** - Boolean whether the value was acceptable
                 **msg** - string to print if value is not valid.
         """
-        valid, msg = is_valid(value, parse_date, self.type)
+        valid, msg = is_valid(value, self.cast_value, self.type)
 
         if valid:
             valid, msg = self.is_corresponding_valid(value)
@@ -561,6 +976,9 @@ class CheckFloat(CheckType):
     Float checking whether a value of the right type.
     """
 
+    batched = True
+    array_dtype = float
+
     def __init__(self, **kwargs):
 
         super(CheckFloat, self).__init__(**kwargs)
@@ -575,6 +993,11 @@ class CheckInt(CheckType):
     Integer checking whether a value of the right type.
     """
 
+    batched = True
+
+    # Parsed as floats so decimals can be reported
+    array_dtype = float
+
     def __init__(self, **kwargs):
 
         super(CheckInt, self).__init__(**kwargs)
@@ -605,12 +1028,34 @@ class CheckInt(CheckType):
                              " non-zero decimal")
         return value
 
+    def array_issues(self, arr):
+        """
+        Finds the values that are out of bounds or have a non-zero decimal.
+        """
+        issues = super(CheckInt, self).array_issues(arr)
+
+        return issues | (arr != np.floor(arr)) | ~np.isfinite(arr)
+
+    def cast_array(self, arr):
+        """
+        Casts the values parsed by to_array to integers, leaving lists with
+        values that are not whole numbers to be casted one at a time.
+        """
+        whole = np.isfinite(arr) & (arr == np.floor(arr))
+
+        if not whole.all() or np.abs(arr).max() >= 2**53:
+            return None
+
+        return arr.astype(np.int64).tolist()
+
 
 class CheckBool(CheckType):
     """
     Boolean checking whether a value of the right type.
     """
 
+    batched = True
+
     def __init__(self, **kwargs):
 
         super(CheckBool, self).__init__(**kwargs)
@@ -651,6 +1096,8 @@ class CheckString(CheckType):
     lower case.
     """
 
+    batched = True
+
     def __init__(self, **kwargs):
 
         super(CheckString, self).__init__(**kwargs)
@@ -671,65 +1118,392 @@ class CheckPassword(CheckType):
         self.type_func = str
 
 
-class CheckPath(CheckType):
+class PathCache(object):
     """
-    Checks whether a Path exists. Base for checking if paths exist.
+    Cache of file system lookups shared by the path checkers during a
+    validation. Paths are looked up individually until scan_threshold of
+    them are requested from the same directory, after which that directory
+    is listed once with os.scandir and any other paths in it are answered
+    from the listing. Directories with more than scan_limit entries are not
+    listed since a few stat calls are cheaper than reading them. Names not
+    found in a listing are still looked up individually, they may exist
+    under a different case on case insensitive file systems.
+
+    Attributes:
+        stat_calls: Number of individual file system lookups made
+        scan_calls: Number of directories listed
     """
 
-    def __init__(self, **kwargs):
+    # Number of individual lookups in a directory before listing it
+    scan_threshold = 8
 
-        super(CheckPath, self).__init__(**kwargs)
+    # Most entries read from a directory before giving up on listing it
+    scan_limit = 1024
 
-        # Allow None as a value?
-        self.allow_none = False
+    def __init__(self):
+        self.stat_calls = 0
+        self.scan_calls = 0
 
-        self.root_loc = os.path.dirname(os.path.abspath(self.config.filename))
-        self.dir_path = False
-        self.type_func = self.make_abs_from_cfg
+        # Path to 'file', 'dir' or None when it does not exist
+        self._kinds = {}
 
-    def is_valid(self, value):
-        """
-        Checks for existing filename
+        # Directory to a dict of names to kinds, None if it can't be listed
+        self._listings = {}
 
-        Args:
-            value: Single value to be evaluated
+        # Number of lookups made in a directory
+        self._lookups = {}
 
-        Returns:
-            tuple:
-                **valid** - Boolean whether the value was acceptable
-                **msg** - string to print if value is not valid.
-        """
-        v = self.make_abs_from_cfg(value)
+        # Directories being listed by a thread
+        self._scanning = {}
 
-        if self.dir_path:
-            valid = os.path.isdir(v)
+        # Directories found not to exist while listing them
+        self._missing = set()
 
-        else:
-            valid = os.path.isfile(v)
+        self._lock = threading.RLock()
 
-        if valid:
-            msg = None
-        else:
-            msg = self.message
+    def isfile(self, path):
+        """
+        Returns whether the path is an existing file, like os.path.isfile
+        """
+        return self.kind(path) == 'file'
 
-        return valid, msg
+    def isdir(self, path):
+        """
+        Returns whether the path is an existing directory, like
+        os.path.isdir
+        """
+        return self.kind(path) == 'dir'
 
-    def make_abs_from_cfg(self, value):
+    def kind(self, path):
         """
-        Looks at a path and determines its absolute path. All paths should be
-        either absolute or relative to the config file in which they will be
-        converted to absolute paths
+        Determines what the path is on the file system. Safe to use from
+        multiple threads, file system calls are made outside of the lock.
 
         Args:
-            value: single path or filename
+            path: path to look up
+
         Returns:
-            str: absolute path or filename
+            str: 'file', 'dir' or None if the path does not exist
         """
-        # Watch out for empty strings, assume default
-        if value == '':
-            value = self.config.mcfg.cfg[self.section][self.item].default
-        if str(value).lower() != 'none':
-            if not os.path.isabs(value):
+        path = os.fspath(path)
+        parent, name = os.path.split(path)
+        scanning = None
+        scan = False
+
+        with self._lock:
+            if path in self._kinds.keys():
+                return self._kinds[path]
+
+            # Only listings of normalized paths can be trusted
+            listable = os.path.normpath(path) == path and name
+
+            if listable and parent in self._listings.keys():
+                listing = self._listings[parent]
+
+                if listing is not None and name in listing.keys():
+                    result = listing[name]
+                    self._kinds[path] = result
+                    return result
+
+                # Nothing exists in a missing directory
+                if listing is not None and parent in self._missing:
+                    self._kinds[path] = None
+                    return None
+
+            elif listable and parent in self._scanning.keys():
+                scanning = self._scanning[parent]
+
+            elif listable:
+                count = self._lookups.get(parent, 0) + 1
+                self._lookups[parent] = count
+
+                if count >= self.scan_threshold:
+                    scan = True
+                    self._scanning[parent] = threading.Event()
+
+        # Another thread is listing the directory
+        if not scan and scanning is not None:
+            scanning.wait()
+            return self.kind(path)
+
+        if scan:
+            self._scan(parent)
+            return self.kind(path)
+
+        return self._stat(path)
+
+    def _stat(self, path):
+        """
+        Looks up a single path and remembers the result
+        """
+        if os.path.isfile(path):
+            result = 'file'
+        elif os.path.isdir(path):
+            result = 'dir'
+        else:
+            result = None
+
+        count('stat calls')
+
+        with self._lock:
+            self.stat_calls += 1
+            self._kinds[path] = result
+
+        return result
+
+    def _scan(self, directory):
+        """
+        Lists a directory once and remembers the kind of everything in it
+        """
+        listing = {}
+        missing = False
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if len(listing) >= self.scan_limit:
+                        listing = None
+                        break
+
+                    try:
+                        if entry.is_file():
+                            listing[entry.name] = 'file'
+                        elif entry.is_dir():
+                            listing[entry.name] = 'dir'
+                        else:
+                            listing[entry.name] = None
+
+                    except OSError:
+                        listing[entry.name] = None
+
+        # A missing parent means nothing in it exists
+        except (FileNotFoundError, NotADirectoryError):
+            missing = True
+
+        except OSError:
+            listing = None
+
+        count('directory scans')
+
+        with self._lock:
+            self.scan_calls += 1
+            self._listings[directory] = listing
+
+            if missing:
+                self._missing.add(directory)
+
+            self._scanning.pop(directory).set()
+
+
+class DigestCache(object):
+    """
+    Cache of file digests kept for as long as the file is unchanged. Files
+    are identified by their inode, size and modification time so an
+    unchanged file costs a single stat instead of reading it again. Digests
+    can be kept across runs in a JSON file given by path, the default cache
+    uses the environment variable INICHECK_DIGEST_CACHE for it. New digests
+    are saved at most every save_interval seconds and when python exits, or
+    by calling flush().
+
+    Attributes:
+        path: JSON file the digests are saved to, None to keep them in memory
+        stat_calls: Number of files looked up
+        read_calls: Number of files read to compute a digest
+    """
+
+    # Bytes read at a time when computing a digest
+    chunk_size = 4 * 1024 * 1024
+
+    # Seconds between saving new digests to path
+    save_interval = 30
+
+    def __init__(self, path=None):
+        self.path = path
+        self.stat_calls = 0
+        self.read_calls = 0
+
+        # "algorithm:path" to a list of [inode, size, mtime, digest]
+        self._digests = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._saved = time.monotonic()
+
+        if self.path is not None:
+            self.load()
+            atexit.register(self.flush)
+
+    def digest(self, filename, algorithm='sha256'):
+        """
+        Returns the hex digest of a file, reading it only when it is not in
+        the cache or has changed.
+
+        Args:
+            filename: path to the file
+            algorithm: name of a hashlib algorithm
+
+        Returns:
+            str: hex digest of the file or None if it is not a file
+        """
+        try:
+            st = os.stat(filename)
+
+        except OSError:
+            st = None
+
+        count('stat calls')
+
+        with self._lock:
+            self.stat_calls += 1
+
+        if st is None or not stat.S_ISREG(st.st_mode):
+            return None
+
+        key = "{}:{}".format(algorithm, os.path.abspath(filename))
+        identity = [st.st_ino, st.st_size, st.st_mtime_ns]
+
+        with self._lock:
+            cached = self._digests.get(key)
+
+        if cached is not None and cached[:3] == identity:
+            return cached[3]
+
+        h = hashlib.new(algorithm)
+
+        with open(filename, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(self.chunk_size), b''):
+                h.update(chunk)
+
+        result = h.hexdigest()
+        count('files hashed')
+
+        with self._lock:
+            self.read_calls += 1
+            self._digests[key] = identity + [result]
+            self._dirty = True
+
+            if time.monotonic() - self._saved >= self.save_interval:
+                self.flush()
+
+        return result
+
+    def load(self):
+        """
+        Reads in the digests saved by a previous run, a missing or unreadable
+        file is ignored
+        """
+        try:
+            with open(self.path) as fp:
+                digests = json.load(fp)
+
+        except (OSError, ValueError):
+            return
+
+        if isinstance(digests, dict):
+            with self._lock:
+                self._digests.update(digests)
+
+    def flush(self):
+        """
+        Saves the digests if any were added since they were last saved. The
+        digests are only a cache, so a file that can not be written is left
+        alone.
+        """
+        with self._lock:
+            if self._dirty and self.path is not None:
+                try:
+                    self.save()
+
+                except OSError:
+                    pass
+
+    def save(self):
+        """
+        Writes the digests to path
+        """
+        with self._lock:
+            tmp = "{}.{}.tmp".format(self.path, os.getpid())
+
+            with open(tmp, 'w') as fp:
+                json.dump(self._digests, fp)
+
+            os.replace(tmp, self.path)
+            self._dirty = False
+            self._saved = time.monotonic()
+
+
+# Digests shared by the checksummed file checkers unless given their own
+default_digest_cache = DigestCache(
+    path=os.environ.get('INICHECK_DIGEST_CACHE'))
+
+
+class CheckPath(CheckType):
+    """
+    Checks whether a Path exists. Base for checking if paths exist. File
+    system lookups go through a :class:`~inicheck.checkers.PathCache`, which
+    can be shared between checkers by passing the keyword path_cache.
+    """
+
+    io_bound = True
+
+    def __init__(self, **kwargs):
+
+        super(CheckPath, self).__init__(**kwargs)
+
+        # Allow None as a value?
+        self.allow_none = False
+
+        # File system lookups shared during a validation
+        self.path_cache = kwargs.get('path_cache')
+        if self.path_cache is None:
+            self.path_cache = PathCache()
+
+        self.root_loc = os.path.dirname(os.path.abspath(self.config.filename))
+        self.dir_path = False
+        self.type_func = self.make_abs_from_cfg
+
+    def is_valid(self, value):
+        """
+        Checks for existing filename
+
+        Args:
+            value: Single value to be evaluated
+
+        Returns:
+            tuple:
+                **valid** - Boolean whether the value was acceptable
+                **msg** - string to print if value is not valid.
+        """
+        v = self.cast_value(value)
+
+        if self.dir_path:
+            valid = self.path_cache.isdir(v)
+
+        else:
+            valid = self.path_cache.isfile(v)
+
+        if valid:
+            msg = None
+        else:
+            msg = self.message
+
+        return valid, msg
+
+    def make_abs_from_cfg(self, value):
+        """
+        Looks at a path and determines its absolute path. All paths should be
+        either absolute or relative to the config file in which they will be
+        converted to absolute paths
+
+        Args:
+            value: single path or filename
+        Returns:
+            str: absolute path or filename
+        """
+        # Watch out for empty strings, assume default
+        if value == '':
+            value = self.config.mcfg.cfg[self.section][self.item].default
+        if str(value).lower() != 'none':
+            if not os.path.isabs(value):
                 value = os.path.abspath(os.path.join(self.root_loc, value))
 
         return value
@@ -787,6 +1561,307 @@ class CheckDiscretionaryCriticalFilename(CheckCriticalFilename):
         self.allow_none = True
 
 
+class CheckChecksummedFilename(CheckCriticalFilename):
+    """
+    Checks a critical file exists and has not been changed by comparing its
+    digest to an expected one. The expected digest can follow the path
+    prefixed by the algorithm, e.g.
+
+    .. code-block:: ini
+
+        dem: topo/dem.nc sha256:9f86d081884c7d659a2feaa0c55ad015...
+
+    Otherwise it is read from a sidecar file next to it named after the
+    algorithm, e.g. topo/dem.nc.sha256, which can be the output of
+    sha256sum. Casting drops an inline digest from the value, so casted
+    values are checked against the digest given in the config before
+    casting. Digests come from a :class:`~inicheck.checkers.DigestCache`
+    which can be passed using the keyword digest_cache, otherwise
+    default_digest_cache is used.
+    """
+
+    # Algorithms looked for in sidecar files in order
+    algorithms = ['sha256', 'sha512', 'sha1', 'md5']
+
+    def __init__(self, **kwargs):
+        super(CheckChecksummedFilename, self).__init__(**kwargs)
+
+        self.digest_cache = kwargs.get('digest_cache')
+        if self.digest_cache is None:
+            self.digest_cache = default_digest_cache
+
+        self.type_func = self.get_filename
+
+    def split_digest(self, value):
+        """
+        Separates a path from an expected digest following it.
+
+        Args:
+            value: single path, optionally followed by algorithm:digest
+
+        Returns:
+            tuple:
+                **path** - the path as it was provided
+                **algorithm** - algorithm of the digest or None
+                **digest** - the expected hex digest or None
+        """
+        parts = str(value).rsplit(None, 1)
+
+        if len(parts) == 2 and ':' in parts[1]:
+            algorithm, digest = parts[1].split(':', 1)
+
+            if algorithm.lower() in hashlib.algorithms_available:
+                return parts[0], algorithm.lower(), digest.lower()
+
+        return value, None, None
+
+    def get_filename(self, value):
+        """
+        Casts the value to the absolute path of the file without a digest.
+        """
+        return self.make_abs_from_cfg(self.split_digest(value)[0])
+
+    def find_uncast_digest(self, filename):
+        """
+        Looks for a digest given with the file in the config before it was
+        casted, which drops the digest from the value.
+
+        Args:
+            filename: absolute path of the file being checked
+
+        Returns:
+            tuple:
+                **algorithm** - algorithm of the digest or None if not found
+                **digest** - the expected hex digest or None if not found
+        """
+        for cfg in [getattr(self.config, 'recipe_cfg', None),
+                    getattr(self.config, 'raw_cfg', None)]:
+            if cfg is None or self.section not in cfg.keys() or \
+                    self.item not in cfg[self.section].keys():
+                continue
+
+            for value in mk_lst(cfg[self.section][self.item]):
+                path, algorithm, digest = self.split_digest(value)
+
+                if digest is not None and \
+                        self.make_abs_from_cfg(path) == filename:
+                    return algorithm, digest
+
+        return None, None
+
+    def read_sidecar(self, filename):
+        """
+        Looks for a sidecar file holding the expected digest.
+
+        Args:
+            filename: absolute path of the file being checked
+
+        Returns:
+            tuple:
+                **algorithm** - algorithm of the digest or None if not found
+                **digest** - the expected hex digest or None if not found
+        """
+        for algorithm in self.algorithms:
+            sidecar = "{}.{}".format(filename, algorithm)
+
+            if self.path_cache.isfile(sidecar):
+                with open(sidecar) as fp:
+                    content = fp.read().split()
+
+                if content:
+                    return algorithm, content[0].lower()
+
+        return None, None
+
+    def is_valid(self, value):
+        """
+        Checks the file exists and its digest matches the expected one.
+
+        Args:
+            value: Single value to be evaluated
+
+        Returns:
+            tuple:
+                **valid** - Boolean whether the value was acceptable
+                **msg** - string to print if value is not valid.
+        """
+        filename = self.cast_value(value)
+        algorithm, expected = self.split_digest(value)[1:]
+
+        # Casted values no longer have the digest given with them
+        if expected is None:
+            algorithm, expected = self.find_uncast_digest(filename)
+
+        if expected is None:
+            algorithm, expected = self.read_sidecar(filename)
+
+        if expected is None:
+            if not self.path_cache.isfile(filename):
+                return False, self.message
+
+            return False, "No checksum found for file."
+
+        # A single stat when the digest is cached
+        digest = self.digest_cache.digest(filename, algorithm)
+
+        if digest is None:
+            return False, self.message
+
+        if digest != expected:
+            return False, "File does not match its {} checksum.".format(
+                algorithm)
+
+        return True, None
+
+
+# Removing check from the class name would leave summedfilename
+register_checker(CheckChecksummedFilename, name='checksummedfilename')
+
+
+def is_hdf5_header(header):
+    """
+    Whether the start of a file has the HDF5 signature, which can come after
+    a user block of 512 bytes or a power of two larger.
+    """
+    signature = b'\x89HDF\r\n\x1a\n'
+
+    for offset in [0, 512, 1024, 2048]:
+        if header[offset:offset + 8] == signature:
+            return True
+
+    return False
+
+
+def is_netcdf_header(header):
+    """
+    Whether the start of a file is a classic, 64-bit offset, CDF5 or NetCDF4
+    (HDF5) netCDF file.
+    """
+    return header[:4] in [b'CDF\x01', b'CDF\x02', b'CDF\x05'] or \
+        is_hdf5_header(header)
+
+
+def is_tiff_header(header):
+    """
+    Whether the start of a file is a TIFF or BigTIFF header in either byte
+    order, GeoTIFFs being TIFFs with extra tags.
+    """
+    return header[:4] in [b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+']
+
+
+def is_csv_header(header):
+    """
+    Whether the start of a file looks like delimited text, i.e. it is utf-8
+    text without null bytes which is not markup such as an HTML page.
+    """
+    if not header.strip() or b'\x00' in header:
+        return False
+
+    try:
+        text = header.decode('utf-8')
+
+    # The header may end part way through a character
+    except UnicodeDecodeError as e:
+        if e.start < len(header) - 3:
+            return False
+        text = header[:e.start].decode('utf-8')
+
+    return not text.lstrip('\ufeff \t\r\n').startswith('<')
+
+
+class FormattedFilename(CheckCriticalFilename):
+    """
+    Base for critical files of a known format. Confirms the format from the
+    first bytes of the file so things like an HTML error page or an empty
+    download are caught without opening the file with its I/O library. Not
+    named Check* since it is not a type on its own.
+
+    Attributes:
+        file_format: Name of the format used in messages
+        header_size: Number of bytes read from the start of the file
+        is_format: Function taking the header bytes and returning whether
+                   they are the right format
+    """
+
+    file_format = None
+    header_size = 8
+    is_format = None
+
+    def is_valid(self, value):
+        """
+        Checks the file exists and starts like a file of the format.
+
+        Args:
+            value: Single value to be evaluated
+
+        Returns:
+            tuple:
+                **valid** - Boolean whether the value was acceptable
+                **msg** - string to print if value is not valid.
+        """
+        valid, msg = super(FormattedFilename, self).is_valid(value)
+
+        if valid:
+            try:
+                with open(self.cast_value(value), 'rb') as fp:
+                    header = fp.read(self.header_size)
+
+            except OSError:
+                return False, self.message
+
+            if not self.is_format(header):
+                valid = False
+
+                if header.lstrip()[:1] == b'<':
+                    msg = "File is a web page or markup, not {}.".format(
+                        self.file_format)
+                else:
+                    msg = "File is not {}.".format(self.file_format)
+
+        return valid, msg
+
+
+class CheckNetcdfFilename(FormattedFilename):
+    """
+    Checks a critical file exists and is netCDF, including NetCDF4 files
+    which are HDF5.
+    """
+
+    file_format = 'netCDF'
+    header_size = 2056
+    is_format = staticmethod(is_netcdf_header)
+
+
+class CheckHdf5Filename(FormattedFilename):
+    """
+    Checks a critical file exists and is HDF5.
+    """
+
+    file_format = 'HDF5'
+    header_size = 2056
+    is_format = staticmethod(is_hdf5_header)
+
+
+class CheckGeotiffFilename(FormattedFilename):
+    """
+    Checks a critical file exists and is a TIFF. The GeoTIFF tags are not
+    checked since that requires reading the image directory.
+    """
+
+    file_format = 'GeoTIFF'
+    is_format = staticmethod(is_tiff_header)
+
+
+class CheckCsvFilename(FormattedFilename):
+    """
+    Checks a critical file exists and is delimited text.
+    """
+
+    file_format = 'CSV'
+    header_size = 4096
+    is_format = staticmethod(is_csv_header)
+
+
 class CheckCriticalDirectory(CheckDirectory):
     """
     Checks whether a critical directory exists. This is for any directories
@@ -799,16 +1874,203 @@ class CheckCriticalDirectory(CheckDirectory):
         self.allow_none = True
 
 
+class URLCache(object):
+    """
+    Results of URL checks shared by the URL checkers and reused for a time to
+    live. Failures are only reused for a few seconds so a network hiccup is
+    not reported for the whole ttl by long running processes. Requests go
+    through a single requests.Session so connections to the same host are
+    pooled. Results can be kept across runs in a JSON file given by path,
+    the default cache uses the environment variable INICHECK_URL_CACHE for
+    it.
+
+    Attributes:
+        path: JSON file the results are saved to, None to keep them in memory
+        ttl: Seconds a result is reused for
+        failure_ttl: Seconds a failed result is reused for, at most ttl
+        request_calls: Number of URLs requested
+    """
+
+    # Seconds to wait on a server
+    timeout = 5
+
+    # Connections kept open to a single host
+    pool_size = 16
+
+    # Statuses of servers refusing HEAD requests, these are retried with GET
+    head_refused = (403, 405, 501)
+
+    def __init__(self, path=None, ttl=3600, failure_ttl=5):
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.request_calls = 0
+
+        # URL to a list of [valid, msg, time checked]
+        self._results = {}
+
+        self._session = None
+        self._lock = threading.RLock()
+
+        if self.path is not None:
+            self.load()
+
+    @property
+    def session(self):
+        """
+        The requests.Session used for all the checks, made on first use
+        """
+        with self._lock:
+            if self._session is None:
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size)
+
+                self._session = requests.Session()
+                self._session.mount('http://', adapter)
+                self._session.mount('https://', adapter)
+
+        return self._session
+
+    def check(self, url):
+        """
+        Determines whether the URL can be connected to, reusing a previous
+        result if it is younger than its ttl.
+
+        Args:
+            url: URL to be checked
+
+        Returns:
+            tuple:
+                **valid** - Boolean whether the URL could be reached
+                **msg** - string to print if the URL could not be reached
+        """
+        now = time.time()
+
+        with self._lock:
+            result = self._results.get(url)
+
+        if result is not None and now - result[2] < self.result_ttl(result):
+            return result[0], result[1]
+
+        valid, msg = self.request(url)
+
+        with self._lock:
+            self._results[url] = [valid, msg, now]
+
+            if self.path is not None:
+                self.save()
+
+        return valid, msg
+
+    def result_ttl(self, result):
+        """
+        Returns the seconds a result of [valid, msg, time checked] is reused
+        for
+        """
+        if result[0]:
+            return self.ttl
+
+        return min(self.ttl, self.failure_ttl)
+
+    def request(self, url):
+        """
+        Requests only the headers of the URL, falling back to a GET for
+        servers that will not answer a HEAD request. The body is never
+        downloaded.
+
+        Args:
+            url: URL to be checked
+
+        Returns:
+            tuple:
+                **valid** - Boolean whether the URL could be reached
+                **msg** - string to print if the URL could not be reached
+        """
+        count('url requests')
+
+        with self._lock:
+            self.request_calls += 1
+
+        try:
+            r = self.session.head(url, timeout=self.timeout,
+                                  allow_redirects=True)
+
+            if r.status_code in self.head_refused:
+                r = self.session.get(url, timeout=self.timeout, stream=True)
+                r.close()
+
+        except Exception:
+            return False, "Invalid connection or URL"
+
+        if r.status_code == 200:
+            return True, None
+
+        return False, "Webpage does not exist"
+
+    def load(self):
+        """
+        Reads in the results saved by a previous run, a missing or unreadable
+        file is ignored
+        """
+        try:
+            with open(self.path) as fp:
+                results = json.load(fp)
+
+        except (OSError, ValueError):
+            return
+
+        if isinstance(results, dict):
+            with self._lock:
+                self._results.update(results)
+
+    def save(self):
+        """
+        Writes the results still within the ttl to path
+        """
+        now = time.time()
+
+        with self._lock:
+            results = {url: r for url, r in self._results.items()
+                       if now - r[2] < self.result_ttl(r)}
+
+            tmp = "{}.{}.tmp".format(self.path, os.getpid())
+
+            with open(tmp, 'w') as fp:
+                json.dump(results, fp)
+
+            os.replace(tmp, self.path)
+
+    def clear(self):
+        """
+        Forgets all the results
+        """
+        with self._lock:
+            self._results.clear()
+
+
+# URL results shared by the URL checkers unless they are given their own
+default_url_cache = URLCache(path=os.environ.get('INICHECK_URL_CACHE'))
+
+
 class CheckURL(CheckType):
     """
-    Check URLs to see if it can be connected to.
+    Check URLs to see if it can be connected to. Results come from a
+    :class:`~inicheck.checkers.URLCache` which can be passed using the
+    keyword url_cache, otherwise default_url_cache is used.
     """
 
+    io_bound = True
+
     def __init__(self, **kwargs):
 
         super(CheckURL, self).__init__(**kwargs)
         self.msg_level = 'error'
 
+        self.url_cache = kwargs.get('url_cache')
+        if self.url_cache is None:
+            self.url_cache = default_url_cache
+
     def is_valid(self, value):
         """
         Makes a request to the URL to determine the validity.
@@ -822,20 +2084,4 @@ class CheckURL(CheckType):
                 **msg** - string to print if value is not valid.
 
         """
-        # Attempt to establish a connection
-        try:
-            r = requests.get(value, timeout=5)
-
-        except Exception:
-            msg = "Invalid connection or URL"
-            r = None
-
-        valid = False
-        msg = "Webpage does not exist"
-
-        if r is not None:
-            if r.status_code == 200:
-                valid = True
-                msg = None
-
-        return valid, msg
+        return self.url_cache.check(value)
@@ -1,17 +1,28 @@
 # !/usr/bin/env python
 
 import argparse
+import glob
 import os
 import sys
+import time
+from collections import OrderedDict
+from datetime import datetime
 from os.path import abspath, basename, join
 
 from .changes import ChangeLog
 from .config import MasterConfig, UserConfig
+from .daemon import serve
+from .http_server import serve_http
 from .output import (generate_config, print_change_report, print_config_report,
-                     print_details, print_non_defaults, print_recipe_summary)
-from .tools import check_config, get_user_config
+                     print_details, print_non_defaults, print_recipe_summary,
+                     print_timings)
+from .profiling import add_profile_arguments, profiled
+from .service import ValidationService
+from .timings import Timings, stage
+from .tools import check_config, get_user_config, validate_many
 from .utilities import (ask_config_setup, find_options_in_recipes,
                         get_inicheck_cmd)
+from .watch import ConfigWatcher
 
 
 def current_version():
@@ -29,13 +40,62 @@ def current_version():
             'unknown'
 
 
+@profiled
 def main():
     args = cli_arguments()
+
+    # Keep the master config in memory and answer requests from clients
+    if args.serve is not None:
+        if args.modules is None and args.master is None:
+            print("ERROR: Please provide either a module or a path to a"
+                  " master config to serve")
+            sys.exit(1)
+
+        service = ValidationService(master_files=args.master,
+                                    modules=args.modules,
+                                    changelog_file=args.changelog)
+        try:
+            serve(service, socket_path=args.serve or None)
+
+        except OSError as e:
+            print("ERROR: {}".format(e))
+            sys.exit(1)
+
+        return
+
+    # Answer validation requests over HTTP
+    if args.http is not None:
+        if args.modules is None and args.master is None:
+            print("ERROR: Please provide either a module or a path to a"
+                  " master config to serve")
+            sys.exit(1)
+
+        service = ValidationService(master_files=args.master,
+                                    modules=args.modules,
+                                    changelog_file=args.changelog)
+        serve_http(service, address=args.http, workers=args.jobs or 8)
+        return
+
+    # Keep checking the config as it is edited
+    if args.watch is not None and args.config_file is not None:
+        inicheck_watch(args.config_file, master=args.master,
+                       modules=args.modules, changelog_file=args.changelog,
+                       interval=args.watch)
+        return
+
+    # Globs, directories and --jobs check many files in one invocation
+    if args.config_file is not None and (
+            args.jobs is not None or is_batch_pattern(args.config_file)):
+        sys.exit(inicheck_batch(args.config_file, master=args.master,
+                                modules=args.modules,
+                                changelog_file=args.changelog,
+                                jobs=args.jobs))
+
     inicheck_main(config_file=args.config_file, master=args.master,
                   modules=args.modules, write_out=args.write,
                   show_recipes=args.recipes, show_non_defaults=args.defaults,
                   details=args.details, apply_changelog=args.change,
-                  changelog_file=args.changelog)
+                  changelog_file=args.changelog, show_timings=args.timings)
 
 
 def cli_arguments():
@@ -47,7 +107,8 @@ def cli_arguments():
         '--config_file', '-f',
         dest='config_file',
         type=str,
-        help='Path to a config file that needs checking'
+        help='Path to a config file that needs checking. A glob pattern '
+             '(quoted) or a directory checks every matching .ini file'
     )
     parser.add_argument(
         '--master', '-mf',
@@ -101,18 +162,63 @@ def cli_arguments():
         nargs='+',
         help="Files indicating how the config file has deprecated information"
     )
+    parser.add_argument(
+        '--timings', '-t',
+        action='store_true',
+        help="Prints the time spent in each stage of checking the config "
+             "and counts of file system, URL and date parsing calls"
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        help="Number of processes used to check many config files, implies "
+             "a batch check"
+    )
+    parser.add_argument(
+        '--watch',
+        metavar='SECONDS',
+        type=float,
+        nargs='?',
+        const=0.5,
+        help="Keep checking the config file each time it or the master "
+             "config changes, printing the issues introduced and resolved. "
+             "Files are checked for changes every 0.5 seconds by default"
+    )
+    parser.add_argument(
+        '--serve',
+        metavar='SOCKET',
+        type=str,
+        nargs='?',
+        const='',
+        help="Run a daemon that keeps the master config in memory and checks "
+             "configs sent by inicheck-client over a Unix socket. Defaults "
+             "to INICHECK_SOCKET or a socket for the user in the temporary "
+             "directory"
+    )
+    parser.add_argument(
+        '--http',
+        metavar='ADDRESS',
+        type=str,
+        nargs='?',
+        const='127.0.0.1:8080',
+        help="Run a local HTTP server checking configs posted to /validate "
+             "and /cast as JSON, on HOST:PORT or PORT (default "
+             "127.0.0.1:8080). --jobs sets the requests handled at a time"
+    )
     parser.add_argument(
         '--version',
         action='version',
         version='%(prog)s {version}'.format(version=current_version())
     )
+    add_profile_arguments(parser)
 
     return parser.parse_args()
 
 
 def inicheck_main(config_file=None, master=None, modules=None, write_out=False,
                   show_recipes=False, show_non_defaults=False, details=None,
-                  apply_changelog=False, changelog_file=None,):
+                  apply_changelog=False, changelog_file=None,
+                  show_timings=False):
     """
     Function used for the CLI for inicheck. This is mostly for cleaner
     testing. Allows users to look at master config details, check their config
@@ -148,9 +254,11 @@ def inicheck_main(config_file=None, master=None, modules=None, write_out=False,
         # Requesting a check on a config file
         else:
             f = abspath(config_file)
+            timings = Timings() if show_timings else None
             ucfg = get_user_config(f, master_files=master,
                                    changelog_file=changelog_file,
-                                   modules=modules, cli=True)
+                                   modules=modules, cli=True,
+                                   timings=timings)
 
             # Check out any change logs for issues
             print(changelog_file)
@@ -176,7 +284,12 @@ def inicheck_main(config_file=None, master=None, modules=None, write_out=False,
                       "use:\n{}".format(cmd))
 
             else:
-                warnings, errors = check_config(ucfg)
+                if timings is not None:
+                    with timings, stage('check config'):
+                        warnings, errors = check_config(ucfg)
+                else:
+                    warnings, errors = check_config(ucfg)
+
                 print_config_report(warnings, errors)
 
                 # Print out the recipes summary
@@ -198,7 +311,200 @@ def inicheck_main(config_file=None, master=None, modules=None, write_out=False,
 
                 generate_config(ucfg, out_f, cli=True)
 
+            if timings is not None:
+                print_timings(timings)
+
+
+def is_batch_pattern(config_file):
+    """
+    Whether the config file argument names more than one file, i.e. it is a
+    glob pattern or a directory. Existing files are never patterns, even
+    when their name has characters used in globs, e.g. run[1].ini.
+
+    Args:
+        config_file: config file argument from the command line
+
+    Returns:
+        bool: True if config_file should be checked as a batch
+    """
+    if os.path.isfile(config_file):
+        return False
+
+    return glob.has_magic(config_file) or os.path.isdir(config_file)
+
+
+def find_config_files(config_file):
+    """
+    Expands a config file argument into the sorted list of files it names.
+    Glob patterns may use ** to match any number of directories and a
+    directory matches every .ini file under it.
+
+    Args:
+        config_file: path, glob pattern or directory
+
+    Returns:
+        list: sorted paths to the config files
+    """
+    if os.path.isdir(config_file):
+        config_file = join(config_file, '**', '*.ini')
+
+    return sorted(f for f in glob.glob(config_file, recursive=True)
+                  if os.path.isfile(f))
+
+
+def inicheck_batch(config_file, master=None, modules=None,
+                   changelog_file=None, jobs=None):
+    """
+    Function used for the CLI to check many config files in one go. The
+    master config is read once and the files are checked over a pool of
+    jobs processes. A line is printed for each file as it completes with
+    its errors below it, followed by a summary of all the files.
+
+    Args:
+        config_file: path, glob pattern or directory of config files
+        master: paths to master config files
+        modules: modules providing master config files
+        changelog_file: path to a changelog for the master config
+        jobs: number of processes to use, None or 1 checks the files in
+              this process
+
+    Returns:
+        int: exit code, 1 if any file had errors or could not be checked
+    """
+    if modules is None and master is None:
+        print("ERROR: Please provide either a module or a path to a master"
+              " config, or ask for details on config entries")
+        return 1
+
+    files = find_config_files(config_file)
+
+    if not files:
+        print("ERROR: No config files found matching {}".format(config_file))
+        return 1
+
+    print("Checking {} config files using {} job(s)..."
+          "".format(len(files), jobs or 1))
+
+    counts = OrderedDict([('ok', 0), ('warnings', 0), ('errors', 0),
+                          ('failed', 0)])
+    width = len(str(len(files)))
+
+    results = validate_many(files, master_files=master, modules=modules,
+                            changelog_file=changelog_file, workers=jobs,
+                            return_cfg=False)
+
+    for i, result in enumerate(results):
+        if result.failure is not None:
+            status = 'failed'
+            detail = "could not be checked"
+
+        elif result.errors:
+            status = 'errors'
+            detail = "{} errors, {} warnings".format(len(result.errors),
+                                                     len(result.warnings))
+
+        elif result.warnings:
+            status = 'warnings'
+            detail = "{} warnings".format(len(result.warnings))
+
+        else:
+            status = 'ok'
+            detail = "ok"
+
+        counts[status] += 1
+
+        print("[{:>{w}}/{}] {:<8} {} ({})".format(
+            i + 1, len(files), status.upper(), result.path, detail,
+            w=width), flush=True)
+
+        if result.failure is not None:
+            print("    {}".format(result.failure))
+
+        for e in result.errors:
+            print("    {}".format(e.strip()))
+
+    print(" ")
+    print("Batch Status Report:")
+    print("=" * 90)
+    print("{} files checked: {}".format(
+        len(files), ", ".join("{} {}".format(v, k)
+                              for k, v in counts.items())))
+
+    if counts['errors'] or counts['failed']:
+        return 1
+
+    return 0
+
+
+def inicheck_watch(config_file, master=None, modules=None,
+                   changelog_file=None, interval=0.5, cycles=None):
+    """
+    Function used for the CLI to keep checking a config while it is edited.
+    The full report is printed first, after that only the issues introduced
+    (+) and resolved (-) by each change are printed. See
+    :class:`~inicheck.watch.ConfigWatcher`.
+
+    Args:
+        config_file: path to the config file to watch
+        master: paths to master config files
+        modules: modules providing master config files
+        changelog_file: path to a changelog for the master config
+        interval: seconds between checking the files for changes
+        cycles: number of times to check for changes, None until interrupted
+    """
+    if modules is None and master is None:
+        print("ERROR: Please provide either a module or a path to a master"
+              " config, or ask for details on config entries")
+        sys.exit(1)
+
+    watcher = ConfigWatcher(config_file, master_files=master,
+                            modules=modules, changelog_file=changelog_file)
+
+    if watcher.failure is not None:
+        print("ERROR: {}".format(watcher.failure))
+    else:
+        print_config_report(watcher.warnings, watcher.errors)
+
+    print("Watching {} for changes, press Ctrl+C to stop..."
+          "".format(watcher.config_file), flush=True)
+
+    cycle = 0
+
+    try:
+        while cycles is None or cycle < cycles:
+            cycle += 1
+            time.sleep(interval)
+
+            diff = watcher.poll()
+
+            if diff is None:
+                continue
+
+            new_w, new_e, resolved_w, resolved_e = diff
+
+            print("\n[{}] Change detected, checked in {:0.1f} ms"
+                  "".format(datetime.now().strftime('%H:%M:%S'),
+                            watcher.elapsed * 1000))
+
+            if watcher.failure is not None:
+                print("ERROR: {}".format(watcher.failure))
+
+            for label, issues in [('+ ERROR  ', new_e),
+                                  ('+ WARNING', new_w),
+                                  ('- ERROR  ', resolved_e),
+                                  ('- WARNING', resolved_w)]:
+                for issue in issues:
+                    print("{} {}".format(label, issue.strip()))
+
+            print("{} errors, {} warnings".format(len(watcher.errors),
+                                                  len(watcher.warnings)),
+                  flush=True)
+
+    except KeyboardInterrupt:
+        pass
+
 
+@profiled
 def inidiff():
     """
     Creates a report showing the difference in files
@@ -239,6 +545,7 @@ def inidiff():
         '--version',
         action='version',
         version='%(prog)s {version}'.format(version=current_version()))
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
     inidiff_main(args.config_files, master=args.master, modules=args.modules)
@@ -341,6 +648,7 @@ def inidiff_main(config_files, master=None, modules=None):
     print("Total config mismatches: {:0.0f}\n".format(mismatch_count))
 
 
+@profiled
 def inimake():
     """
     Attempts to walk through making a brand new ini file based on developers
@@ -385,6 +693,7 @@ def inimake():
         '--version',
         action='version',
         version='%(prog)s {version}'.format(version=current_version()))
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
 
@@ -520,6 +829,7 @@ def check_for_changes(directory, modules=[], paths=[]):
     return change_instances
 
 
+@profiled
 def detect_file_changes():
     """
     CLI tool for examining a python repo and reporting any old python code that
@@ -550,6 +860,7 @@ def detect_file_changes():
         '--version',
         action='version',
         version='%(prog)s {version}'.format(version=current_version()))
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
     print("\nSearching {} for any deprecated config file sections/items in "
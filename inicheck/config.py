@@ -1,12 +1,15 @@
 import copy
 import importlib
+import threading
 from collections import OrderedDict
+from collections.abc import MutableMapping
 from os.path import abspath
 from os.path import join as pjoin
+from types import MappingProxyType
 
 from . import __recipe_keywords__
 from .entries import ConfigEntry, RecipeSection
-from .iniparse import read_config
+from .iniparse import read_config, read_config_text
 from .utilities import get_relative_to_cfg, mk_lst
 
 # Unused import required for get_checkers to work.
@@ -16,6 +19,168 @@ DEBUG = False
 FULL_DEBUG = False
 
 
+class ConfigIndex():
+    """
+    Inverted index of a users config kept current as the config is edited,
+    used for looking up where values and items are used without walking the
+    whole config. Values are indexed as they are given, lists are indexed
+    value by value.
+
+    Attributes:
+        entries: dict of (section, item) to the tuple of values indexed
+        value_index: dict of a value to the set of (section, item) using it
+        item_index: dict of an item name to the set of sections containing it
+        section_index: dict of section names to the set of items in them
+        sections: Set of the section names containing any values
+        items: Set of the item names containing any values
+        values: Set of all the unique values
+    """
+
+    def __init__(self, cfg=None):
+        """
+        Args:
+            cfg: OrderedDict of a config to build the index from (optional)
+        """
+        self.build(cfg or OrderedDict())
+
+    def build(self, cfg):
+        """
+        Rebuilds the whole index from a config
+
+        Args:
+            cfg: OrderedDict of the config file
+        """
+        self.entries = {}
+        self.value_index = {}
+        self.item_index = {}
+        self.section_index = OrderedDict()
+        self.sections = set()
+        self.items = set()
+        self.values = set()
+
+        # Number of items with values in each section and sections with
+        # values for each item, to keep sections and items current
+        self._section_counts = {}
+        self._item_counts = {}
+
+        for section, items in cfg.items():
+            self.add_section(section)
+
+            for item, value in items.items():
+                self.set(section, item, value)
+
+    def add_section(self, section):
+        """
+        Registers a section, which may be empty
+        """
+        if section not in self.section_index.keys():
+            self.section_index[section] = set()
+
+    def set(self, section, item, value):
+        """
+        Indexes the value(s) of an item replacing anything indexed before
+
+        Args:
+            section: section name
+            item: item name
+            value: single value or list of values assigned to the item
+        """
+        self.discard(section, item)
+        self.add_section(section)
+
+        values = tuple(mk_lst(value))
+        self.entries[(section, item)] = values
+        self.section_index[section].add(item)
+        self.item_index.setdefault(item, set()).add(section)
+
+        if values:
+            self._count(self._section_counts, self.sections, section, 1)
+            self._count(self._item_counts, self.items, item, 1)
+
+        for v in values:
+            try:
+                if v not in self.value_index:
+                    self.value_index[v] = set()
+                    self.values.add(v)
+
+                self.value_index[v].add((section, item))
+
+            # Unhashable values are not searchable
+            except TypeError:
+                pass
+
+    @staticmethod
+    def _count(counts, names, name, change):
+        """
+        Changes the count of a name, keeping the names with a count in names
+        """
+        n = counts.get(name, 0) + change
+
+        if n > 0:
+            counts[name] = n
+            names.add(name)
+
+        else:
+            counts.pop(name, None)
+            names.discard(name)
+
+    def discard(self, section, item):
+        """
+        Removes an item from the index if it is there
+        """
+        key = (section, item)
+        values = self.entries.pop(key, None)
+
+        if values is None:
+            return
+
+        self.section_index[section].discard(item)
+
+        sections = self.item_index[item]
+        sections.discard(section)
+        if not sections:
+            del self.item_index[item]
+
+        if values:
+            self._count(self._section_counts, self.sections, section, -1)
+            self._count(self._item_counts, self.items, item, -1)
+
+        for v in values:
+            try:
+                locations = self.value_index[v]
+            except (KeyError, TypeError):
+                continue
+
+            locations.discard(key)
+            if not locations:
+                del self.value_index[v]
+                self.values.discard(v)
+
+    def discard_section(self, section):
+        """
+        Removes a section and all its items from the index
+        """
+        for item in list(self.section_index.get(section, [])):
+            self.discard(section, item)
+
+        self.section_index.pop(section, None)
+
+    def where(self, value):
+        """
+        Returns a set of (section, item) tuples using the value
+        """
+        try:
+            return self.value_index.get(value, set())
+        except TypeError:
+            return set()
+
+    def sections_with(self, item):
+        """
+        Returns a set of the sections containing the item name
+        """
+        return self.item_index.get(item, set())
+
+
 class UserConfig():
     """
     Class meant for managing the the users config, here we operate on the
@@ -25,43 +190,73 @@ class UserConfig():
         raw_cfg: Untouched original OrderedDict that inicheck read from file
         cfg: OrderedDict of the config file that inicheck will check, cast,
             list, etc
+        recipe_cfg: OrderedDict of the config after recipes were applied but
+            before anything was casted
+        issues: None or a tuple of the config checked and the list of
+            :class:`~inicheck.tools.Issue` found by the last
+            :func:`~inicheck.tools.check_and_cast`
         recipes: List of entries.recipes.RecipesSection that apply to this
             config
-        sections: List of strings that represent the unique sections for the
+        sections: Set of strings that represent the unique sections for the
             whole config file
-        items: List of strings that represent the unique items for the whole
+        items: Set of strings that represent the unique items for the whole
             config file
-        values: List of strings that represent the unique values for the whole
+        values: Set of strings that represent the unique values for the whole
             config file
+        index: ConfigIndex of cfg kept current as recipes, defaults and
+            changes are applied
         mcfg: config.MasterConfig object that represents the standard the cfg
             is checked against
+        timings: None or the :class:`~inicheck.timings.Timings` recorded
+            while getting the config with
+            :func:`~inicheck.tools.get_user_config`
 
 
     """
 
-    def __init__(self, filename, mcfg=None):
+    def __init__(self, filename, mcfg=None, text=None):
         """
         Args:
             filename: String to path containing config in .ini format
             mcfg: Object of the master config
+            text: String of the config in .ini format to use instead of
+                  reading filename, relative paths in it are still relative
+                  to filename
         """
         self.filename = filename
         self.recipes = []
         self.raw_cfg = OrderedDict()
+        self.recipe_cfg = None
+        self.issues = None
+        self.timings = None
+        self.index = ConfigIndex()
 
         # Hang on to the original
-        if self.filename is not None:
-            self.raw_cfg = read_config(filename)
+        if text is not None or self.filename is not None:
+            if text is not None:
+                self.raw_cfg = read_config_text(text)
+            else:
+                self.raw_cfg = read_config(filename)
 
             # The version  of the config that inicheck will mess with
             self.cfg = copy.deepcopy(self.raw_cfg)
-
-            self.sections, self.items, self.values = \
-                self.get_unique_entries(self.cfg)
+            self.index.build(self.cfg)
 
         if mcfg is not None:
             self.mcfg = mcfg
 
+    @property
+    def sections(self):
+        return self.index.sections
+
+    @property
+    def items(self):
+        return self.index.items
+
+    @property
+    def values(self):
+        return self.index.values
+
     def apply_recipes(self):
         """
         Look through the users config file and section by section add in
@@ -73,6 +268,7 @@ class UserConfig():
 
         # Add this in case the user has added anything to the config obj
         self.cfg = copy.deepcopy(self.raw_cfg)
+        self.index.build(self.cfg)
 
         # Start fresh with recipes to avoid over populating the recipes list
         self.recipes = []
@@ -82,72 +278,15 @@ class UserConfig():
             for trigger, recipe_entry in r.triggers.items():
                 # Full conditions met to handle mulitple triggers
                 conditions_met = 0
-                triggered = False
 
                 # All conditions must be met if to be applied
                 for condition in recipe_entry.conditions:
-                    conditions_triggered = []
-                    for section in self.cfg.keys():
-
-                        # Is it a valid section
-                        if section in self.mcfg.cfg.keys():
-
-                            # Watch out for empty sections
-                            if len(self.cfg[section].keys()) == 0:
-                                items = [None]
-                            else:
-                                items = self.cfg[section].keys()
-
-                            for item in items:
-                                # Confirm its a registered item
-                                if item in self.mcfg.cfg[section].keys():
-                                    vals = mk_lst(self.cfg[section][item])
-
-                                # Watch for empties
-                                elif item is None:
-                                    vals = [None]
-                                else:
-                                    vals = []
-
-                                for v in vals:
-                                    # Sections
-
-                                    if (condition[0] == 'any' or
-                                            condition[0] == section):
-
-                                        if FULL_DEBUG:
-                                            print("Section Gate {0} == {1}"
-                                                  "".format(condition[0],
-                                                            section))
-                                        # Items
-                                        if (condition[1] == 'any' or
-                                                condition[1] == item):
-                                            if FULL_DEBUG:
-                                                print(
-                                                    "\t\tItem Gate {0} == {1}"
-                                                    "".format(condition[1],
-                                                              item))
-                                            # Values
-                                            if (condition[2] == 'any' or
-                                                    condition[2] == v):
-                                                if FULL_DEBUG:
-                                                    print(
-                                                        "\t\t\t\tValue Gate "
-                                                        "{0} == {1}"
-                                                        "".format(
-                                                            condition[2],
-                                                            v))
-
-                                                # No conditions == [any any
-                                                # any]
-                                                conditions_triggered.append(
-                                                    (section, item, v))
-                                                triggered = True
+                    conditions_triggered = self.get_condition_matches(
+                        condition)
 
                     # Determine if the condition was met.
-                    if triggered:
+                    if conditions_triggered:
                         conditions_met += 1
-                        triggered = False
 
                 if (conditions_met == len(recipe_entry.conditions) and
                         len(recipe_entry.conditions) != 0):
@@ -173,7 +312,8 @@ class UserConfig():
                     for situation in conditions_triggered:
                         # Insert the recipe into the users config
                         self.cfg = self.interpret_recipes(r.adj_config,
-                                                          situation)
+                                                          situation,
+                                                          index=self.index)
 
                 else:
                     if DEBUG:
@@ -183,7 +323,245 @@ class UserConfig():
                                         conditions_met))
                         print('\n\n')
 
-    def interpret_recipes(self, partial_cfg, situation):
+        # Hang on to the uncasted result for re-evaluating changes later
+        self.recipe_cfg = copy_sections(self.cfg)
+
+    def update(self, changes):
+        """
+        Changes individual items in the users config and re-validates only
+        what the changes affect. Recipes are only re-applied if a trigger or
+        an adjustment of a recipe references one of the changed items, only
+        the items whose values changed (and any items in the same sections
+        with checks depending on other items) are re-checked and only the
+        changed items are re-casted. Values that cannot be casted are left
+        as they are so the checks can report them.
+
+        Meant to be used on a config that has been casted, e.g. from
+        :func:`~inicheck.tools.get_user_config`.
+
+        Args:
+            changes: Dictionary with (section, item) tuples as keys and the
+                     new values as values
+
+        Returns:
+            tuple:
+            - **new_warnings** - list of warnings introduced by the changes
+            - **new_errors** - list of errors introduced by the changes
+            - **resolved_warnings** - list of warnings fixed by the changes
+            - **resolved_errors** - list of errors fixed by the changes
+        """
+        # Avoid a circular import, tools depends on this module
+        from .tools import cast_items, check_items, get_merged_checkers
+
+        old_cfg = self.cfg
+        old_recipe_cfg = self.recipe_cfg
+
+        if old_recipe_cfg is None:
+            old_recipe_cfg = copy_sections(self.cfg)
+
+        for (section, item), value in changes.items():
+            if section not in self.raw_cfg.keys():
+                self.raw_cfg[section] = OrderedDict()
+            self.raw_cfg[section][item] = mk_lst(value)
+
+        if self.get_affected_recipes(changes, old_recipe_cfg):
+            self.apply_recipes()
+
+        else:
+            self.recipe_cfg = copy_sections(old_recipe_cfg)
+
+            for (section, item), value in changes.items():
+                if section not in self.recipe_cfg.keys():
+                    self.recipe_cfg[section] = OrderedDict()
+                self.recipe_cfg[section][item] = mk_lst(value)
+                self.index.set(section, item, mk_lst(value))
+
+        new_recipe_cfg = self.recipe_cfg
+        changed = get_changed_items(old_recipe_cfg, new_recipe_cfg)
+
+        # Items with checks that depend on the changed ones
+        all_checks = get_merged_checkers(self)
+        affected = list(changed)
+        changed_keys = set(changed)
+        affected_keys = set(changed)
+        changed_sections = set([s for s, i in changed])
+
+        for s in changed_sections:
+            if s in self.mcfg.cfg.keys() and s in new_recipe_cfg.keys():
+                for i in new_recipe_cfg[s].keys():
+                    if i in self.mcfg.cfg[s].keys() and \
+                            (s, i) not in affected_keys:
+                        fn = all_checks[self.mcfg.cfg[s][i].type]
+                        if fn.cross_item:
+                            affected.append((s, i))
+                            affected_keys.add((s, i))
+
+        # Issues found before the changes
+        self.cfg = old_cfg
+        old_warnings, old_errors = check_items(
+            self, self._valid_keys(affected, old_cfg), all_checks=all_checks)
+
+        # Reuse the casted values of anything that did not change
+        new_cfg = OrderedDict()
+        for s, items in new_recipe_cfg.items():
+            old_section = old_cfg.get(s)
+
+            # Keep lazily casted sections lazy
+            if isinstance(old_section, LazySection):
+                new_cfg[s] = LazySection(s, items, old_section.caster)
+
+                for i in items.keys():
+                    if (s, i) not in changed_keys and \
+                            old_section.is_cast(i):
+                        new_cfg[s][i] = old_section[i]
+                continue
+
+            new_cfg[s] = OrderedDict()
+            for i, v in items.items():
+                if (s, i) in changed_keys or old_section is None or \
+                        i not in old_section.keys():
+                    new_cfg[s][i] = v
+                else:
+                    new_cfg[s][i] = old_section[i]
+
+        self.cfg = new_cfg
+        keys = self._valid_keys(affected, new_cfg)
+        cast_items(self, [k for k in keys if k in changed_keys],
+                   all_checks=all_checks, strict=False)
+        new_warnings, new_errors = check_items(self, keys,
+                                               all_checks=all_checks)
+
+        return ([w for w in new_warnings if w not in old_warnings],
+                [e for e in new_errors if e not in old_errors],
+                [w for w in old_warnings if w not in new_warnings],
+                [e for e in old_errors if e not in new_errors])
+
+    def get_affected_recipes(self, changes, cfg):
+        """
+        Finds the recipes that have a trigger condition or an adjustment that
+        references any of the changed items, either by its old or new value.
+
+        Args:
+            changes: Dictionary with (section, item) tuples as keys and the
+                     new values as values
+            cfg: config dictionary containing the old values
+
+        Returns:
+            list: recipes that need to be re-evaluated
+        """
+        special = ['any', 'apply_defaults', 'remove_section']
+        affected = []
+
+        for r in self.mcfg.recipes:
+            touched = False
+
+            for (section, item), value in changes.items():
+                values = mk_lst(value)
+                if section in cfg.keys() and item in cfg[section].keys():
+                    values = values + mk_lst(cfg[section][item])
+
+                # Trigger conditions that could match old or new values
+                for recipe_entry in r.triggers.values():
+                    for condition in recipe_entry.conditions:
+                        if condition[0] in ['any', section] and \
+                                condition[1] in ['any', item] and \
+                                (condition[2] == 'any' or
+                                 condition[2] in values):
+                            touched = True
+
+                # Adjustments that would edit the changed item
+                for s, adj in r.adj_config.items():
+                    if s in ['any', section]:
+                        for k, v in adj.items():
+                            if k == item or k in special or \
+                                    item in mk_lst(v):
+                                touched = True
+
+            if touched:
+                affected.append(r)
+
+        return affected
+
+    def _valid_keys(self, keys, cfg):
+        """
+        Filters (section, item) keys down to those present in cfg and in a
+        section of the master config
+        """
+        return [(s, i) for s, i in keys
+                if s in self.mcfg.cfg.keys() and s in cfg.keys() and
+                i in cfg[s].keys()]
+
+    def get_condition_matches(self, condition):
+        """
+        Finds every situation in the users config matching a recipe
+        condition. Only sections and items registered in the master config
+        can match. The index is used to narrow down the sections and items
+        to look at when the condition names an item or a value.
+
+        Args:
+            condition: List of len=3 of section, item, value, where any can
+                       be the keyword any
+        Returns:
+            list: tuples of (section, item, value) matching the condition in
+                  the order they appear in the config
+        """
+        c_section, c_item, c_value = condition
+        matches = []
+
+        # Narrow down the sections to look at
+        if c_section != 'any':
+            sections = [c_section] if c_section in self.cfg.keys() else []
+        else:
+            sections = list(self.cfg.keys())
+
+        if c_item != 'any':
+            candidates = self.index.sections_with(c_item)
+            sections = [s for s in sections if s in candidates]
+
+        elif c_value != 'any':
+            locations = self.index.where(c_value)
+            candidates = set([s for s, i in locations])
+            sections = [s for s in sections if s in candidates]
+
+        for section in sections:
+            # Is it a valid section
+            if section not in self.mcfg.cfg.keys():
+                continue
+
+            configured = self.cfg[section]
+
+            # Watch out for empty sections
+            if len(configured.keys()) == 0:
+                if c_item == 'any' and c_value == 'any':
+                    matches.append((section, None, None))
+                continue
+
+            if c_item != 'any':
+                items = [c_item] if c_item in configured.keys() else []
+
+            elif c_value != 'any':
+                items = [i for i in configured.keys()
+                         if (section, i) in locations]
+            else:
+                items = configured.keys()
+
+            for item in items:
+                # Confirm its a registered item
+                if item not in self.mcfg.cfg[section].keys():
+                    continue
+
+                for v in mk_lst(configured[item]):
+                    if c_value == 'any' or c_value == v:
+                        if FULL_DEBUG:
+                            print("\t\t\t\tGates {0} == {1}"
+                                  "".format(condition, (section, item, v)))
+
+                        # No conditions == [any any any]
+                        matches.append((section, item, v))
+
+        return matches
+
+    def interpret_recipes(self, partial_cfg, situation, index=None):
         """
         User inserts a partial config by using each situation that
         triggered a recipe. A triggering situation consists of a tuple of
@@ -194,10 +572,12 @@ class UserConfig():
         Args:
             partial_cfg: dictionary of edits to be applied to the cfg
             situation: List of len=3 describing the trigger mechanism
+            index: ConfigIndex to keep current with the edits (optional)
         Return:
             result: Modified dictionary
         """
-        result = copy.deepcopy(self.cfg)
+        # Edits replace values or sections, never change them in place
+        result = copy_sections(self.cfg)
 
         for section in partial_cfg.keys():
             for item in partial_cfg[section].keys():
@@ -211,7 +591,8 @@ class UserConfig():
                     if item == 'apply_defaults':
                         if str(value).lower() == 'true':
                             result = self.add_defaults(result,
-                                                       sections=section)
+                                                       sections=section,
+                                                       index=index)
 
                     # Keyword removal
                     elif item == 'remove_section':
@@ -223,6 +604,9 @@ class UserConfig():
                                           "".format(section))
                                 del result[section]
 
+                                if index is not None:
+                                    index.discard_section(section)
+
                     # Normal operation
                     else:
 
@@ -258,7 +642,8 @@ class UserConfig():
 
                                 # Prefer user selection over default
                                 if i not in self.cfg[s]:
-                                    v = self.mcfg.cfg[s][i].default
+                                    v = copy.copy(
+                                        self.mcfg.cfg[s][i].default)
 
                             else:
                                 raise Exception(
@@ -284,6 +669,9 @@ class UserConfig():
                                         print("Removed: {0} {1}".format(s, i))
                                     del result[s][i]
 
+                                    if index is not None:
+                                        index.discard(s, i)
+
                         elif s in result.keys():
                             # Check for empty dictionaries
                             if not bool(result[s]):
@@ -302,6 +690,9 @@ class UserConfig():
                                               "".format(s, i, v))
                                     result[s][i] = v
 
+                                    if index is not None:
+                                        index.set(s, i, v)
+
                                 # If the item was provided we don't want to
                                 # overide the user with defaults
                                 elif value != 'default':
@@ -310,6 +701,9 @@ class UserConfig():
                                               "".format(s, i, v))
                                     result[s][i] = v
 
+                                    if index is not None:
+                                        index.set(s, i, v)
+
         return result
 
     def get_unique_entries(self, cfg):
@@ -324,52 +718,52 @@ class UserConfig():
             tuple: tuple of len=3 of sets of unique sections items and values
         """
 
-        unique_sections = []
-        unique_items = []
-        unique_values = []
-
-        for section in cfg.keys():
-            for item, value in cfg[section].items():
-                if not isinstance(value, list):
-                    vals = [value]
-                else:
-                    vals = value
-
-                for v in vals:
-                    unique_sections.append(section)
-                    unique_items.append(item)
-                    unique_values.append(v)
+        index = ConfigIndex(cfg)
 
-        return set(unique_sections), set(unique_items), set(unique_values)
+        return index.sections, index.items, index.values
 
-    def add_defaults(self, cfg, sections=None, items=None):
+    def add_defaults(self, cfg, sections=None, items=None, index=None):
         """
         Look through the users config file and section by section add in
-        missing parameters to add defaults
+        missing parameters to add defaults. Defaults come from the
+        precomputed templates on the master config and are merged under the
+        users values, only sections being filled are copied.
 
         Args:
             sections: Single section name or a list of sections to apply
                       (optional) otherwise uses all sections in users
                       config
+            index: ConfigIndex to keep current with the defaults added
+                   (optional)
         Returns:
             user_cfg: User config dictionary with defaults added.
 
         """
-        master = self.mcfg.cfg
-        result = copy.deepcopy(cfg)
+        templates = self.mcfg.defaults
+
+        # Shallow copy, untouched sections are shared with cfg
+        result = copy.copy(cfg)
+
         # Either go through specified sections or all sections provided by
         # user.
         if sections is None:
-            sections = result.keys()
+            sections = list(result.keys())
         else:
             # Accounts for single items not entered as a list
             sections = mk_lst(sections)
 
         for section in sections:
-            configured = result[section]
-            for k, v in master[section].items():
-                if v.name not in configured.keys():
-                    result[section][k] = v.default
+            configured = copy.copy(result[section])
+            # Lists are copied so users can not change the templates
+            missing = [(k, copy.copy(v)) for k, v in templates[section].items()
+                       if k not in configured]
+            configured.update(missing)
+            result[section] = configured
+
+            if index is not None:
+                for k, v in missing:
+                    index.set(section, k, v)
+
         return result
 
     def update_config_paths(self, user_cfg_path=None):
@@ -399,6 +793,137 @@ class UserConfig():
         return cfg
 
 
+class LazySection(MutableMapping):
+    """
+    A section of the users config that casts its values the first time they
+    are accessed and then keeps the casted value. Used to avoid casting an
+    entire config when only a few sections will be used.
+
+    Attributes:
+        name: Name of the section
+        raw: OrderedDict of the uncasted items and values
+        caster: Function receiving the section and item names that returns
+            the casted value. While it runs, accessing the item being casted
+            returns its raw value.
+    """
+
+    def __init__(self, name, items, caster):
+        self.name = name
+        self.raw = OrderedDict(items)
+        self.caster = caster
+
+        self._cast = {}
+        self._casting = set()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, item):
+        with self._lock:
+            if item in self._cast:
+                return self._cast[item]
+
+            value = self.raw[item]
+
+            # Allow the caster to look up the raw value
+            if item in self._casting:
+                return value
+
+            self._casting.add(item)
+            try:
+                value = self.caster(self.name, item)
+            finally:
+                self._casting.discard(item)
+
+            self._cast[item] = value
+            return value
+
+    def __setitem__(self, item, value):
+        # Assigned values are assumed to be ready to use
+        with self._lock:
+            self.raw[item] = value
+            self._cast[item] = value
+
+    def __delitem__(self, item):
+        with self._lock:
+            del self.raw[item]
+            self._cast.pop(item, None)
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __repr__(self):
+        return "{}({!r}, {})".format(type(self).__name__, self.name,
+                                     list(self.raw.keys()))
+
+    def __copy__(self):
+        result = LazySection(self.name, self.raw, self.caster)
+        result._cast = dict(self._cast)
+        return result
+
+    def __deepcopy__(self, memo):
+        result = LazySection(self.name, copy.deepcopy(self.raw, memo),
+                             self.caster)
+        result._cast = copy.deepcopy(self._cast, memo)
+        return result
+
+    def is_cast(self, item):
+        """
+        Returns whether the item has already been casted
+        """
+        return item in self._cast
+
+
+def copy_sections(cfg):
+    """
+    Copies a config two levels deep, so sections can be edited without
+    changing the original while the values themselves are shared.
+
+    Args:
+        cfg: dict of dicts representing a config
+    Returns:
+        result: OrderedDict copy of the config
+    """
+    result = OrderedDict()
+
+    for section, items in cfg.items():
+        result[section] = OrderedDict(items)
+
+    return result
+
+
+def get_changed_items(old_cfg, new_cfg):
+    """
+    Compares two configs item by item and reports anything that was added,
+    removed or had its value changed.
+
+    Args:
+        old_cfg: dict of dicts representing the original config
+        new_cfg: dict of dicts representing the new config
+    Returns:
+        list: (section, item) tuples of items that differ
+    """
+    changed = []
+    found = set()
+
+    for cfg, other in [(new_cfg, old_cfg), (old_cfg, new_cfg)]:
+        for section, items in cfg.items():
+            for item, value in items.items():
+                key = (section, item)
+
+                if key in found:
+                    continue
+
+                if section not in other.keys() or \
+                        item not in other[section].keys() or \
+                        other[section][item] != value:
+                    changed.append(key)
+                    found.add(key)
+
+    return changed
+
+
 class MasterConfig():
     def __init__(self, path=None, modules=None, checkers=None, titles=None,
                  header=None, changelogs=None):
@@ -464,6 +989,43 @@ class MasterConfig():
                              " initiating a master config file.")
 
         self.cfg = self.add_files(self.paths)
+        self.defaults = self.get_default_templates()
+
+    def get_default_templates(self):
+        """
+        Builds a read only template of the defaults for every section in the
+        master config. These are used by the user config to fill in missing
+        items without walking the master config entries each time. Default
+        lists are copied so the entries of the master config are never
+        shared with a user config.
+
+        Returns:
+            defaults: OrderedDict of sections containing read only mappings
+                      of item names to their default values
+        """
+        defaults = OrderedDict()
+
+        for section, entries in self.cfg.items():
+            defaults[section] = MappingProxyType(OrderedDict(
+                (item, copy.copy(entry.default))
+                for item, entry in entries.items()))
+
+        return defaults
+
+    def __getstate__(self):
+        """
+        The default templates are read only mappings which can not be
+        pickled, they are rebuilt when unpickled instead. Allows a master
+        config to be sent to other processes.
+        """
+        state = self.__dict__.copy()
+        state.pop('defaults', None)
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.defaults = self.get_default_templates()
 
     def add_files(self, paths):
         """
@@ -497,6 +1059,7 @@ class MasterConfig():
         self.checker_modules += mcfg.checker_modules
         self.titles.update(mcfg.titles)
         self.cfg.update(mcfg.cfg)
+        self.defaults = self.get_default_templates()
 
     def _read(self, master_config_file):
         """
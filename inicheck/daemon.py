@@ -0,0 +1,362 @@
+"""
+Validation daemon serving requests over a Unix domain socket and its client.
+Only the standard library is imported here so the client starts quickly, the
+daemon is started with ``inicheck --serve`` which keeps a
+:class:`~inicheck.service.ValidationService` in memory.
+
+Requests and responses are single lines of JSON, see
+:meth:`~inicheck.service.ValidationService.handle`.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+
+from .profiling import add_profile_arguments, profiled
+
+
+def default_socket():
+    """
+    Socket used when none is given, the environment variable INICHECK_SOCKET,
+    inicheck.sock in XDG_RUNTIME_DIR or in a directory of the current user in
+    the temporary directory, see :func:`private_directory`
+
+    Returns:
+        str: path to the socket
+    """
+    path = os.environ.get('INICHECK_SOCKET')
+
+    if path is None:
+        directory = os.environ.get('XDG_RUNTIME_DIR')
+
+        if not directory:
+            directory = os.path.join(tempfile.gettempdir(),
+                                     'inicheck-{}'.format(os.getuid()))
+
+        path = os.path.join(directory, 'inicheck.sock')
+
+    return path
+
+
+def private_directory(directory):
+    """
+    Creates a directory only the current user can access. An existing
+    directory is used if it is owned by the current user and no one else
+    can access it, so other users can not create or replace a socket in it.
+
+    Args:
+        directory: path to the directory
+
+    Raises:
+        OSError: if the directory exists and can not be trusted
+    """
+    try:
+        os.mkdir(directory, 0o700)
+
+    except FileExistsError:
+        pass
+
+    st = os.lstat(directory)
+
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or \
+            st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        raise OSError("{} has to be a directory only the current user can "
+                      "access".format(directory))
+
+
+def check_socket(socket_path):
+    """
+    Checks a path is a socket owned by the current user before connecting
+    to it or replacing it
+
+    Args:
+        socket_path: path to the socket
+
+    Raises:
+        OSError: if the path does not exist or is not a socket of the user
+    """
+    st = os.lstat(socket_path)
+
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise OSError("{} is not a socket owned by the current user"
+                      "".format(socket_path))
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    Answers each line of JSON received on a connection with a line of JSON
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line.decode('utf-8'))
+                response = self.server.service.handle(request)
+
+            except Exception as e:
+                response = {'failure': "{}: {}".format(type(e).__name__, e)}
+
+            self.wfile.write(json.dumps(response, default=str).encode('utf-8')
+                             + b'\n')
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Threaded server for validation requests on a Unix domain socket only the
+    current user can connect to. A socket of the user left behind by a daemon
+    that is no longer running is replaced, any other file at the path is left
+    alone. The socket is removed when the server is closed.
+
+    Attributes:
+        socket_path: path to the socket
+        service: ValidationService answering the requests
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, service):
+        self.socket_path = socket_path
+        self.service = service
+
+        if os.path.lexists(socket_path):
+            check_socket(socket_path)
+
+            try:
+                send_request({'command': 'ping'}, socket_path=socket_path,
+                             timeout=1)
+
+            except OSError:
+                os.remove(socket_path)
+
+            else:
+                raise OSError("An inicheck daemon is already running on {}"
+                              "".format(socket_path))
+
+        socketserver.UnixStreamServer.__init__(self, socket_path,
+                                               DaemonHandler)
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        os.chmod(self.socket_path, stat.S_IRUSR | stat.S_IWUSR)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+
+        try:
+            check_socket(self.socket_path)
+
+        except OSError:
+            return
+
+        os.remove(self.socket_path)
+
+
+def serve(service, socket_path=None):
+    """
+    Runs the daemon until interrupted
+
+    Args:
+        service: ValidationService answering the requests
+        socket_path: path to the socket, see :func:`default_socket`
+
+    Raises:
+        OSError: if the socket can not be used
+    """
+    if socket_path is None:
+        socket_path = default_socket()
+        private_directory(os.path.dirname(socket_path))
+
+    server = DaemonServer(socket_path, service)
+    print("inicheck daemon listening on {}".format(socket_path), flush=True)
+
+    try:
+        server.serve_forever()
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        server.server_close()
+
+
+def send_request(request, socket_path=None, timeout=None):
+    """
+    Sends a request to the daemon and waits on its response
+
+    Args:
+        request: Dictionary of the request
+        socket_path: path to the socket, see :func:`default_socket`
+        timeout: seconds to wait on the daemon, None waits indefinitely
+
+    Returns:
+        dict: response from the daemon
+    """
+    return send_requests([request], socket_path=socket_path,
+                         timeout=timeout)[0]
+
+
+def send_requests(requests, socket_path=None, timeout=None):
+    """
+    Sends several requests to the daemon over a single connection
+
+    Args:
+        requests: List of dictionaries of the requests
+        socket_path: path to the socket, see :func:`default_socket`
+        timeout: seconds to wait on the daemon, None waits indefinitely
+
+    Returns:
+        list: responses from the daemon in the order of the requests
+    """
+    if socket_path is None:
+        socket_path = default_socket()
+
+    check_socket(socket_path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(socket_path)
+
+        for request in requests:
+            s.sendall(json.dumps(request).encode('utf-8') + b'\n')
+
+        s.shutdown(socket.SHUT_WR)
+
+        with s.makefile('rb') as fp:
+            responses = [json.loads(line.decode('utf-8')) for line in fp]
+
+    if len(responses) != len(requests):
+        raise OSError("The inicheck daemon on {} closed the connection"
+                      "".format(socket_path))
+
+    return responses
+
+
+@profiled
+def client_main():
+    """
+    Command line client of the daemon, checks config files without the
+    startup cost of reading the master config and importing inicheck.
+
+    Returns:
+        int: exit code, 1 if any config had errors or could not be checked
+    """
+    parser = argparse.ArgumentParser(
+        description="Check config files using a running inicheck daemon, "
+                    "started with inicheck --serve"
+    )
+    parser.add_argument(
+        'config_files',
+        metavar='F',
+        type=str,
+        nargs='*',
+        help='Paths to config files that need checking'
+    )
+    parser.add_argument(
+        '--socket', '-s',
+        type=str,
+        default=None,
+        help="Socket of the daemon, defaults to INICHECK_SOCKET or a socket "
+             "for the user in the temporary directory"
+    )
+    parser.add_argument(
+        '--stdin',
+        action='store_true',
+        help="Read a config from stdin, paths in it are relative to the "
+             "first config file given or the current directory"
+    )
+    parser.add_argument(
+        '--reload',
+        action='store_true',
+        help="Ask the daemon to read the master config again"
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    requests = []
+
+    if args.reload:
+        requests.append({'command': 'reload'})
+
+    if args.stdin:
+        path = (args.config_files[0] if args.config_files
+                else os.path.join(os.getcwd(), '<stdin>.ini'))
+        requests.append({'path': os.path.abspath(path),
+                         'text': sys.stdin.read()})
+
+    else:
+        requests += [{'path': os.path.abspath(f)} for f in args.config_files]
+
+    if not requests:
+        parser.error("Provide config files to check, --stdin or --reload")
+
+    try:
+        responses = send_requests(requests, socket_path=args.socket)
+
+    except OSError as e:
+        print("ERROR: Could not reach an inicheck daemon, start one with "
+              "inicheck --serve\n{}".format(e))
+        return 1
+
+    return print_responses(responses)
+
+
+def print_responses(responses):
+    """
+    Prints the issues in the daemons responses
+
+    Args:
+        responses: List of response dictionaries from the daemon
+
+    Returns:
+        int: exit code, 1 if any config had errors or could not be checked
+    """
+    code = 0
+
+    for r in responses:
+        if 'path' not in r:
+            if r.get('failure') is not None:
+                print("ERROR: {}".format(r['failure']))
+                code = 1
+
+            elif r.get('reload_error') is not None:
+                print("ERROR: Master config could not be read, using the "
+                      "previous one\n{}".format(r['reload_error']))
+                code = 1
+
+            continue
+
+        if r['failure'] is not None:
+            status = 'FAILED'
+        elif r['errors']:
+            status = 'ERRORS'
+        elif r['warnings']:
+            status = 'WARNINGS'
+        else:
+            status = 'OK'
+
+        print("{:<8} {} ({} errors, {} warnings)".format(
+            status, r['path'], len(r['errors']), len(r['warnings'])))
+
+        if r['failure'] is not None:
+            print("    {}".format(r['failure']))
+
+        for issue in r['errors'] + r['warnings']:
+            print("    {}".format(issue.strip()))
+
+        if status in ['FAILED', 'ERRORS']:
+            code = 1
+
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(client_main())
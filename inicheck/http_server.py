@@ -0,0 +1,221 @@
+"""
+Local HTTP server answering validation requests with JSON, for services that
+check configs without running the inicheck CLI. Started with
+``inicheck --http [HOST:]PORT``.
+
+Endpoints:
+    POST /validate: JSON body with the path and/or text of a config, answers
+                    with its path, warnings, errors and failure
+    POST /cast: same as /validate, also answering with the casted config
+    GET /health: status of the master config
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Largest request body accepted in bytes
+MAX_BODY = 10 * 1024 * 1024
+
+# Connections waiting on a worker before new ones are turned away
+MAX_PENDING = 64
+
+
+def parse_address(address):
+    """
+    Splits an address of the form HOST:PORT or PORT, the host defaults to
+    localhost
+
+    Args:
+        address: String address
+
+    Returns:
+        tuple: host and integer port
+    """
+    host, _, port = str(address).rpartition(':')
+
+    return host or '127.0.0.1', int(port)
+
+
+class ValidationHandler(BaseHTTPRequestHandler):
+    """
+    Answers the validation endpoints using the ValidationService of the
+    server. Connections idle for longer than timeout seconds are dropped so
+    slow clients can not hold on to the workers.
+    """
+
+    commands = {'/validate': 'validate', '/cast': 'cast'}
+
+    # Seconds to wait on a client
+    timeout = 30
+
+    def do_POST(self):
+        command = self.commands.get(self.path.split('?')[0])
+
+        if command is None:
+            return self.respond(404, {'failure': "Unknown endpoint {}"
+                                                 "".format(self.path)})
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+
+            if length < 0:
+                raise ValueError("Content-Length can not be negative")
+
+        except ValueError as e:
+            return self.respond(400, {'failure': "{}: {}".format(
+                type(e).__name__, e)})
+
+        if length > MAX_BODY:
+            return self.respond(413, {'failure': "Request body is larger "
+                                                 "than {} bytes"
+                                                 "".format(MAX_BODY)})
+
+        try:
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+
+            if not isinstance(request, dict):
+                raise ValueError("Requests must be a JSON object")
+
+            request['command'] = command
+            response = self.server.service.handle(request)
+
+        except ValueError as e:
+            return self.respond(400, {'failure': "{}: {}".format(
+                type(e).__name__, e)})
+
+        self.respond(200, response)
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/health':
+            return self.respond(404, {'failure': "Unknown endpoint {}"
+                                                 "".format(self.path)})
+
+        self.respond(200, self.server.service.handle({'command': 'ping'}))
+
+    def respond(self, status, response):
+        body = json.dumps(response, default=str).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class ValidationHTTPServer(HTTPServer):
+    """
+    HTTP server handling requests on a fixed pool of threads so the number
+    of configs checked at once is bounded. Connections accepted while all
+    workers are busy wait for one, up to max_pending of them, any more are
+    answered with 503 right away.
+
+    Attributes:
+        service: ValidationService answering the requests
+        workers: Number of requests handled at a time
+        max_pending: Number of connections waiting on a worker
+        verbose: Boolean, whether to log each request
+    """
+
+    # Seconds to wait on the request of a connection that is turned away
+    busy_timeout = 1
+
+    def __init__(self, address, service, workers=8, max_pending=MAX_PENDING,
+                 verbose=False):
+        """
+        Args:
+            address: tuple of the host and port to listen on, port 0 picks
+                     a free port
+            service: ValidationService answering the requests
+            workers: Number of requests handled at a time
+            max_pending: Number of connections waiting on a worker
+            verbose: Boolean, whether to log each request
+        """
+        self.service = service
+        self.workers = workers
+        self.max_pending = max_pending
+        self.verbose = verbose
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.Semaphore(workers + max_pending)
+
+        HTTPServer.__init__(self, address, ValidationHandler)
+
+    @property
+    def url(self):
+        return 'http://{}:{}'.format(*self.server_address[:2])
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            return self.reject_request(request)
+
+        self._executor.submit(self.process_request_thread, request,
+                              client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+
+        except Exception:
+            self.handle_error(request, client_address)
+
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def reject_request(self, request):
+        """
+        Answers a connection with 503 when too many are already waiting
+        """
+        body = json.dumps({'failure': "Server is busy, try again later"}
+                          ).encode('utf-8')
+        response = ("HTTP/1.0 503 Service Unavailable\r\n"
+                    "Content-Type: application/json\r\n"
+                    "Content-Length: {}\r\n"
+                    "Connection: close\r\n\r\n".format(len(body)))
+
+        try:
+            # Read the request so closing does not reset the connection
+            # before the client reads the response
+            request.settimeout(self.busy_timeout)
+            request.recv(65536)
+            request.sendall(response.encode('ascii') + body)
+
+        except OSError:
+            pass
+
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        HTTPServer.server_close(self)
+        self._executor.shutdown(wait=True)
+
+
+def serve_http(service, address='127.0.0.1:8080', workers=8, verbose=True):
+    """
+    Runs the HTTP server until interrupted
+
+    Args:
+        service: ValidationService answering the requests
+        address: HOST:PORT or PORT to listen on
+        workers: Number of requests handled at a time
+        verbose: Boolean, whether to log each request
+    """
+    server = ValidationHTTPServer(parse_address(address), service,
+                                  workers=workers, verbose=verbose)
+    print("inicheck HTTP server listening on {}".format(server.url),
+          flush=True)
+
+    try:
+        server.serve_forever()
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        server.server_close()
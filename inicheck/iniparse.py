@@ -18,6 +18,32 @@ def read_config(fname):
         lines = f.readlines()
         f.close()
 
+    return parse_config_lines(lines)
+
+
+def read_config_text(text):
+    """
+    Reads in a config file from a string in its most raw form, the same way
+    :func:`~inicheck.iniparse.read_config` reads a file.
+
+    Args:
+        text: String containing the config in .ini format
+    Returns:
+        config: dict of dicts containing the info in a config file
+    """
+    return parse_config_lines(text.splitlines(True))
+
+
+def parse_config_lines(lines):
+    """
+    Parses the lines of a config file into a dictionary of dictionaries that
+    contain the string result
+
+    Args:
+        lines: List of lines from a config file
+    Returns:
+        config: dict of dicts containing the info in a config file
+    """
     sections = parse_sections(lines)
     sec_and_items = parse_items(sections)
     config = parse_values(sec_and_items)
@@ -309,6 +309,45 @@ def print_non_defaults(ucfg):
     print("")
 
 
+def print_timings(timings, logger=None):
+    """
+    Prints the time spent in each stage and the counts recorded while
+    validating a config, see :class:`~inicheck.timings.Timings`.
+
+    Args:
+        timings: Timings object, e.g. from the timings attribute of a user
+                 config
+        logger: pass in the logger function being used. If no logger is
+                provided, print is used. Default = None
+    """
+    if logger is not None:
+        out = logger.info
+    else:
+        out = print
+
+    msg = "{: <40} {: >10} {: >15}"
+    hdr = msg.format("Stage", "Calls", "Time (ms)")
+
+    out(" ")
+    out("Timings Report:")
+    out("=" * len(hdr))
+    out(hdr)
+    out("-" * len(hdr))
+
+    for name, (calls, seconds) in timings.stages.items():
+        out(msg.format(name, calls, "{:0.2f}".format(seconds * 1000)))
+
+    if timings.counters:
+        out(" ")
+        out(msg.format("Counter", "Count", ""))
+        out("-" * len(hdr))
+
+        for name, n in timings.counters.items():
+            out(msg.format(name, n, ""))
+
+    out(" ")
+
+
 def print_change_report(
         potential_changes, required_changes, ucfg, logger=None):
     """
@@ -0,0 +1,167 @@
+"""
+Profiling options shared by the inicheck console scripts. Any of them can be
+run with ``--profile out.prof`` to save cProfile stats and print the slowest
+functions, and ``--memprofile`` to print the lines allocating the most memory
+with tracemalloc. The environment variables INICHECK_PROFILE and
+INICHECK_MEMPROFILE do the same without changing the command, a number given
+in INICHECK_MEMPROFILE is the number of lines to print.
+"""
+
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tracemalloc
+from functools import wraps
+
+# Lines shown in the reports by default
+REPORT_LINES = 25
+
+
+def add_profile_arguments(parser):
+    """
+    Adds the profiling options to a console scripts argument parser
+
+    Args:
+        parser: argparse.ArgumentParser of the console script
+    """
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        type=str,
+        default=os.environ.get('INICHECK_PROFILE') or None,
+        help="Save cProfile stats of the run to FILE, e.g. for snakeviz, "
+             "and print the slowest functions. Defaults to the environment "
+             "variable INICHECK_PROFILE"
+    )
+    parser.add_argument(
+        '--memprofile',
+        action='store_true',
+        default=memprofile_lines() is not None,
+        help="Print the lines allocating the most memory during the run "
+             "using tracemalloc. Defaults to the environment variable "
+             "INICHECK_MEMPROFILE"
+    )
+
+
+def memprofile_lines():
+    """
+    Number of allocation sites to report from the environment variable
+    INICHECK_MEMPROFILE, None when it is not set. Values that are not a
+    number use REPORT_LINES.
+    """
+    value = os.environ.get('INICHECK_MEMPROFILE')
+
+    if not value:
+        return None
+
+    try:
+        return int(value)
+
+    except ValueError:
+        return REPORT_LINES
+
+
+def profiled(func):
+    """
+    Decorates a console script so it is profiled when asked for with
+    --profile, --memprofile or the environment variables. The script's own
+    parser must also use :func:`add_profile_arguments` so the options are
+    accepted and listed in its help.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        parser = argparse.ArgumentParser(add_help=False)
+        add_profile_arguments(parser)
+        options, _ = parser.parse_known_args()
+
+        if options.profile is None and not options.memprofile:
+            return func(*args, **kwargs)
+
+        profiler = None
+
+        if options.memprofile:
+            tracemalloc.start()
+
+        if options.profile is not None:
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        try:
+            return func(*args, **kwargs)
+
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                report_profile(profiler, options.profile)
+
+            if options.memprofile:
+                report_memory(memprofile_lines() or REPORT_LINES)
+                tracemalloc.stop()
+
+    return wrapper
+
+
+def report_profile(profiler, filename, lines=REPORT_LINES, out=None):
+    """
+    Saves the stats of a profiler and prints the functions with the most
+    cumulative time
+
+    Args:
+        profiler: cProfile.Profile that was run
+        filename: path to save the stats to
+        lines: Number of functions to print
+        out: file to print to, defaults to stderr
+    """
+    if out is None:
+        out = sys.stderr
+
+    profiler.dump_stats(filename)
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('cumulative').print_stats(lines)
+
+    print("\nProfile saved to {}".format(filename), file=out)
+    print(stream.getvalue(), file=out)
+
+
+def report_memory(lines=REPORT_LINES, out=None):
+    """
+    Prints the lines that allocated the most memory still in use and the
+    peak memory traced, tracemalloc must be tracing
+
+    Args:
+        lines: Number of allocation sites to print
+        out: file to print to, defaults to stderr
+    """
+    if out is None:
+        out = sys.stderr
+
+    snapshot = tracemalloc.take_snapshot()
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ])
+    current, peak = tracemalloc.get_traced_memory()
+
+    msg = "{: >4} {: >12} {: >10}  {}"
+
+    print("\nMemory Report:", file=out)
+    print("Current {:0.1f} KiB, peak {:0.1f} KiB".format(current / 1024,
+                                                         peak / 1024),
+          file=out)
+    print(msg.format("#", "Size (KiB)", "Blocks", "Location"), file=out)
+    print("-" * 80, file=out)
+
+    for n, stat in enumerate(snapshot.statistics('lineno')[:lines]):
+        frame = stat.traceback[0]
+        print(msg.format(n + 1, "{:0.1f}".format(stat.size / 1024),
+                         stat.count,
+                         "{}:{}".format(frame.filename, frame.lineno)),
+              file=out)
+
+    print("", file=out)
@@ -0,0 +1,174 @@
+import os
+import threading
+
+from .config import MasterConfig
+from .tools import _validate_one, _validation_state
+
+
+class ValidationService(object):
+    """
+    Keeps a master config, its change log and checkers in memory to validate
+    user configs on request. Meant for long running processes like the
+    inicheck daemon where reading the master config for every config would
+    dominate. The master config is read again when any of its files or
+    change logs change on disk.
+
+    Attributes:
+        mcfg: MasterConfig the configs are validated against
+        reloads: Number of times the master config has been read
+        reload_error: None or the message of the last failed reload, the
+                      previous master config is kept in use when a reload
+                      fails
+    """
+
+    def __init__(self, master_files=None, modules=None, changelog_file=None):
+        """
+        Args:
+            master_files: path or list of paths to master config files
+            modules: a module or list of modules providing master configs
+            changelog_file: Path to a changelog for the master config
+        """
+        if modules is None and master_files is None:
+            raise IOError("ERROR: Please provide either a module or a path to"
+                          " a master config")
+
+        self.master_files = master_files
+        self.modules = modules
+        self.changelog_file = changelog_file
+
+        self.reloads = 0
+        self.reload_error = None
+
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """
+        Reads in the master config and its change log
+        """
+        mcfg = MasterConfig(path=self.master_files, modules=self.modules,
+                            changelogs=self.changelog_file)
+        state = _validation_state(mcfg, False)
+
+        with self._lock:
+            self.mcfg = mcfg
+            self._state = state
+            self._cast_state = dict(state, return_cfg=True)
+            self._mtimes = self.master_mtimes(mcfg)
+            self.reloads += 1
+            self.reload_error = None
+
+    @staticmethod
+    def master_mtimes(mcfg):
+        """
+        Modification times of the files making up a master config
+
+        Args:
+            mcfg: MasterConfig object
+
+        Returns:
+            tuple: pairs of path and modification time, None for files that
+                   no longer exist
+        """
+        mtimes = []
+
+        for p in mcfg.paths + mcfg.changelogs:
+            try:
+                mtimes.append((p, os.stat(p).st_mtime_ns))
+
+            except OSError:
+                mtimes.append((p, None))
+
+        return tuple(mtimes)
+
+    def reload_if_changed(self):
+        """
+        Reads the master config again if any of its files changed since it
+        was read. A master config that fails to read is reported in
+        reload_error and not retried until its files change again.
+
+        Returns:
+            bool: True if the master config was read again
+        """
+        with self._lock:
+            mcfg = self.mcfg
+            mtimes = self._mtimes
+
+        current = self.master_mtimes(mcfg)
+
+        if current == mtimes:
+            return False
+
+        try:
+            self.load()
+
+        except Exception as e:
+            with self._lock:
+                self._mtimes = current
+                self.reload_error = "{}: {}".format(type(e).__name__, e)
+
+            return False
+
+        return True
+
+    def validate(self, path, text=None, cast=False):
+        """
+        Validates a user config against the master config
+
+        Args:
+            path: path to the user config, when text is given this is only
+                  used to locate paths in the config relative to it
+            text: String of the user config in .ini format to validate
+                  instead of reading path
+            cast: Boolean, whether to return the casted config
+
+        Returns:
+            ValidationResult: see :func:`~inicheck.tools.validate_many`
+        """
+        self.reload_if_changed()
+
+        with self._lock:
+            state = self._cast_state if cast else self._state
+
+        return _validate_one(os.path.abspath(path), state, text=text)
+
+    def handle(self, request):
+        """
+        Answers a request sent to a server as a dictionary. Requests have
+        a command of validate (the default), cast, reload or ping. Validate
+        and cast requests have the path of a config, its text or both. Text
+        without a path is treated as a config in the current directory.
+
+        Args:
+            request: Dictionary of the request
+
+        Returns:
+            dict: the result of the validation with path, warnings, errors,
+                  cfg and failure, or status information for reload and ping
+        """
+        command = request.get('command', 'validate')
+
+        if command in ['validate', 'cast']:
+            path = request.get('path')
+            text = request.get('text')
+
+            if path is None:
+                if text is None:
+                    raise ValueError("Requests to {} need the path or text of"
+                                     " a config".format(command))
+
+                path = os.path.join(os.getcwd(), '<text>.ini')
+
+            result = self.validate(path, text=text, cast=command == 'cast')
+
+            return dict(result._asdict())
+
+        elif command == 'reload':
+            self.load()
+
+        elif command != 'ping':
+            raise ValueError("Unknown command {}".format(command))
+
+        return {'reloads': self.reloads,
+                'reload_error': self.reload_error,
+                'master_files': list(self.mcfg.paths)}
@@ -0,0 +1,174 @@
+"""
+Optional instrumentation of where the time goes while validating configs.
+Code throughout inicheck marks its stages with :func:`stage` and counts
+expensive operations with :func:`count`, both do nothing unless a
+:class:`Timings` is recording on the same thread.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# Timings recording on each thread, kept per thread so concurrent
+# validations, e.g. in the daemon or HTTP server, do not record each other
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def _recording():
+    """
+    Returns a tuple of the Timings recording on the current thread
+    """
+    return getattr(_local, 'active', ())
+
+
+class Timings(object):
+    """
+    Records the wall time and number of calls of each stage and the counts
+    of expensive operations, e.g. file system lookups or dateparser calls,
+    while it is used as a context manager. Only work done on the thread
+    that entered it is included, and work on other threads running
+    functions wrapped with :func:`bind`. Stages may be nested, in which case
+    the time is included in both.
+
+    Attributes:
+        stages: OrderedDict of stage names to a list of the number of calls
+                and total seconds
+        counters: OrderedDict of counter names to their counts
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self.counters = OrderedDict()
+        self._previous = []
+
+    def __enter__(self):
+        active = _recording()
+        self._previous.append(active)
+        _local.active = active + (self,)
+
+        return self
+
+    def __exit__(self, *exc):
+        _local.active = self._previous.pop()
+
+    def add_time(self, name, seconds):
+        """
+        Adds a call of a stage
+
+        Args:
+            name: Name of the stage
+            seconds: Wall time the call took
+        """
+        with _lock:
+            recorded = self.stages.setdefault(name, [0, 0.0])
+            recorded[0] += 1
+            recorded[1] += seconds
+
+    def add_count(self, name, n=1):
+        """
+        Adds to a counter
+
+        Args:
+            name: Name of the counter
+            n: Number to add
+        """
+        with _lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def seconds(self, name):
+        """
+        Returns the total seconds recorded for a stage, 0 if it never ran
+        """
+        return self.stages.get(name, [0, 0.0])[1]
+
+
+class _Stage(object):
+    """
+    Times a single call of a stage for every Timings recording
+    """
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+
+        for timings in _recording():
+            timings.add_time(self.name, elapsed)
+
+
+class _NoStage(object):
+    """
+    Stand in for a stage when nothing is recording
+    """
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_no_stage = _NoStage()
+
+
+def stage(name):
+    """
+    Context manager timing a stage when a Timings is recording
+
+    Args:
+        name: Name of the stage
+    """
+    if not _recording():
+        return _no_stage
+
+    return _Stage(name)
+
+
+def count(name, n=1):
+    """
+    Adds to a counter of every Timings recording
+
+    Args:
+        name: Name of the counter
+        n: Number to add
+    """
+    for timings in _recording():
+        timings.add_count(name, n)
+
+
+def bind(fn):
+    """
+    Wraps a function so it records into the Timings recording on the calling
+    thread when it is run on another thread, e.g. by a thread pool
+
+    Args:
+        fn: Function to wrap
+
+    Returns:
+        function: fn when nothing is recording, otherwise the wrapped fn
+    """
+    active = _recording()
+
+    if not active:
+        return fn
+
+    @wraps(fn)
+    def recorded(*args, **kwargs):
+        previous = _recording()
+        _local.active = active
+
+        try:
+            return fn(*args, **kwargs)
+
+        finally:
+            _local.active = previous
+
+    return recorded
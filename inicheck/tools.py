@@ -1,15 +1,37 @@
+import copy
+import hashlib
+import importlib
 import inspect
 import os
+import pickle
+import stat
 import sys
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from itertools import groupby
 
 from .changes import ChangeLog
-from .config import MasterConfig, UserConfig, check_types
+from .checkers import (PathCache, load_entry_point_checkers,
+                       registered_checkers)
+from .config import (LazySection, MasterConfig, UserConfig, check_types,
+                     copy_sections, get_changed_items)
+from .timings import bind, count, stage
 from .utilities import get_inicheck_cmd, mk_lst
 
+# Default number of threads checking paths and URLs during a validation
+IO_WORKERS = 8
+
 
 def get_checkers(module='inicheck.checkers', keywords="check",
                  ignore=["type", "generic", "path"]):
     """
+    Finds the checker classes in a module by their class names. Results are
+    memoized so each module is only searched once.
+
     Args:
         module: The module to search for the classes
         keyword: Keywords to look for in class names
@@ -18,7 +40,17 @@ def get_checkers(module='inicheck.checkers', keywords="check",
     Returns:
         dictionary: Dict of the classes available for checking config entries
     """
-    keywords = mk_lst(keywords)
+    return dict(_find_checkers(module, tuple(mk_lst(keywords)),
+                               tuple(ignore)))
+
+
+@lru_cache(maxsize=None)
+def _find_checkers(module, keywords, ignore):
+    """
+    Searches a module for checker classes, see get_checkers.
+    """
+    if module not in sys.modules.keys():
+        importlib.import_module(module)
 
     funcs = inspect.getmembers(sys.modules[module], inspect.isclass)
     func_dict = {}
@@ -47,7 +79,10 @@ def get_checkers(module='inicheck.checkers', keywords="check",
 def get_merged_checkers(ucfg):
     """
     Retrieve the dictionary of checker classes by grabbing all in inicheck and
-    any prescribed in the master config through another module
+    any prescribed in the master config through another module. Checkers
+    registered with :func:`~inicheck.checkers.register_checker` or through
+    the inicheck.checkers entry point group are added last, replacing any
+    found by name. The result is memoized for each set of modules.
 
     Args:
         ucfg: User Config object containing modules
@@ -55,27 +90,61 @@ def get_merged_checkers(ucfg):
         dictionary: all_checks - dictionary of all the checkers from inicheck
                     and any modules assigned to the master config.
     """
+    load_entry_point_checkers()
+
+    modules = tuple(ucfg.mcfg.checker_modules)
+
+    # Registering a checker changes the result
+    key = (modules, tuple(registered_checkers.items()))
 
-    # Grab all the original
-    all_checks = get_checkers()
+    if key not in _merged_checkers.keys():
 
-    # Add any checker modules if provided
-    if ucfg.mcfg.checker_modules:
-        for c in ucfg.mcfg.checker_modules:
-            new_checks = get_checkers(module=c)
-            all_checks.update(new_checks)
+        # Grab all the original
+        all_checks = get_checkers()
 
-    return all_checks
+        # Add any checker modules if provided
+        for c in modules:
+            all_checks.update(get_checkers(module=c))
 
+        all_checks.update(registered_checkers)
+        _merged_checkers[key] = all_checks
 
-def check_config(config_obj):
+    return dict(_merged_checkers[key])
+
+
+# Merged checkers for each set of checker modules and registered checkers
+_merged_checkers = {}
+
+
+# Issue found while checking a user config. Index is the position of the
+# value within the item when it has several values, otherwise None. Checker
+# is the type of the item in the master config, None for sections and items
+# missing from the master config.
+Issue = namedtuple('Issue', ['section', 'item', 'index', 'level', 'message',
+                             'checker'])
+
+# Number of items checked at a time by iter_issues
+ISSUE_CHUNK = 256
+
+
+def check_config(config_obj, workers=IO_WORKERS):
     """
     Looks at the users provided config file and checks it to a master
-    config file looking at correctness and missing info.
+    config file looking at correctness and missing info. If the config was
+    already checked by :func:`~inicheck.tools.check_and_cast` (e.g. in
+    get_user_config) and its values have not changed since, those results
+    are returned instead of checking again as long as the items checked
+    against the file system or network, or depending on other items, still
+    report the same. See
+    :func:`~inicheck.tools.iter_issues` for the issues as they are found.
 
     Args:
         config_obj - UserConfig object produced by
                      :class:`~inicheck.config.UserConfig`
+        workers - Number of threads used to check paths and URLs, which
+                  mostly wait on the file system or network. 1 or less
+                  checks them one at a time.
+                  Messages are always reported in the same order.
     Returns:
         tuple:
         - **warnings** - Returns a list of string messages that are
@@ -83,66 +152,422 @@ def check_config(config_obj):
         - **errors** - Returns a list of string messages that are
                        consider critical issues with the config file.
     """
+    return format_issues(iter_issues(config_obj, workers=workers))
+
 
+def iter_issues(config_obj, max_errors=None, fail_fast=False,
+                workers=IO_WORKERS):
+    """
+    Checks the users config against the master config like
+    :func:`~inicheck.tools.check_config`, yielding each issue as it is found
+    instead of collecting them. Items are checked ISSUE_CHUNK at a time so
+    checking stops shortly after the last issue wanted. Issues are yielded
+    in the same order check_config reports them.
+
+    Args:
+        config_obj: UserConfig object produced by
+                    :class:`~inicheck.config.UserConfig`
+        max_errors: Number of errors after which checking stops, None
+                    checks everything
+        fail_fast: Boolean, stop checking at the first error
+        workers: Number of threads used to check paths and URLs, see
+                 :func:`~inicheck.tools.check_config`
+
+    Returns:
+        generator: :class:`~inicheck.tools.Issue` for each issue found
+    """
+    if fail_fast:
+        max_errors = 1
+
+    # Reuse the results of the last check if nothing has changed, items
+    # checked against the file system or network are always checked again
+    if config_obj.issues is not None:
+        checked_cfg, issues = config_obj.issues
+
+        if not get_changed_items(checked_cfg, config_obj.cfg):
+            keys = _recheck_keys(config_obj)
+
+            if _recheck_items(config_obj, keys, workers=workers) == \
+                    [issue for issue in issues
+                     if (issue.section, issue.item) in keys]:
+                return _limit_errors(iter(issues), max_errors)
+
+    return _iter_sections(config_obj, workers=workers, max_errors=max_errors)
+
+
+def format_issues(issues):
+    """
+    Formats issues into the messages printed by
+    :func:`~inicheck.output.print_config_report`. Items with several issues
+    have the position of the value after the item name, starting at 1.
+
+    Args:
+        issues: Iterable of :class:`~inicheck.tools.Issue`
+    Returns:
+        tuple:
+        - **warnings** - list of string messages of non-critical issues
+        - **errors** - list of string messages of critical issues
+    """
     msg = "{: <20} {: <30} {: <60}"
     errors = []
     warnings = []
 
+    # Issues of an item are always found together
+    for _, group in groupby(issues, key=lambda issue: (issue.section,
+                                                       issue.item)):
+        group = list(group)
+
+        for issue in group:
+            item = issue.item
+
+            # If we had a list, provide position
+            if len(group) > 1 and issue.index is not None:
+                item += "[{}]".format(issue.index + 1)
+
+            full_msg = msg.format(issue.section, item, issue.message)
+
+            if issue.level == 'warning':
+                warnings.append(full_msg)
+            else:
+                errors.append(full_msg)
+
+    return warnings, errors
+
+
+def check_and_cast(config_obj, workers=IO_WORKERS):
+    """
+    Checks and casts the users config in a single pass. Each item gets one
+    checker which reuses the values casted during checking. Values that
+    fail to cast are left as they are and reported in the errors. The
+    results are kept on the config object so a following
+    :func:`~inicheck.tools.check_config` does not repeat the work.
+
+    Args:
+        config_obj - UserConfig object produced by
+                     :class:`~inicheck.config.UserConfig`
+        workers - Number of threads used to check paths and URLs, see
+                  :func:`~inicheck.tools.check_config`
+    Returns:
+        tuple:
+        - **warnings** - list of string messages of non-critical issues
+        - **errors** - list of string messages of critical issues
+        - **cfg** - the users config dictionary with casted values
+    """
+
+    # Grab a dictionary of all the checkers and confirm they are valid
+    all_checks = get_merged_checkers(config_obj)
+    check_types(config_obj.mcfg.cfg, all_checks)
+
+    issues = list(_iter_sections(config_obj, all_checks=all_checks,
+                                 cast=True, workers=workers))
+
+    config_obj.issues = (copy_sections(config_obj.cfg), issues)
+    warnings, errors = format_issues(issues)
+
+    return warnings, errors, config_obj.cfg
+
+
+def _iter_sections(config_obj, all_checks=None, cast=False,
+                   workers=IO_WORKERS, max_errors=None):
+    """
+    Checks every section of the users config, optionally casting the items
+    as they are checked. See iter_issues and check_and_cast.
+    """
+
     mcfg = config_obj.mcfg.cfg
     cfg = config_obj.cfg
 
     # Grab a dictionary of all the checkers
-    all_checks = get_merged_checkers(config_obj)
+    if all_checks is None:
+        all_checks = get_merged_checkers(config_obj)
+
+    keys = []
 
     # Compare user config file to our master config
     for s, configured in cfg.items():
 
         # Section does not exists in master config
         if s not in mcfg.keys():
-            err = "Not a valid section."
-            errors.append(msg.format(s, " ", err))
+            keys.append((s, None))
 
         else:
+            keys += [(s, i) for i in configured.keys()]
 
-            for i in configured.keys():
-                # lower case item
-                li = i.lower()
+    # File system lookups are shared for the whole config
+    return _limit_errors(_iter_items(config_obj, keys, all_checks, cast,
+                                     PathCache(), workers), max_errors)
 
-                # Item does not exist in the Master Config
-                if li not in mcfg[s].keys():
-                    wrn = "Not a registered option."
-                    warnings.append(msg.format(s, i, wrn))
 
-                else:
-                    issues = []
-                    fn = all_checks[mcfg[s][i].type]
+def _limit_errors(issues, max_errors):
+    """
+    Yields issues up to and including the error number max_errors, closing
+    issues afterwards so any checks still running are cancelled
+    """
+    errors = 0
 
-                    b = fn(config=config_obj, item=i, section=s)
-                    issues = b.check()
+    try:
+        for issue in issues:
+            yield issue
 
-                    # Examine the issues
-                    num_issues = len([True for p in issues if p is not None])
+            if issue.level != 'warning':
+                errors += 1
 
-                    for ii, issue in enumerate(issues):
-                        if issue is not None:
-                            pi = i
+                if max_errors is not None and errors >= max_errors:
+                    return
 
-                            # If we had a list, provide position
-                            if num_issues > 1:
-                                # Show 1 based lists
-                                pi += "[{}]".format(ii + 1)
+    finally:
+        if hasattr(issues, 'close'):
+            issues.close()
 
-                            full_msg = msg.format(s, pi, issue)
 
-                            if b.msg_level == 'warning':
-                                warnings.append(full_msg)
-                            else:
-                                errors.append(full_msg)
+def _recheck_keys(config_obj, all_checks=None):
+    """
+    Finds the items whose results can change without the config changing,
+    those checked against the file system or network and those depending on
+    other items.
 
-    return warnings, errors
+    Returns:
+        list: (section, item) tuples in the order they are checked
+    """
+    if all_checks is None:
+        all_checks = get_merged_checkers(config_obj)
+
+    mcfg = config_obj.mcfg.cfg
+
+    return [(s, i) for s, items in config_obj.cfg.items()
+            if s in mcfg.keys()
+            for i in items.keys()
+            if i in mcfg[s].keys() and
+            (all_checks[mcfg[s][i].type].io_bound or
+             all_checks[mcfg[s][i].type].cross_item)]
+
+
+def _recheck_items(config_obj, keys, all_checks=None, workers=IO_WORKERS):
+    """
+    Checks items of a casted config again the way
+    :func:`~inicheck.tools.check_and_cast` checked them, starting from the
+    values they had before casting since casting can drop information a
+    check needs. The config itself is left untouched.
+
+    Returns:
+        list: :class:`~inicheck.tools.Issue` found for the items
+    """
+    if not keys:
+        return []
+
+    if all_checks is None:
+        all_checks = get_merged_checkers(config_obj)
+
+    uncast = copy.copy(config_obj)
+    uncast.cfg = copy_sections(config_obj.cfg)
+    recipe_cfg = config_obj.recipe_cfg
+
+    if recipe_cfg is not None:
+        for s, i in keys:
+            if s in recipe_cfg.keys() and i in recipe_cfg[s].keys():
+                uncast.cfg[s][i] = recipe_cfg[s][i]
+
+    return list(_iter_items(uncast, keys, all_checks, True, PathCache(),
+                            workers))
+
+
+def check_items(config_obj, keys, all_checks=None, cast=False,
+                path_cache=None, workers=IO_WORKERS):
+    """
+    Checks individual items of the users config against the master config.
+    Used by check_config and for re-validating only the items that changed.
+
+    Args:
+        config_obj: UserConfig object produced by
+                    :class:`~inicheck.config.UserConfig`
+        keys: List of (section, item) tuples to be checked, the section must
+              be in the master config
+        all_checks: dictionary of checker classes, retrieved from the config
+                    if not provided
+        cast: Boolean, when True the items are casted in place with the
+              values casted while checking
+        path_cache: :class:`~inicheck.checkers.PathCache` shared by the
+                    path checkers, a new one is used if not provided
+        workers: Number of threads used for the path and URL checks, 1 or
+                 less checks them one at a time
+
+    Returns:
+        tuple:
+        - **warnings** - list of string messages of non-critical issues
+        - **errors** - list of string messages of critical issues
+    """
+
+    if all_checks is None:
+        all_checks = get_merged_checkers(config_obj)
+
+    if path_cache is None:
+        path_cache = PathCache()
+
+    return format_issues(_iter_items(config_obj, keys, all_checks, cast,
+                                     path_cache, workers))
+
+
+def _iter_items(config_obj, keys, all_checks, cast, path_cache, workers):
+    """
+    Checks the items in keys ISSUE_CHUNK at a time, yielding the issues of
+    each chunk in order as they are collected. Checks of the current chunk
+    still waiting to run are cancelled if the generator is closed early.
+    """
+    with _io_executor(workers) as executor:
+        for n in range(0, len(keys), ISSUE_CHUNK):
+            pending = _start_items(config_obj, keys[n:n + ISSUE_CHUNK],
+                                   all_checks, cast, path_cache, executor)
+
+            try:
+                for issue in _finish_items(config_obj, pending, cast):
+                    yield issue
+
+            finally:
+                for p in pending:
+                    if isinstance(p[3], Future):
+                        p[3].cancel()
+
+
+@contextmanager
+def _io_executor(workers):
+    """
+    Provides a thread pool for the checks waiting on the file system or
+    network, or None when workers is 1 or less so they are run as they come
+    """
+    if workers is not None and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield executor
+
+    else:
+        yield None
+
+
+def _run_check(checker, cast):
+    """
+    Runs a single checker, returning the issues or the issues and the
+    casted values when casting
+    """
+    with stage('checker {}'.format(checker.type)):
+        if cast:
+            return checker.check_and_cast()
+
+        return checker.check()
+
+
+def _start_items(config_obj, keys, all_checks, cast, path_cache, executor):
+    """
+    Starts checking the items in keys, an item of None marks a section that
+    is not in the master config. Items of a batched type are checked
+    together with the checkers check_many or check_and_cast_many, the io
+    bound checkers, e.g. paths and URLs, are submitted to the executor when
+    one is provided since they mostly wait on the file system or network.
+    The rest are run right away in order.
+
+    Returns:
+        list: tuples of (section, item, msg_level, outcome, checker type) for
+              :func:`~inicheck.tools._finish_items`. The outcome is a future
+              for submitted checks and a string for items with a fixed
+              message.
+    """
+    mcfg = config_obj.mcfg.cfg
+    pending = []
+
+    # Checker class to the positions and keys of its items in pending
+    batches = OrderedDict()
+
+    for s, i in keys:
+
+        # Section does not exists in master config
+        if i is None:
+            pending.append((s, " ", 'error', "Not a valid section.", None))
+            continue
+
+        # Item does not exist in the Master Config
+        if i.lower() not in mcfg[s].keys():
+            pending.append((s, i, 'warning', "Not a registered option.",
+                            None))
+            continue
+
+        checker_type = mcfg[s][i].type
+        fn = all_checks[checker_type]
 
+        if fn.batched and not fn.io_bound:
+            batches.setdefault(fn, []).append((len(pending), s, i))
+            pending.append(None)
+            continue
 
-def cast_all_variables(config_obj, mcfg_obj):
+        b = fn(config=config_obj, item=i, section=s, path_cache=path_cache)
+
+        if executor is not None and b.io_bound:
+            outcome = executor.submit(bind(_run_check), b, cast)
+
+        else:
+            outcome = _run_check(b, cast)
+
+            # Later checks may rely on the casted values
+            if cast:
+                config_obj.cfg[s][i] = outcome[1]
+
+        pending.append((s, i, b.msg_level, outcome, checker_type))
+
+    for fn, batch in batches.items():
+        entries = [(config_obj, s, i) for _, s, i in batch]
+
+        # Message levels do not depend on the item
+        first = fn(config=config_obj, section=batch[0][1], item=batch[0][2],
+                   path_cache=path_cache)
+        level = first.msg_level
+
+        with stage('checker {}'.format(first.type)):
+            if cast:
+                outcomes = fn.check_and_cast_many(entries,
+                                                  path_cache=path_cache)
+            else:
+                outcomes = fn.check_many(entries, path_cache=path_cache)
+
+        count('items batched', len(entries))
+
+        for (n, s, i), outcome in zip(batch, outcomes):
+            pending[n] = (s, i, level, outcome, mcfg[s][i].type)
+
+    return pending
+
+
+def _finish_items(config_obj, pending, cast):
+    """
+    Collects the outcomes of :func:`~inicheck.tools._start_items` in the
+    order they were started, waiting on any io bound checks still running.
+
+    Returns:
+        generator: :class:`~inicheck.tools.Issue` for each issue found
+    """
+    for s, i, level, outcome, checker_type in pending:
+
+        # Fixed messages
+        if isinstance(outcome, str):
+            issues = [outcome]
+
+        else:
+            if isinstance(outcome, Future):
+                outcome = outcome.result()
+
+            if cast:
+                issues, values = outcome
+                config_obj.cfg[s][i] = values
+
+            else:
+                issues = outcome
+
+        if level != 'warning':
+            level = 'error'
+
+        for ii, issue in enumerate(issues):
+            if issue is not None:
+                index = ii if len(issues) > 1 else None
+                yield Issue(s, i, index, level, issue, checker_type)
+
+
+def cast_all_variables(config_obj, mcfg_obj, lazy=False):
     """
     Cast all values into the appropiate type using checkers, other_types
     and the master config.
@@ -152,6 +577,10 @@ def cast_all_variables(config_obj, mcfg_obj):
         mcfg_obj: The object used for manage the master config from
                   class MasterConfig
         other_types: User provided list to add any custom types
+        lazy: Boolean, when True sections are replaced with
+              :class:`~inicheck.config.LazySection` which casts each item on
+              its first access. Values that fail to cast are left as is for
+              check_config to report.
 
 
     Returns:
@@ -168,32 +597,104 @@ def cast_all_variables(config_obj, mcfg_obj):
     # Confirm checks are valid
     check_types(mcfg, all_checks)
 
+    if lazy:
+        caster = partial(cast_item, config_obj, all_checks=all_checks,
+                         strict=False)
+
+        for s in ucfg.keys():
+            if s in mcfg.keys():
+                ucfg[s] = LazySection(s, ucfg[s], caster)
+
+        return config_obj
+
     # Cast all variables
-    for s in ucfg.keys():
-        if s in mcfg.keys():
-            for i in ucfg[s].keys():
-                values = []
-                # Ensure it is an item we can check
-                if i in mcfg[s].keys():
-                    fn = all_checks[mcfg[s][i].type]
-
-                    b = fn(config=config_obj, section=s, item=i)
-                    values = b.cast()
-
-                # Not recognized items, keep them anyways
-                else:
-                    values.append(ucfg[s][i])
-                    values = mk_lst(values, unlst=True)
-
-                # Reassign the values
-                ucfg[s][i] = values
-
-    config_obj.cfg = ucfg
+    keys = [(s, i) for s in ucfg.keys() if s in mcfg.keys()
+            for i in ucfg[s].keys()]
+    cast_items(config_obj, keys, all_checks=all_checks)
+
     return config_obj
 
 
+def cast_items(config_obj, keys, all_checks=None, strict=True):
+    """
+    Casts individual items of the users config in place using the checkers
+    assigned in the master config. Items not registered in the master config
+    are kept as they are.
+
+    Args:
+        config_obj: UserConfig object produced by
+                    :class:`~inicheck.config.UserConfig`
+        keys: List of (section, item) tuples to be casted, the section must
+              be in the master config
+        all_checks: dictionary of checker classes, retrieved from the config
+                    if not provided
+        strict: Boolean, when False values that fail to cast are kept
+                uncasted instead of raising, leaving them for the checks to
+                report
+    """
+
+    if all_checks is None:
+        all_checks = get_merged_checkers(config_obj)
+
+    for s, i in keys:
+        # Reassign the values
+        config_obj.cfg[s][i] = cast_item(config_obj, s, i,
+                                         all_checks=all_checks,
+                                         strict=strict)
+
+
+def cast_item(config_obj, section, item, all_checks=None, strict=True):
+    """
+    Casts a single item of the users config using the checker assigned in
+    the master config.
+
+    Args:
+        config_obj: UserConfig object produced by
+                    :class:`~inicheck.config.UserConfig`
+        section: Section name of the item, must be in the master config
+        item: Item name to be casted
+        all_checks: dictionary of checker classes, retrieved from the config
+                    if not provided
+        strict: Boolean, when False values that fail to cast are returned
+                uncasted instead of raising
+
+    Returns:
+        values: The casted value(s) of the item
+    """
+    ucfg = config_obj.cfg
+    mcfg = config_obj.mcfg.cfg
+    s = section
+    i = item
+
+    if all_checks is None:
+        all_checks = get_merged_checkers(config_obj)
+
+    values = []
+    # Ensure it is an item we can check
+    if i in mcfg[s].keys():
+        fn = all_checks[mcfg[s][i].type]
+
+        b = fn(config=config_obj, section=s, item=i)
+
+        try:
+            values = b.cast()
+
+        except Exception:
+            if strict:
+                raise
+            values = mk_lst(ucfg[s][i], unlst=True)
+
+    # Not recognized items, keep them anyways
+    else:
+        values.append(ucfg[s][i])
+        values = mk_lst(values, unlst=True)
+
+    return values
+
+
 def get_user_config(config_file, master_files=None, modules=None,
-                    mcfg=None, changelog_file=None, cli=False):
+                    mcfg=None, changelog_file=None, cli=False, lazy=False,
+                    changelog=None, text=None, cache=None, timings=None):
     """
     Returns the users config as the object UserConfig.
 
@@ -207,6 +708,22 @@ def get_user_config(config_file, master_files=None, modules=None,
                         file the developers have made
         cli: boolean determining whether to attempt to process the changes
             which should be done from the CLI only
+        lazy: boolean, cast the values on first access instead of all at
+            once, see :func:`~inicheck.tools.cast_all_variables`. Otherwise
+            the config is checked and casted in one pass with
+            :func:`~inicheck.tools.check_and_cast` and values that cannot be
+            casted are left for check_config to report.
+        changelog: ChangeLog object for the master config to reuse instead
+                   of reading its change logs again
+        text: String of the config to check instead of reading config_file,
+              which then only needs to be where relative paths in the config
+              are relative to
+        cache: :class:`~inicheck.tools.ResultCache` to reuse the result of
+               validating the same config against the same master config,
+               defaults to default_result_cache. Not used when lazy.
+        timings: :class:`~inicheck.timings.Timings` to record the time spent
+                 in each stage and checker type, it is attached to the
+                 returned config as the attribute timings
 
     Returns:
         ucfg: Users config as an object
@@ -216,7 +733,18 @@ def get_user_config(config_file, master_files=None, modules=None,
         raise IOError("ERROR: Please provide either a module or a path to a"
                       " master config, or a master config object")
 
-    if os.path.isfile(config_file):
+    if timings is not None:
+        with timings:
+            ucfg = get_user_config(config_file, master_files=master_files,
+                                   modules=modules, mcfg=mcfg,
+                                   changelog_file=changelog_file, cli=cli,
+                                   lazy=lazy, changelog=changelog, text=text,
+                                   cache=cache)
+        ucfg.timings = timings
+
+        return ucfg
+
+    if text is not None or os.path.isfile(config_file):
 
         if master_files is not None or modules is not None:
             if master_files is not None:
@@ -224,20 +752,36 @@ def get_user_config(config_file, master_files=None, modules=None,
             if modules is not None:
                 modules = mk_lst(modules)
 
-            mcfg = MasterConfig(path=master_files, modules=modules,
-                                changelogs=changelog_file)
+            with stage('master config'):
+                mcfg = MasterConfig(path=master_files, modules=modules,
+                                    changelogs=changelog_file)
 
     else:
         raise IOError("Config file path {0} doesn't exist."
                       "".format(config_file))
 
+    if cache is None:
+        cache = default_result_cache
+
+    if cache is not None and not lazy:
+        with stage('result cache'):
+            key = cache.key(config_file, mcfg, text=text)
+            ucfg = cache.get(key, mcfg=mcfg)
+
+        if ucfg is not None:
+            return ucfg
+
     # Get users config object
-    ucfg = UserConfig(config_file, mcfg=mcfg)
+    with stage('parse'):
+        ucfg = UserConfig(config_file, mcfg=mcfg, text=text)
 
     # If were not running the CLI, raise exceptions for issues
     # Check out any change logs for issues
-    chlog = ChangeLog(paths=ucfg.mcfg.changelogs, mcfg=ucfg.mcfg)
-    potentials, required = chlog.get_active_changes(ucfg)  # noqa
+    with stage('change log'):
+        if changelog is None:
+            changelog = ChangeLog(paths=ucfg.mcfg.changelogs, mcfg=ucfg.mcfg)
+
+        potentials, required = changelog.get_active_changes(ucfg)  # noqa
 
     # Required Changes that broke things
     if len(required) != 0 and not cli:
@@ -249,11 +793,432 @@ def get_user_config(config_file, master_files=None, modules=None,
                          "\n\n>> {}".format(cmd))
 
     # Fill in the gaps and make sure they're the right types
-    ucfg.apply_recipes()
-    ucfg = cast_all_variables(ucfg, mcfg)
+    with stage('recipes'):
+        ucfg.apply_recipes()
+
+    if lazy:
+        with stage('cast'):
+            ucfg = cast_all_variables(ucfg, mcfg, lazy=True)
+    else:
+        with stage('check and cast'):
+            check_and_cast(ucfg)
+
+        # Configs with required changes are left to be reported every time
+        if cache is not None and len(required) == 0:
+            with stage('result cache'):
+                cache.put(key, ucfg)
+
     return ucfg
 
 
+# Result of validating a single config with validate_many
+ValidationResult = namedtuple('ValidationResult',
+                              ['path', 'warnings', 'errors', 'cfg', 'failure'])
+
+
+def validate_many(paths, master_files=None, modules=None, mcfg=None,
+                  changelog_file=None, workers=None, chunksize=16,
+                  return_cfg=True):
+    """
+    Validates many user configs against the same master config. The master
+    config is read once and configs are validated in chunks over a pool of
+    processes, each keeping its own copy of the master config, change log
+    and checkers. Results are yielded as the chunks complete, with only a few
+    chunks per worker in flight at a time so memory stays bounded no matter
+    how many paths are given.
+
+    Args:
+        paths: Iterable of paths to user config files
+        master_files: path or list of paths to master config files
+        modules: a module or list of modules providing master configs
+        mcfg: master config object to use instead of master_files or modules
+        changelog_file: Path to a changelog for the master config
+        workers: Number of processes to use, 1 or None validates the configs
+                 in this process
+        chunksize: Number of configs sent to a process at a time
+        return_cfg: Boolean, whether to return the casted configs
+
+    Returns:
+        generator: :class:`~inicheck.tools.ValidationResult` for each path
+                   in the order they complete. Configs that could not be
+                   validated have the exception in failure.
+    """
+    if mcfg is None:
+        if modules is None and master_files is None:
+            raise IOError("ERROR: Please provide either a module or a path to"
+                          " a master config, or a master config object")
+
+        mcfg = MasterConfig(path=master_files, modules=modules,
+                            changelogs=changelog_file)
+
+    if workers is None or workers <= 1:
+        state = _validation_state(mcfg, return_cfg)
+
+        for path in paths:
+            yield _validate_one(path, state)
+
+        return
+
+    chunks = _chunks(paths, chunksize)
+    pending = set()
+
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_validation_worker,
+                             initargs=(mcfg, return_cfg)) as executor:
+
+        while True:
+            # Keep a couple of chunks per worker in flight
+            while len(pending) < 2 * workers:
+                chunk = next(chunks, None)
+
+                if chunk is None:
+                    break
+
+                pending.add(executor.submit(_validate_chunk, chunk))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                for result in future.result():
+                    yield result
+
+
+def _chunks(paths, chunksize):
+    """
+    Groups an iterable of paths into lists of chunksize
+    """
+    chunk = []
+
+    for path in paths:
+        chunk.append(path)
+
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _validation_state(mcfg, return_cfg):
+    """
+    Master config, change log and options used to validate configs, the
+    change log is read once
+    """
+    return {'mcfg': mcfg,
+            'changelog': ChangeLog(paths=mcfg.changelogs, mcfg=mcfg),
+            'return_cfg': return_cfg}
+
+
+# State of a validate_many worker process
+_validation_worker = {}
+
+
+def _init_validation_worker(mcfg, return_cfg):
+    """
+    Sets up a process for validate_many
+    """
+    _validation_worker.update(_validation_state(mcfg, return_cfg))
+
+
+def _validate_chunk(paths):
+    """
+    Validates a chunk of configs in a validate_many worker
+    """
+    return [_validate_one(path, _validation_worker) for path in paths]
+
+
+def _validate_one(path, state, text=None):
+    """
+    Validates a single config, returning the casted config as plain
+    dictionaries so it can be sent between processes
+    """
+    try:
+        ucfg = get_user_config(path, mcfg=state['mcfg'],
+                               changelog=state['changelog'], text=text)
+        warnings, errors = check_config(ucfg)
+
+        cfg = None
+        if state['return_cfg']:
+            cfg = OrderedDict((s, OrderedDict(items))
+                              for s, items in ucfg.cfg.items())
+
+        return ValidationResult(path, warnings, errors, cfg, None)
+
+    except Exception as e:
+        return ValidationResult(path, [], [], None,
+                                "{}: {}".format(type(e).__name__, e))
+
+
+class ResultCache(object):
+    """
+    Results of validating user configs with
+    :func:`~inicheck.tools.get_user_config` reused when the same config is
+    validated again. Results are keyed on a hash of the user config, the
+    master config files, change logs, checker modules and the inicheck
+    version, and include the casted config and its warnings and errors.
+
+    Results of items checked against the file system or the network, e.g.
+    filenames and URLs, can change without any of those changing. They are
+    checked again on every reuse from their values before casting, costing
+    a stat per path and a :class:`~inicheck.checkers.URLCache` lookup per
+    URL, and the result is only reused if they still agree.
+
+    Results are kept in memory or as pickles in the directory path, the
+    default cache uses the environment variable INICHECK_RESULT_CACHE for
+    it. The directory is created readable by the user only. Results are
+    neither read from nor saved to a directory, and never read from a file,
+    that is owned by another user or writable by others.
+
+    Attributes:
+        path: directory the results are saved in, None to keep them in memory
+        hits: Number of results reused
+        misses: Number of results not found
+        stale: Number of results found whose file system or network checks
+               no longer agree
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+        # Key to pickled result when kept in memory
+        self._results = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def version():
+        """
+        Returns the installed inicheck version or unknown
+        """
+        try:
+            from importlib.metadata import version
+            return version('inicheck')
+
+        except Exception:
+            return 'unknown'
+
+    def key(self, config_file, mcfg, text=None):
+        """
+        Hashes everything the result of validating a config depends on
+        besides the file system and network
+
+        Args:
+            config_file: path to the user config
+            mcfg: MasterConfig the config is validated against
+            text: String of the config used instead of reading config_file
+
+        Returns:
+            str: hex digest identifying the result
+        """
+        h = hashlib.sha256()
+        h.update(self.version().encode('utf-8'))
+
+        # Relative paths in the config depend on where it is
+        h.update(os.path.abspath(config_file).encode('utf-8'))
+
+        if text is not None:
+            h.update(b'text:' + text.encode('utf-8'))
+        else:
+            h.update(self.read(config_file))
+
+        for p in mcfg.paths + mcfg.changelogs:
+            h.update(p.encode('utf-8'))
+            h.update(self.read(p))
+
+        # Checkers from any module
+        load_entry_point_checkers()
+        modules = ['inicheck.checkers', 'inicheck.config',
+                   'inicheck.tools'] + mcfg.checker_modules
+
+        for name, cls in registered_checkers.items():
+            h.update("{}={}.{}".format(name, cls.__module__,
+                                       cls.__qualname__).encode('utf-8'))
+            modules.append(cls.__module__)
+
+        for m in sorted(set(modules)):
+            h.update(m.encode('utf-8'))
+            f = getattr(importlib.import_module(m), '__file__', None)
+
+            if f is not None:
+                h.update(self.read(f))
+
+        return h.hexdigest()
+
+    @staticmethod
+    def read(path):
+        """
+        Returns the contents of a file, empty for files that can not be read
+        """
+        try:
+            with open(path, 'rb') as fp:
+                return fp.read()
+
+        except OSError:
+            return b''
+
+    def get(self, key, mcfg=None):
+        """
+        Looks up the result of a validation, checking the file system and
+        network dependent items again.
+
+        Args:
+            key: key from :meth:`~inicheck.tools.ResultCache.key`
+            mcfg: MasterConfig to use in the returned config instead of the
+                  copy saved with the result
+
+        Returns:
+            UserConfig: the casted config with its issues from
+                        :func:`~inicheck.tools.check_and_cast`, None if there
+                        is no result to use
+        """
+        data = self.load(key)
+
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        ucfg, io_keys, io_issues = pickle.loads(data)
+
+        if mcfg is not None:
+            ucfg.mcfg = mcfg
+
+        if _recheck_items(ucfg, io_keys) != io_issues:
+            with self._lock:
+                self.stale += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        return ucfg
+
+    def put(self, key, ucfg):
+        """
+        Saves the result of a validation along with the current results of
+        its file system and network dependent items
+
+        Args:
+            key: key from :meth:`~inicheck.tools.ResultCache.key`
+            ucfg: UserConfig after :func:`~inicheck.tools.check_and_cast`
+        """
+        all_checks = get_merged_checkers(ucfg)
+        io_keys = _recheck_keys(ucfg, all_checks=all_checks)
+        io_issues = _recheck_items(ucfg, io_keys, all_checks=all_checks)
+
+        self.save(key, pickle.dumps((ucfg, io_keys, io_issues),
+                                    pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def trusted(st):
+        """
+        Whether a file or directory can be trusted with results, it has to
+        be owned by the current user and not writable by anyone else
+
+        Args:
+            st: os.stat_result of the file or directory
+        """
+        # Ownership can not be checked this way on Windows
+        if not hasattr(os, 'getuid'):
+            return True
+
+        return st.st_uid == os.getuid() and \
+            not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def trusted_path(self):
+        """
+        Whether the directory of the results can be trusted
+        """
+        try:
+            return self.trusted(os.stat(self.path))
+
+        except OSError:
+            return False
+
+    def load(self, key):
+        """
+        Returns the pickled result for key, None if there is none or it can
+        not be trusted
+        """
+        if self.path is None:
+            with self._lock:
+                return self._results.get(key)
+
+        if not self.trusted_path():
+            return None
+
+        flags = os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0) | \
+            getattr(os, 'O_BINARY', 0)
+
+        try:
+            fd = os.open(os.path.join(self.path, key + '.pickle'), flags)
+
+        except OSError:
+            return None
+
+        with os.fdopen(fd, 'rb') as fp:
+            st = os.fstat(fp.fileno())
+
+            if not stat.S_ISREG(st.st_mode) or not self.trusted(st):
+                return None
+
+            return fp.read()
+
+    def save(self, key, data):
+        """
+        Saves the pickled result for key, nothing is saved to a directory
+        that can not be trusted
+        """
+        if self.path is None:
+            with self._lock:
+                self._results[key] = data
+            return
+
+        if not self.trusted_path():
+            return
+
+        f = os.path.join(self.path, key + '.pickle')
+        tmp = "{}.{}.{}.tmp".format(f, os.getpid(), threading.get_ident())
+
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL |
+                     getattr(os, 'O_BINARY', 0), 0o600)
+
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(data)
+
+        os.replace(tmp, f)
+
+    def clear(self):
+        """
+        Forgets all the results
+        """
+        with self._lock:
+            self._results.clear()
+
+        if self.path is not None:
+            for f in os.listdir(self.path):
+                if f.endswith('.pickle'):
+                    os.remove(os.path.join(self.path, f))
+
+
+# Results reused by get_user_config when the environment variable
+# INICHECK_RESULT_CACHE names a directory for them
+default_result_cache = None
+
+if os.environ.get('INICHECK_RESULT_CACHE'):
+    default_result_cache = ResultCache(
+        path=os.environ['INICHECK_RESULT_CACHE'])
+
+
 def config_documentation(out_f, paths=None, modules=None,
                          section_link_dict={}):
     """
@@ -1,13 +1,53 @@
 import os
-from datetime import date, datetime
+import re
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from functools import lru_cache
 
 import dateparser
 
+from .timings import count
+
+# Settings for parsing strings in UTC and returning timezone unaware dates
+DATEPARSER_SETTINGS = {
+    'STRICT_PARSING': True,
+    'TIMEZONE': 'UTC',
+    'RETURN_AS_TIMEZONE_AWARE': False
+}
+
+# Common date formats tried before dateparser. These are formats dateparser
+# reads the same way, anything else is left to dateparser.
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M",
+    "%m-%d-%Y",
+    "%m-%d-%Y %H:%M",
+    "%m-%d-%Y %H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+]
+
+# ISO dates that datetime.fromisoformat reads directly, it was added in
+# python 3.7 so older versions use DATE_FORMATS instead
+HAS_FROMISOFORMAT = hasattr(datetime, 'fromisoformat')
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}"
+                      r"([ T]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?"
+                      r"([+-]\d{2}:\d{2}|Z)?)?$")
+
 
 def parse_date(value):
     """
     Function used to cast value to datetime from String or date objects.
-    Uses the `dateparser` library for String objects.
+    Strings in a common format are read with the standard library, the rest
+    use the `dateparser` library. Parsed strings are remembered so repeated
+    values are only parsed once.
 
     All strings will be parsed in UTC timezone, but returned value will be
     timezone unaware. Hardcoded timezone setting to UTC for dateparser enables
@@ -25,18 +65,53 @@ def parse_date(value):
     elif isinstance(value, date):
         return datetime(value.year, value.month, value.day)
 
+    elif isinstance(value, str):
+        converted = parse_date_string(value)
+
     else:
-        converted = dateparser.parse(
-            value, settings={
-                'STRICT_PARSING': True,
-                'TIMEZONE': 'UTC',
-                'RETURN_AS_TIMEZONE_AWARE': False
-            }
-        )
-        if converted is None:
-            raise TypeError("{} is not a date".format(value))
+        count('dateparser calls')
+        converted = dateparser.parse(value, settings=DATEPARSER_SETTINGS)
+
+    if converted is None:
+        raise TypeError("{} is not a date".format(value))
+
+    return converted
+
+
+@lru_cache(maxsize=4096)
+def parse_date_string(value):
+    """
+    Parses a string to a datetime, trying the ISO format and DATE_FORMATS
+    before falling back to dateparser. Results are memoized.
+
+    Args:
+        value: string to be parsed
+    Returns:
+        converted: Datetime object or None if it is not a date
+    """
+
+    if HAS_FROMISOFORMAT and ISO_DATE.match(value):
+        try:
+            converted = datetime.fromisoformat(value)
+
+            # Same as dateparser, move to UTC and drop the timezone
+            if converted.tzinfo is not None:
+                converted = converted.astimezone(timezone.utc)
+                converted = converted.replace(tzinfo=None)
+
+            return converted
+
+        except ValueError:
+            pass
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
 
-        return converted
+    count('dateparser calls')
+    return dateparser.parse(value, settings=DATEPARSER_SETTINGS)
 
 
 def find_options_in_recipes(recipes, choice_search,
@@ -243,6 +318,56 @@ def is_kw_matched(single_word, kw_list, kw_count=1):
         return False
 
 
+@lru_cache(maxsize=256)
+def get_ordered_pairs(items, init_kw=('start', 'begin'),
+                      final_kw=('stop', 'end')):
+    """
+    Pairs up items that are the beginning and end of an ordered pair, e.g.
+    start_date with end_date or begin_sim with stop_sim. Items are paired
+    when their names match once the keyword is removed. An item without a
+    match by name is paired with the first item having the opposite keyword.
+    Results are memoized so a section is only resolved once.
+
+    Args:
+        items: Tuple of item names in a section
+        init_kw: Tuple of keywords marking the beginning of a pair
+        final_kw: Tuple of keywords marking the end of a pair
+
+    Returns:
+        dict: item name to a tuple of the corresponding item name, None when
+              there isn't one, and a boolean whether the item is the
+              beginning. Items with both or neither keywords are left out.
+    """
+    starts = OrderedDict()
+    ends = OrderedDict()
+
+    for item in items:
+        init = [kw for kw in init_kw if kw in item]
+        final = [kw for kw in final_kw if kw in item]
+
+        # The stem is the name without its keyword
+        if init and not final:
+            starts[item] = item.replace(init[0], '', 1)
+
+        elif final and not init:
+            ends[item] = item.replace(final[0], '', 1)
+
+    pairs = {}
+
+    for group, opposite, is_start in [(starts, ends, True),
+                                      (ends, starts, False)]:
+        by_stem = {}
+        for item, stem in opposite.items():
+            by_stem.setdefault(stem, item)
+
+        first = next(iter(opposite), None)
+
+        for item, stem in group.items():
+            pairs[item] = (by_stem.get(stem, first), is_start)
+
+    return pairs
+
+
 def get_kw_match(potential_matches, kw_list, kw_count=1):
     """
     Loops through a list of potential matches looking for keywords in the
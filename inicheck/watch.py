@@ -0,0 +1,224 @@
+import os
+import time
+from collections import OrderedDict
+
+from .changes import ChangeLog
+from .config import MasterConfig
+from .iniparse import read_config
+from .tools import check_config, get_user_config
+
+
+class ConfigWatcher(object):
+    """
+    Keeps a user config validated while it is being edited. The config,
+    master config and change log files are polled for changes. Edits that
+    only change or add items in the config are re-validated with
+    :meth:`~inicheck.config.UserConfig.update`, which only re-applies the
+    affected recipes and re-checks the affected items. Anything else, i.e.
+    removed items, unknown sections or a changed master config, validates
+    the config again from scratch.
+
+    Attributes:
+        config_file: path to the user config being watched
+        mcfg: MasterConfig the config is validated against
+        ucfg: UserConfig of the last validation, None if it failed
+        warnings: list of warnings of the config as it is now
+        errors: list of errors of the config as it is now
+        failure: None or the message of why the config could not be read
+        full_runs: Number of times the config was validated from scratch
+        incremental_runs: Number of times only the changes were validated
+        elapsed: Seconds the last validation took
+    """
+
+    def __init__(self, config_file, master_files=None, modules=None,
+                 changelog_file=None):
+        """
+        Args:
+            config_file: path to the user config to watch
+            master_files: path or list of paths to master config files
+            modules: a module or list of modules providing master configs
+            changelog_file: Path to a changelog for the master config
+        """
+        if modules is None and master_files is None:
+            raise IOError("ERROR: Please provide either a module or a path to"
+                          " a master config")
+
+        self.config_file = os.path.abspath(config_file)
+        self.master_files = master_files
+        self.modules = modules
+        self.changelog_file = changelog_file
+
+        self.ucfg = None
+        self.warnings = []
+        self.errors = []
+        self.failure = None
+        self.full_runs = 0
+        self.incremental_runs = 0
+        self.elapsed = 0.0
+
+        self.load_master()
+
+        # Taken before validating so edits saved meanwhile are picked up
+        self._stats = self.file_stats()
+        self.validate()
+
+    def load_master(self):
+        """
+        Reads in the master config and its change log
+        """
+        self.mcfg = MasterConfig(path=self.master_files, modules=self.modules,
+                                 changelogs=self.changelog_file)
+        self.changelog = ChangeLog(paths=self.mcfg.changelogs, mcfg=self.mcfg)
+
+    def file_stats(self):
+        """
+        Modification times and sizes of the watched files, the user config
+        first followed by the master config files and change logs
+
+        Returns:
+            tuple: tuples of the path, modification time and size, None for
+                   files that do not exist
+        """
+        stats = []
+
+        for p in [self.config_file] + self.mcfg.paths + self.mcfg.changelogs:
+            try:
+                st = os.stat(p)
+                stats.append((p, st.st_mtime_ns, st.st_size))
+
+            except OSError:
+                stats.append((p, None, None))
+
+        return tuple(stats)
+
+    def validate(self):
+        """
+        Validates the config from scratch
+        """
+        start = time.perf_counter()
+
+        try:
+            self.ucfg = get_user_config(self.config_file, mcfg=self.mcfg,
+                                        changelog=self.changelog)
+            self.warnings, self.errors = check_config(self.ucfg)
+            self.failure = None
+
+        except Exception as e:
+            self.ucfg = None
+            self.warnings = []
+            self.errors = []
+            self.failure = "{}: {}".format(type(e).__name__, e)
+
+        self.full_runs += 1
+        self.elapsed = time.perf_counter() - start
+
+    def get_changes(self, raw_cfg):
+        """
+        Finds the items that changed between the config last validated and
+        a config read from disk
+
+        Args:
+            raw_cfg: config dictionary read from disk
+
+        Returns:
+            OrderedDict: (section, item) tuples and their new values for the
+                         items that were changed or added, None if the
+                         changes can not be validated incrementally
+        """
+        old_cfg = self.ucfg.raw_cfg
+        mcfg = self.mcfg.cfg
+
+        # Removing items or sections requires starting over
+        for s, items in old_cfg.items():
+            if s not in raw_cfg.keys() or \
+                    any(i not in raw_cfg[s].keys() for i in items.keys()):
+                return None
+
+        changes = OrderedDict()
+
+        for s, items in raw_cfg.items():
+            for i, v in items.items():
+                if s not in old_cfg.keys() or i not in old_cfg[s].keys() or \
+                        old_cfg[s][i] != v:
+
+                    # Unknown sections and items may be deprecated ones
+                    if s not in mcfg.keys() or i not in mcfg[s].keys():
+                        return None
+
+                    changes[(s, i)] = v
+
+        return changes
+
+    def update(self):
+        """
+        Validates only the changes made to the config on disk, falling back
+        to validating from scratch when that is not possible
+        """
+        if self.ucfg is None:
+            return self.validate()
+
+        start = time.perf_counter()
+
+        try:
+            changes = self.get_changes(read_config(self.config_file))
+
+        except Exception:
+            changes = None
+
+        if changes is None:
+            return self.validate()
+
+        try:
+            new_w, new_e, resolved_w, resolved_e = self.ucfg.update(changes)
+
+        except Exception:
+            return self.validate()
+
+        self.warnings = [w for w in self.warnings if w not in resolved_w]
+        self.warnings += new_w
+        self.errors = [e for e in self.errors if e not in resolved_e]
+        self.errors += new_e
+
+        self.incremental_runs += 1
+        self.elapsed = time.perf_counter() - start
+
+    def poll(self):
+        """
+        Re-validates the config if any of the watched files changed
+
+        Returns:
+            tuple: None if nothing changed, otherwise
+            - **new_warnings** - list of warnings introduced by the changes
+            - **new_errors** - list of errors introduced by the changes
+            - **resolved_warnings** - list of warnings fixed by the changes
+            - **resolved_errors** - list of errors fixed by the changes
+        """
+        stats = self.file_stats()
+
+        if stats == self._stats:
+            return None
+
+        old_warnings = self.warnings
+        old_errors = self.errors
+
+        if stats[1:] != self._stats[1:]:
+            try:
+                self.load_master()
+
+            except Exception as e:
+                self.failure = "{}: {}".format(type(e).__name__, e)
+                self._stats = stats
+                return [], [], [], []
+
+            self.validate()
+
+        else:
+            self.update()
+
+        # Edits saved while validating are seen by the next poll
+        self._stats = stats
+
+        return ([w for w in self.warnings if w not in old_warnings],
+                [e for e in self.errors if e not in old_errors],
+                [w for w in old_warnings if w not in self.warnings],
+                [e for e in old_errors if e not in self.errors])
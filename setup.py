@@ -31,6 +31,7 @@ setup(
     entry_points={
         'console_scripts': [
             'inicheck=inicheck.cli:main',
+            'inicheck-client=inicheck.daemon:client_main',
             'inidiff=inicheck.cli:inidiff',
             'inimake=inicheck.cli:inimake',
             'inichangefind=inicheck.cli:detect_file_changes'
@@ -38,6 +39,9 @@ setup(
     },
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        'numpy': ['numpy'],
+    },
     license="CC0 1.0 Universal (CC0 1.0) Public Domain Dedication",
     zip_safe=False,
     keywords='inicheck',
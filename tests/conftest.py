@@ -1,3 +1,5 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from os.path import join, dirname, abspath
 from pathlib import Path
 from inicheck.tools import get_user_config, get_checkers
@@ -69,3 +71,121 @@ def checkers_dict():
     Get a dictionary of checkers to use.
     """
     return get_checkers()
+
+
+# Small master config written to disk by tests that need their own files
+MASTER = """
+[settings]
+
+num_users:
+default = 1,
+type = int,
+description = number of users
+
+log:
+default = log.txt,
+type = filename,
+description = log file
+"""
+
+
+def write_configs(directory, config, master=MASTER, files=None):
+    """
+    Writes a master config and a users config to a directory, along with
+    any other files the config refers to
+
+    Args:
+        directory: pathlib.Path of the directory to write to
+        config: Text of the users config, written to config.ini
+        master: Text of the master config, written to master.ini
+        files: Dictionary of other file names to their text or bytes
+
+    Returns:
+        tuple: paths of the users config and the master config
+    """
+    for name, content in (files or {}).items():
+        if isinstance(content, bytes):
+            directory.joinpath(name).write_bytes(content)
+        else:
+            directory.joinpath(name).write_text(content)
+
+    directory.joinpath('master.ini').write_text(master)
+    directory.joinpath('config.ini').write_text(config)
+
+    return (str(directory.joinpath('config.ini')),
+            str(directory.joinpath('master.ini')))
+
+
+@pytest.fixture
+def config_files(tmp_path):
+    """
+    Writes a master config and a users config to tmp_path, see
+    write_configs
+    """
+    def write(config, master=MASTER, files=None):
+        return write_configs(tmp_path, config, master=master, files=files)
+
+    return write
+
+
+@pytest.fixture
+def make_ucfg(config_files):
+    """
+    Writes a master config and a users config to tmp_path and returns the
+    users config from get_user_config, keywords are passed on to it
+    """
+    def make(config, master=MASTER, files=None, **kwargs):
+        cfg, mcfg = config_files(config, master=master, files=files)
+        return get_user_config(cfg, master_files=mcfg, **kwargs)
+
+    return make
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers like a web server. /ok answers everything, /no_head only answers
+    GET requests and anything else does not exist. Requests are recorded on
+    the server.
+    """
+
+    def respond(self):
+        self.server.requests.append((self.command, self.path))
+
+        if self.path == '/ok':
+            status = 200
+        elif self.path == '/no_head':
+            status = 405 if self.command == 'HEAD' else 200
+        else:
+            status = 404
+
+        body = b'stand in'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        if self.command == 'GET':
+            self.wfile.write(body)
+
+    do_GET = respond
+    do_HEAD = respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='session')
+def url_server():
+    """
+    Local stand in HTTP server for checking URLs without a network
+    """
+    server = HTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.requests = []
+    server.url = 'http://127.0.0.1:{}'.format(server.server_port)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
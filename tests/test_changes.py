@@ -8,6 +8,7 @@ Tests for `inicheck.changes` module.
 """
 
 from inicheck.changes import ChangeLog
+from inicheck.config import UserConfig
 
 
 class TestChanges:
@@ -21,3 +22,18 @@ class TestChanges:
             assert True
         except Exception:
             assert False
+
+    def test_direct_edits_found(self, full_config_ini, full_mcfg,
+                                changelog_ini):
+        """
+        Items added straight to the users cfg are matched by the change log
+        """
+        ucfg = UserConfig(full_config_ini, mcfg=full_mcfg)
+        changelog = ChangeLog(paths=changelog_ini, mcfg=full_mcfg)
+        assert changelog.get_active_changes(ucfg) == ([], [])
+
+        ucfg.cfg['precip']['slope'] = '1'
+        potential, required = changelog.get_active_changes(ucfg)
+
+        assert required == [[['precip', 'slope', 'any', 'any'],
+                             ['precip', 'detrend_slope', 'any', 'any']]]
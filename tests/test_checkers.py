@@ -3,7 +3,7 @@ import pytest
 from inicheck import checkers
 from inicheck.config import UserConfig
 from .conftest import TEST_ROOT
-from os.path import join
+from os.path import isfile, join
 
 
 class CheckerTestBase:
@@ -112,6 +112,123 @@ class TestCheckInt(CheckerTestBase):
         assert self.check_value(checker) == valid
 
 
+    @pytest.mark.parametrize('section, item, value, extra_config, expected', [
+        ('basic', 'num_users', ['10'], None, ([None], 10)),
+        ('basic', 'num_users', ['1.5'], None, (['Expecting int received str'], '1.5')),
+    ])
+    def test_check_and_cast(self, checker, section, item, value, extra_config, expected):
+        assert checker.check_and_cast() == expected
+
+
+class TestArrayChecks:
+    """
+    Long numeric lists are checked with NumPy and give the same results as
+    checking them one at a time
+    """
+
+    @pytest.fixture
+    def user_config(self, config_files):
+        pytest.importorskip('numpy')
+
+        cfg, master = config_files(
+            "[stations]\nelevations: 1\ncounts: 1\n",
+            master="[stations]\n"
+                   "elevations:\ntype = float list,\nmin = 0,\nmax = 4000,\n"
+                   "description = elevations\n"
+                   "counts:\ntype = int list,\nmin = 1,\n"
+                   "description = counts\n")
+
+        from inicheck.config import MasterConfig
+        return UserConfig(cfg, mcfg=MasterConfig(path=master))
+
+    @pytest.mark.parametrize('cls, item, values', [
+        (checkers.CheckFloat, 'elevations', [str(v) for v in range(0, 4000, 50)]),
+        (checkers.CheckFloat, 'elevations', ['10.5'] * 40 + ['-1', '5000', 'nan', '2e3']),
+        (checkers.CheckInt, 'counts', [str(v) for v in range(1, 100)]),
+        (checkers.CheckInt, 'counts', ['4'] * 40 + ['1.5', '0', '2.0', 'inf', '7']),
+        (checkers.CheckInt, 'counts', ['4'] * 40 + ['None', 'tough']),
+    ])
+    def test_matches_per_value(self, user_config, cls, item, values):
+        user_config.cfg['stations'][item] = values
+
+        b = cls(config=user_config, section='stations', item=item)
+        assert b.to_array() is not None or 'tough' in values
+
+        expected = cls(config=user_config, section='stations', item=item)
+        expected.array_dtype = None
+
+        assert b.check() == expected.check()
+        # Compare the reprs since nan != nan
+        assert repr(b.cast(strict=False)) == repr(expected.cast(strict=False))
+
+    def test_only_failures_formatted(self, user_config):
+        user_config.cfg['stations']['counts'] = ['3'] * 50 + ['0']
+        b = checkers.CheckInt(config=user_config, section='stations',
+                              item='counts')
+        b.check_value = lambda v: (False, 'checked {}'.format(v))
+
+        msgs = b.check()
+        assert msgs[:50] == [None] * 50
+        assert msgs[50] == 'checked 0'
+
+
+class TestCheckMany:
+    """
+    Batches of entries give the same results as checking them one at a time
+    """
+
+    @pytest.fixture
+    def configs(self, base_config_ini, basic_mcfg):
+        first = UserConfig(base_config_ini, mcfg=basic_mcfg)
+        first.cfg.update({'basic': {'num_users': '2', 'time_out': 'abc',
+                                    'debug': 'yes', 'start_date': '2019-10-01',
+                                    'log': 'not_a_file.txt'}})
+
+        second = UserConfig(base_config_ini, mcfg=basic_mcfg)
+        second.cfg.update({'basic': {'num_users': '1.5', 'time_out': '2',
+                                     'debug': 'maybe', 'start_date': 'never',
+                                     'log': 'also_not_a_file.txt'}})
+
+        return [first, second]
+
+    @pytest.mark.parametrize('cls, item', [
+        (checkers.CheckInt, 'num_users'),
+        (checkers.CheckFloat, 'time_out'),
+        (checkers.CheckBool, 'debug'),
+        (checkers.CheckDatetime, 'start_date'),
+        (checkers.CheckFilename, 'log'),
+    ])
+    def test_matches_per_item(self, configs, cls, item):
+        entries = [(c, 'basic', item) for c in configs]
+        checks = [cls(config=c, section='basic', item=item) for c in configs]
+
+        assert cls.check_many(entries) == [b.check() for b in checks]
+        assert cls.cast_many(entries, strict=False) == \
+            [b.cast(strict=False) for b in checks]
+        assert cls.check_and_cast_many(entries) == \
+            [b.check_and_cast() for b in checks]
+
+    def test_batched_checker_reused(self, configs):
+        """
+        Batched checkers are made once for all entries
+        """
+        made = []
+
+        class CheckCounted(checkers.CheckInt):
+            def __init__(self, **kwargs):
+                made.append(kwargs['item'])
+                super(CheckCounted, self).__init__(**kwargs)
+
+        entries = [(c, 'basic', 'num_users') for c in configs]
+        assert CheckCounted.check_many(entries) == \
+            [[None], ['Expecting counted received str']]
+        assert made == ['num_users']
+
+        CheckCounted.batched = False
+        CheckCounted.check_many(entries)
+        assert len(made) == 3
+
+
 class TestCheckDatetime(CheckerTestBase):
     checker_cls = checkers.CheckDatetime
 
@@ -175,16 +292,383 @@ class TestCheckFilename(CheckerTestBase):
         assert value is default
 
 
+class TestPathCache:
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        for name in ['a.nc', 'b.nc', 'c.nc']:
+            tmp_path.joinpath(name).write_text('test')
+        tmp_path.joinpath('subdir').mkdir()
+        return tmp_path
+
+    def test_lookups(self, files):
+        cache = checkers.PathCache()
+
+        assert cache.isfile(str(files.joinpath('a.nc')))
+        assert cache.isfile(str(files.joinpath('b.nc')))
+        assert cache.isdir(str(files.joinpath('subdir')))
+        assert not cache.isfile(str(files.joinpath('subdir')))
+        assert not cache.isfile(str(files.joinpath('missing.nc')))
+        assert not cache.isdir(str(files.joinpath('missing', 'dir')))
+
+    def test_directory_listed_once(self, files, monkeypatch):
+        """
+        After scan_threshold lookups in a directory, the rest come from a
+        single listing of it
+        """
+        monkeypatch.setattr(checkers.PathCache, 'scan_threshold', 2)
+        cache = checkers.PathCache()
+
+        for name in ['a.nc', 'b.nc', 'c.nc', 'subdir']:
+            cache.kind(str(files.joinpath(name)))
+        cache.isfile(str(files.joinpath('a.nc')))
+
+        assert cache.stat_calls == 1
+        assert cache.scan_calls == 1
+
+    def test_few_lookups_not_listed(self, files):
+        """
+        Two paths in a directory are cheaper to stat than listing it
+        """
+        cache = checkers.PathCache()
+
+        assert cache.isfile(str(files.joinpath('a.nc')))
+        assert cache.isfile(str(files.joinpath('b.nc')))
+
+        assert cache.stat_calls == 2
+        assert cache.scan_calls == 0
+
+    def test_missing_names_looked_up(self, files, monkeypatch):
+        """
+        Names not in the listing are still looked up, they can exist under
+        another case on case insensitive file systems
+        """
+        monkeypatch.setattr(checkers.PathCache, 'scan_threshold', 1)
+        cache = checkers.PathCache()
+
+        assert cache.isfile(str(files.joinpath('a.nc')))
+        assert not cache.isfile(str(files.joinpath('missing.nc')))
+        assert cache.isfile(str(files.joinpath('A.nc'))) == \
+            isfile(str(files.joinpath('A.nc')))
+
+        assert cache.scan_calls == 1
+        assert cache.stat_calls == 2
+
+        # Nothing in a missing directory is looked up
+        assert not cache.isfile(str(files.joinpath('missing', 'a.nc')))
+        assert not cache.isfile(str(files.joinpath('missing', 'b.nc')))
+        assert cache.stat_calls == 2
+
+    def test_large_directory_not_listed(self, files, monkeypatch):
+        monkeypatch.setattr(checkers.PathCache, 'scan_threshold', 1)
+        monkeypatch.setattr(checkers.PathCache, 'scan_limit', 2)
+        cache = checkers.PathCache()
+
+        for name in ['a.nc', 'b.nc', 'c.nc']:
+            assert cache.isfile(str(files.joinpath(name)))
+
+        assert cache.scan_calls == 1
+        assert cache.stat_calls == 3
+
+    def test_shared_between_checkers(self, files, base_config_ini, basic_mcfg):
+        ucfg = UserConfig(base_config_ini, mcfg=basic_mcfg)
+        ucfg.cfg.update({'basic': {'log': str(files.joinpath('a.nc')),
+                                   'credentials': str(files.joinpath('b.nc'))}})
+        cache = checkers.PathCache()
+
+        for item, cls in [('log', checkers.CheckFilename),
+                          ('credentials', checkers.CheckCriticalFilename)]:
+            b = cls(config=ucfg, section='basic', item=item, path_cache=cache)
+            assert b.check() == [None]
+
+        assert cache.stat_calls + cache.scan_calls == 2
+
+
+class TestCheckChecksummedFilename:
+
+    master = ("[topo]\ndem:\ntype = checksummedfilename,\n"
+              "description = digital elevation model\n")
+
+    @pytest.fixture
+    def user_config(self, make_ucfg):
+        return make_ucfg("[topo]\ndem: dem.nc\n", master=self.master,
+                         files={'dem.nc': b'elevation' * 1000})
+
+    @pytest.fixture
+    def digest(self):
+        import hashlib
+        return hashlib.sha256(b'elevation' * 1000).hexdigest()
+
+    def check(self, user_config, value):
+        user_config.cfg['topo']['dem'] = value
+        b = checkers.CheckChecksummedFilename(
+            config=user_config, section='topo', item='dem',
+            digest_cache=checkers.DigestCache())
+        return b.check()[0]
+
+    def test_inline_digest(self, user_config, digest):
+        assert self.check(user_config, 'dem.nc sha256:' + digest) is None
+        assert self.check(user_config, 'dem.nc sha256:' + '0' * 64) == \
+            'File does not match its sha256 checksum.'
+
+    def test_sidecar(self, user_config, digest, tmp_path):
+        assert self.check(user_config, 'dem.nc') == 'No checksum found for file.'
+
+        tmp_path.joinpath('dem.nc.sha256').write_text(digest + '  dem.nc\n')
+        assert self.check(user_config, 'dem.nc') is None
+
+    def test_missing(self, user_config, digest):
+        assert self.check(user_config, 'missing.nc') == 'File does not exist.'
+        assert self.check(user_config, 'missing.nc md5:' + digest) == \
+            'File does not exist.'
+
+    def test_cast(self, user_config, digest, tmp_path):
+        user_config.cfg['topo']['dem'] = 'dem.nc sha256:' + digest
+        b = checkers.CheckChecksummedFilename(config=user_config,
+                                              section='topo', item='dem')
+        assert b.cast() == str(tmp_path.joinpath('dem.nc'))
+
+    @pytest.mark.parametrize('lazy', [False, True])
+    def test_check_after_cast(self, tmp_path, make_ucfg, digest, lazy):
+        """
+        Casting drops the inline digest, checking the casted config still
+        compares the file against it
+        """
+        from inicheck.tools import check_config
+
+        ucfg = make_ucfg("[topo]\ndem: dem.nc sha256:{}\n".format(digest),
+                         master=self.master,
+                         files={'dem.nc': b'elevation' * 1000}, lazy=lazy)
+        data = tmp_path.joinpath('dem.nc')
+
+        assert ucfg.cfg['topo']['dem'] == str(data)
+        ucfg.issues = None
+        assert check_config(ucfg) == ([], [])
+
+        b = checkers.CheckChecksummedFilename(
+            config=ucfg, section='topo', item='dem',
+            digest_cache=checkers.DigestCache())
+        assert b.check() == [None]
+
+        data.write_bytes(b'tampered')
+        errors = check_config(ucfg)[1]
+        assert len(errors) == 1
+        assert 'does not match its sha256 checksum' in errors[0]
+
+    def test_type_name(self, user_config, tmp_path):
+        """
+        The type is found as checksummedfilename even though removing check
+        from the class name would leave summedfilename
+        """
+        from inicheck.tools import get_merged_checkers
+
+        all_checks = get_merged_checkers(user_config)
+        assert all_checks['checksummedfilename'] is \
+            checkers.CheckChecksummedFilename
+        assert user_config.cfg['topo']['dem'] == str(tmp_path.joinpath('dem.nc'))
+
+
+class TestFormattedFilename:
+
+    @pytest.fixture
+    def user_config(self, config_files):
+        files = {
+            'classic.nc': b'CDF\x01' + b'\x00' * 100,
+            'nc4.nc': b'\x89HDF\r\n\x1a\n' + b'\x00' * 100,
+            'userblock.h5': b'\x00' * 512 + b'\x89HDF\r\n\x1a\n',
+            'dem.tif': b'II*\x00' + b'\x00' * 100,
+            'big.tif': b'MM\x00+' + b'\x00' * 100,
+            'stations.csv': 'id,elevation\n1,1200\n'.encode('utf-8'),
+            'error.html': b'\n  <!DOCTYPE html><html>Not Found</html>',
+            'empty.nc': b'',
+        }
+        cfg, master = config_files("[basic]\nlog: log.txt\n",
+                                   master="[basic]\nlog:\ntype = filename,\n"
+                                          "description = a file\n",
+                                   files=files)
+
+        from inicheck.config import MasterConfig
+        return UserConfig(cfg, mcfg=MasterConfig(path=master))
+
+    @pytest.mark.parametrize('cls, filename, msg', [
+        (checkers.CheckNetcdfFilename, 'classic.nc', None),
+        (checkers.CheckNetcdfFilename, 'nc4.nc', None),
+        (checkers.CheckNetcdfFilename, 'dem.tif', 'File is not netCDF.'),
+        (checkers.CheckNetcdfFilename, 'empty.nc', 'File is not netCDF.'),
+        (checkers.CheckNetcdfFilename, 'error.html',
+         'File is a web page or markup, not netCDF.'),
+        (checkers.CheckNetcdfFilename, 'missing.nc', 'File does not exist.'),
+        (checkers.CheckHdf5Filename, 'userblock.h5', None),
+        (checkers.CheckHdf5Filename, 'classic.nc', 'File is not HDF5.'),
+        (checkers.CheckGeotiffFilename, 'dem.tif', None),
+        (checkers.CheckGeotiffFilename, 'big.tif', None),
+        (checkers.CheckGeotiffFilename, 'stations.csv', 'File is not GeoTIFF.'),
+        (checkers.CheckCsvFilename, 'stations.csv', None),
+        (checkers.CheckCsvFilename, 'classic.nc', 'File is not CSV.'),
+        (checkers.CheckCsvFilename, 'error.html',
+         'File is a web page or markup, not CSV.'),
+    ])
+    def test_check(self, user_config, cls, filename, msg):
+        user_config.cfg['basic']['log'] = filename
+        b = cls(config=user_config, section='basic', item='log')
+        assert b.check() == [msg]
+
+    def test_csv_header_cut_in_character(self):
+        header = 'station,name\n1,Mammoth Mountain é'.encode('utf-8')[:-1]
+        assert checkers.is_csv_header(header)
+
+
+class TestDigestCache:
+
+    def test_unchanged_files_not_read(self, tmp_path):
+        f = tmp_path.joinpath('forcing.nc')
+        f.write_bytes(b'a' * 100)
+        path = str(f)
+        cache = checkers.DigestCache()
+
+        first = cache.digest(path)
+        assert cache.digest(path) == first
+        assert cache.read_calls == 1
+        assert cache.stat_calls == 2
+
+        # Different algorithms are kept apart
+        assert cache.digest(path, 'md5') != first
+
+        f.write_bytes(b'b' * 200)
+        assert cache.digest(path) != first
+        assert cache.read_calls == 3
+
+        assert cache.digest(str(tmp_path.joinpath('missing.nc'))) is None
+
+    def test_persistence(self, tmp_path):
+        f = tmp_path.joinpath('forcing.nc')
+        f.write_bytes(b'a' * 100)
+        path = str(tmp_path.joinpath('digests.json'))
+
+        first_cache = checkers.DigestCache(path=path)
+        first = first_cache.digest(str(f))
+        first_cache.flush()
+
+        cache = checkers.DigestCache(path=path)
+        assert cache.digest(str(f)) == first
+        assert cache.read_calls == 0
+
+    def test_saved_once(self, tmp_path, monkeypatch):
+        """
+        Hashing many files saves the digests once instead of after each file
+        """
+        path = tmp_path.joinpath('digests.json')
+        cache = checkers.DigestCache(path=str(path))
+        saves = []
+        monkeypatch.setattr(cache, 'save', lambda: saves.append(1))
+
+        for n in range(5):
+            f = tmp_path.joinpath('forcing_{}.nc'.format(n))
+            f.write_bytes(b'a' * n)
+            cache.digest(str(f))
+
+        assert saves == []
+
+        cache.flush()
+        assert saves == [1]
+
+
 class TestCheckURL(CheckerTestBase):
     checker_cls = checkers.CheckURL
 
-    @pytest.mark.parametrize('section, item, value, extra_config, valid', [
-        ('basic', 'favorite_web_site', 'https://google.com', None, True),
-        ('basic', 'favorite_web_site', 'https://micah_subnaught_is_awesome.com"', None, False),
+    @pytest.fixture
+    def value(self, url_server, path):
+        return url_server.url + path
+
+    @pytest.mark.parametrize('section, item, path, extra_config, valid', [
+        ('basic', 'favorite_web_site', '/ok', None, True),
+        ('basic', 'favorite_web_site', '/no_head', None, True),
+        ('basic', 'favorite_web_site', '/missing', None, False),
     ])
-    def test_check(self, checker, section, item, value, extra_config, valid):
+    def test_check(self, checker, section, item, path, extra_config, valid):
         assert self.check_value(checker) == valid
 
+    @pytest.mark.parametrize('url, msg', [
+        ('/missing', 'Webpage does not exist'),
+        ('http://127.0.0.1:1/', 'Invalid connection or URL'),
+        ('not a url', 'Invalid connection or URL'),
+    ])
+    def test_messages(self, url_server, url, msg):
+        if url.startswith('/'):
+            url = url_server.url + url
+
+        assert checkers.URLCache().check(url) == (False, msg)
+
+
+class TestURLCache:
+
+    def test_head_then_get(self, url_server):
+        """
+        Only headers are requested unless the server refuses a HEAD
+        """
+        cache = checkers.URLCache()
+        del url_server.requests[:]
+
+        assert cache.check(url_server.url + '/ok') == (True, None)
+        assert cache.check(url_server.url + '/no_head') == (True, None)
+        assert url_server.requests == [('HEAD', '/ok'), ('HEAD', '/no_head'),
+                                       ('GET', '/no_head')]
+
+    def test_ttl(self, url_server):
+        cache = checkers.URLCache()
+        url = url_server.url + '/ok'
+
+        for n in range(3):
+            cache.check(url)
+        assert cache.request_calls == 1
+
+        cache.ttl = 0
+        cache.check(url)
+        assert cache.request_calls == 2
+
+    def test_failures_not_kept(self, url_server, monkeypatch):
+        """
+        Failures are only reused for failure_ttl, a server that comes back
+        is seen without waiting for the ttl
+        """
+        cache = checkers.URLCache()
+        url = url_server.url + '/missing'
+        now = [1000.0]
+        monkeypatch.setattr(checkers.time, 'time', lambda: now[0])
+
+        assert cache.check(url)[0] is False
+        cache.check(url)
+        assert cache.request_calls == 1
+
+        now[0] += cache.failure_ttl
+        cache.check(url)
+        assert cache.request_calls == 2
+
+        # Successes are kept for the ttl
+        cache.check(url_server.url + '/ok')
+        now[0] += cache.failure_ttl
+        cache.check(url_server.url + '/ok')
+        assert cache.request_calls == 3
+
+    def test_persistence(self, url_server, tmp_path):
+        """
+        Results are reused by a following run
+        """
+        path = str(tmp_path.joinpath('urls.json'))
+        url = url_server.url + '/missing'
+
+        cache = checkers.URLCache(path=path)
+        assert cache.check(url) == (False, 'Webpage does not exist')
+
+        cache = checkers.URLCache(path=path)
+        assert cache.check(url) == (False, 'Webpage does not exist')
+        assert cache.request_calls == 0
+
+        # Expired results are not reused
+        cache = checkers.URLCache(path=path, ttl=0)
+        cache.check(url)
+        assert cache.request_calls == 1
+
 
 class TestCheckDatetimeOrderedPair(CheckerTestBase):
     checker_cls = checkers.CheckDatetimeOrderedPair
@@ -201,7 +685,13 @@ class TestCheckDatetimeOrderedPair(CheckerTestBase):
         ('basic', 'end_date', '2016-04-01', {'start_date': '2016-05-01'}, False),
         # Equal dates is invalid
         ('basic', 'end_date', '2010-11-02', {'start_date': '2010-11-02'}, False),
-
+        # Several pairs in a section are compared with their own match
+        ('basic', 'start_date', '2019-10-01',
+         {'stop_sim': '2019-01-01', 'begin_sim': '2018-01-01', 'end_date': '2019-10-02'}, True),
+        ('basic', 'end_date', '2019-10-02',
+         {'begin_sim': '2020-01-01', 'stop_sim': '2021-01-01', 'start_date': '2019-10-01'}, True),
+        # Missing the other end of the pair
+        ('basic', 'start_date', '2019-10-01', None, False),
     ])
     def test_check(self, checker, section, item, value, extra_config, valid):
         assert self.check_value(checker) == valid
@@ -2,8 +2,16 @@
 # -*- coding: utf-8 -*-
 
 import re
-from inicheck.cli import current_version, inicheck_main, inidiff_main
+import shutil
+import sys
+from os.path import join
+
+from inicheck import cli
+from inicheck.cli import (current_version, find_config_files, inicheck_batch,
+                          inicheck_main, inicheck_watch, inidiff_main,
+                          is_batch_pattern, main)
 from .test_output import capture_print
+from .test_watch import rewrite
 import pytest
 
 
@@ -27,6 +35,9 @@ class TestInicheckCLI:
         ({"show_non_defaults": True}, "albedo", 3),
         ({"details": ['topo']}, "topo", 6),
         ({"details": ['topo', 'basin_lat']}, "basin", 3),
+        ({"show_timings": True}, "Timings Report", 1),
+        ({"show_timings": True}, "check config ", 1),
+        ({}, "Timings Report", 0),
     ])
     def test_cli_output(self, full_config_ini, master_ini, flags_dict, countable_str, expected_str_count):
         """
@@ -71,6 +82,118 @@ class TestInidiffCLI():
         assert '117' in mismatches
 
 
+class TestInicheckBatch():
+
+    @pytest.fixture
+    def batch_dir(self, tmp_path, full_config_ini, base_config_ini):
+        """
+        Directory with a config with errors, a clean config and a config that
+        cannot be read, the last two in a sub directory
+        """
+        sub = tmp_path.joinpath('sub')
+        sub.mkdir()
+        shutil.copy(full_config_ini, str(tmp_path.joinpath('full.ini')))
+        shutil.copy(base_config_ini, str(sub.joinpath('base.ini')))
+        sub.joinpath('broken.ini').write_text('not a config\n')
+        sub.joinpath('notes.txt').write_text('ignored\n')
+
+        return str(tmp_path)
+
+    @pytest.mark.parametrize('pattern, expected', [
+        ('', ['full.ini', 'sub/base.ini', 'sub/broken.ini']),
+        ('*.ini', ['full.ini']),
+        ('**/*.ini', ['full.ini', 'sub/base.ini', 'sub/broken.ini']),
+        ('sub/b*', ['sub/base.ini', 'sub/broken.ini']),
+        ('missing/*.ini', []),
+    ])
+    def test_find_config_files(self, batch_dir, pattern, expected):
+        """
+        Directories and globs expand to the sorted files they match
+        """
+        files = find_config_files(join(batch_dir, pattern))
+        assert files == [join(batch_dir, f) for f in expected]
+
+    @pytest.mark.parametrize('pattern, jobs, code, countable_str, count', [
+        ('', None, 1, 'ERRORS', 1),
+        ('', 2, 1, 'FAILED', 1),
+        ('', None, 1, 'File does not exist', 9),
+        ('', 2, 1, '3 files checked: 1 ok, 0 warnings, 1 errors, 1 failed', 1),
+        ('sub/base.ini', None, 0, 'OK', 1),
+        ('sub/base*', 2, 0, '1 files checked: 1 ok', 1),
+        ('missing/*.ini', None, 1, 'No config files found', 1),
+    ])
+    def test_inicheck_batch(self, batch_dir, master_ini, pattern, jobs, code,
+                            countable_str, count):
+        """
+        Check the per file lines, summary and exit code of a batch check
+        """
+        result = {}
+
+        def run():
+            result['code'] = inicheck_batch(join(batch_dir, pattern),
+                                            master=master_ini, jobs=jobs)
+
+        s = capture_print(run)
+        assert result['code'] == code
+        assert s.count(countable_str) == count
+
+    def test_main_exit_code(self, batch_dir, master_ini, monkeypatch):
+        """
+        The console script exits non-zero when any file has errors
+        """
+        monkeypatch.setattr(sys, 'argv', ['inicheck', '-f', batch_dir,
+                                          '-mf'] + master_ini)
+
+        with pytest.raises(SystemExit) as e:
+            capture_print(main)
+
+        assert e.value.code == 1
+
+
+def test_is_batch_pattern(tmp_path):
+    """
+    Existing files with glob characters in their name are not patterns
+    """
+    config = tmp_path.joinpath('run[1].ini')
+    config.write_text("[settings]\n")
+
+    assert not is_batch_pattern(str(config))
+    assert is_batch_pattern(str(tmp_path.joinpath('run[2].ini')))
+    assert is_batch_pattern(str(tmp_path.joinpath('*.ini')))
+    assert is_batch_pattern(str(tmp_path))
+
+
+def test_inicheck_watch_no_master(tmp_path):
+    with pytest.raises(SystemExit) as e:
+        capture_print(inicheck_watch, str(tmp_path.joinpath('config.ini')))
+
+    assert e.value.code == 1
+
+
+def test_inicheck_watch(config_files, monkeypatch):
+    """
+    The report is printed once followed by the changes as they are made
+    """
+    config, master = config_files("[settings]\nnum_users: two\n")
+
+    edits = ["[settings]\nnum_users: 2\n",
+             "[settings]\nnum_users: 2\nlog: missing.txt\n"]
+
+    def edit(seconds):
+        if edits:
+            rewrite(config, edits.pop(0))
+
+    monkeypatch.setattr(cli.time, 'sleep', edit)
+
+    s = capture_print(inicheck_watch, config, master=master, cycles=3)
+
+    assert s.count('Configuration File Status Report') == 1
+    assert s.count('Change detected') == 2
+    assert s.count('- ERROR') == 1
+    assert s.count('+ WARNING') == 1
+    assert '0 errors, 1 warnings' in s
+
+
 def test_version():
     exception_message = re.search(
         '(exception|error)', str(current_version()), re.IGNORECASE
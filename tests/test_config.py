@@ -6,8 +6,11 @@ test_config
 
 Tests for `inicheck.config` module.
 """
+from datetime import datetime
+
 import pytest
-from inicheck.config import MasterConfig, UserConfig, check_types
+from inicheck.config import ConfigIndex, MasterConfig, UserConfig, check_types
+from inicheck.tools import check_config, get_user_config, iter_issues
 from inicheck.entries import ConfigEntry
 from tests.conftest import TEST_ROOT
 from os.path import join
@@ -134,6 +137,196 @@ class TestRecipeActions:
         assert expected_item_added in ucfg.cfg[expected_section].keys()
 
 
+class TestConfigIndex:
+
+    @pytest.fixture(scope='class')
+    @classmethod
+    def ucfg(cls, full_config_ini, full_mcfg):
+        ucfg = UserConfig(full_config_ini, mcfg=full_mcfg)
+        ucfg.apply_recipes()
+        return ucfg
+
+    def test_index_current_after_recipes(self, ucfg):
+        """
+        The index kept during recipes matches one built from scratch
+        """
+        fresh = ConfigIndex(ucfg.cfg)
+
+        assert ucfg.index.entries == fresh.entries
+        assert ucfg.index.value_index == fresh.value_index
+        assert ucfg.index.item_index == fresh.item_index
+        assert ucfg.index.sections == fresh.sections
+        assert ucfg.index.items == fresh.items
+        assert ucfg.index.values == fresh.values
+
+    @pytest.mark.parametrize("value, expected", [
+        ('dk', {('precip', 'distribution')}),
+        ('not_a_value', set()),
+    ])
+    def test_where(self, ucfg, value, expected):
+        assert ucfg.index.where(value) == expected
+
+    def test_unique_entries(self, ucfg):
+        """
+        The unique entries reflect the config after recipes
+        """
+        assert 'krig_variogram_model' not in ucfg.items
+        assert ucfg.sections == ucfg.get_unique_entries(ucfg.cfg)[0]
+
+    def test_index_edits(self):
+        index = ConfigIndex({'topo': {'filename': 'dem.nc'}})
+        index.set('topo', 'filename', ['a.nc', 'b.nc'])
+        assert index.where('dem.nc') == set()
+        assert index.where('b.nc') == {('topo', 'filename')}
+        assert index.values == {'a.nc', 'b.nc'}
+
+        index.set('wind', 'filename', 'a.nc')
+        index.set('wind', 'empty', [])
+        assert index.sections == {'topo', 'wind'}
+        assert index.items == {'filename'}
+
+        index.discard('wind', 'filename')
+        assert index.sections == {'topo'}
+        assert index.items == {'filename'}
+        assert index.where('a.nc') == {('topo', 'filename')}
+
+        index.discard_section('topo')
+        assert not index.values
+        assert not index.sections
+        assert not index.items
+        assert index.sections_with('filename') == set()
+
+
+class TestAddDefaults:
+
+    @pytest.fixture(scope='function')
+    def ucfg(self, full_config_ini, full_mcfg):
+        return UserConfig(full_config_ini, mcfg=full_mcfg)
+
+    def test_default_templates_read_only(self, full_mcfg):
+        """
+        The precomputed default templates should not be modifiable
+        """
+        with pytest.raises(TypeError):
+            full_mcfg.defaults['topo']['filename'] = 'test.nc'
+
+    def test_add_defaults_section(self, ucfg):
+        """
+        Defaults are filled under the users values and untouched sections are
+        not copied
+        """
+        result = ucfg.add_defaults(ucfg.cfg, sections='wind')
+        template = ucfg.mcfg.defaults['wind']
+
+        assert set(template.keys()).issubset(result['wind'].keys())
+        assert result['topo'] is ucfg.cfg['topo']
+        assert result['wind'] is not ucfg.cfg['wind']
+
+        for item, value in ucfg.cfg['wind'].items():
+            assert result['wind'][item] == value
+
+    def test_recipe_defaults_copy_lists(self, config_files):
+        """
+        Default lists added by recipes are not shared with the master config
+        """
+        cfg, master = config_files(
+            "[output]\nfrequency: 2\n",
+            master="[output]\n\n"
+                   "variables:\ndefault = [a b],\ntype = string list,\n"
+                   "description = output variables\n\n"
+                   "frequency:\ndefault = 1,\ntype = int,\n"
+                   "description = output frequency\n\n"
+                   "[output_recipe]\ntrigger:\n  has_section = output\n\n"
+                   "output:\n  variables = default\n")
+
+        mcfg = MasterConfig(path=master)
+        ucfg = UserConfig(cfg, mcfg=mcfg)
+        ucfg.apply_recipes()
+
+        ucfg.cfg['output']['variables'].append('changed')
+
+        assert mcfg.cfg['output']['variables'].default == ['a', 'b']
+
+    def test_add_defaults_copies_lists(self, full_config_ini, master_ini):
+        """
+        Changing a default list in one users config leaves the master config
+        and other users untouched
+        """
+        mcfg = MasterConfig(path=master_ini)
+        expected = list(mcfg.cfg['output']['variables'].default)
+
+        ucfgs = [UserConfig(full_config_ini, mcfg=mcfg) for n in range(2)]
+        results = []
+
+        for ucfg in ucfgs:
+            del ucfg.cfg['output']['variables']
+            results.append(ucfg.add_defaults(ucfg.cfg, sections='output'))
+
+        results[0]['output']['variables'].append('changed')
+
+        assert mcfg.cfg['output']['variables'].default == expected
+        assert list(mcfg.defaults['output']['variables']) == expected
+        assert results[1]['output']['variables'] == expected
+
+
+class TestUserConfigUpdate:
+
+    @pytest.fixture(scope='function')
+    def ucfg(self, full_config_ini, master_ini):
+        return get_user_config(full_config_ini, master_files=master_ini)
+
+    def test_update_new_error(self, ucfg):
+        """
+        Changing a value to something invalid reports only the new error
+        """
+        new_w, new_e, res_w, res_e = ucfg.update(
+            {('wind', 'reduction_factor'): 'abc'})
+
+        assert len(new_e) == 1
+        assert 'reduction_factor' in new_e[0]
+        assert not new_w + res_w + res_e
+
+    def test_update_resolves_errors(self, ucfg):
+        """
+        Ordered pairs are re-checked together and fixes are reported
+        """
+        new_w, new_e, res_w, res_e = ucfg.update(
+            {('time', 'start_date'): '2030-01-01'})
+        assert len(new_e) == 2
+
+        new_w, new_e, res_w, res_e = ucfg.update(
+            {('time', 'start_date'): '2016-10-01'})
+        assert len(res_e) == 2
+        assert ucfg.cfg['time']['start_date'] == datetime(2016, 10, 1)
+
+    def test_update_applies_recipes(self, ucfg):
+        """
+        Changing a value a recipe triggers on re-applies the recipes
+        """
+        ucfg.update({('precip', 'distribution'): 'idw'})
+
+        assert ucfg.cfg['precip']['distribution'] == 'idw'
+        assert 'dk_ncores' not in ucfg.cfg['precip'].keys()
+        assert isinstance(ucfg.cfg['precip']['idw_power'], float)
+
+    def test_update_matches_full_check(self, ucfg):
+        """
+        The config after an update checks the same as a freshly built one
+        """
+        ucfg.update({('wind', 'reduction_factor'): 'abc'})
+
+        with open(ucfg.filename) as f:
+            text = f.read().replace('reduction_factor:              1.0',
+                                    'reduction_factor:              abc')
+
+        fresh = get_user_config(ucfg.filename, mcfg=ucfg.mcfg, text=text)
+
+        assert fresh.raw_cfg['wind']['reduction_factor'] == ['abc']
+        assert ucfg.cfg == fresh.cfg
+        assert check_config(ucfg) == check_config(fresh)
+        assert list(iter_issues(ucfg)) == list(iter_issues(fresh))
+
+
 class TestMasterConfig():
 
     @pytest.mark.parametrize("mcfg_kwargs", [
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import socket
+import stat
+import sys
+import threading
+
+import pytest
+
+from inicheck.daemon import (DaemonServer, client_main, default_socket,
+                             private_directory, send_request, send_requests)
+from inicheck.service import ValidationService
+
+from .conftest import write_configs
+from .test_output import capture_print
+
+
+@pytest.fixture
+def daemon(tmp_path_factory):
+    """
+    Daemon running in a thread on a short socket path
+    """
+    d = tmp_path_factory.mktemp('d')
+    config, master = write_configs(d, "[settings]\nnum_users: two\n",
+                                   files={'log.txt': ''})
+
+    service = ValidationService(master_files=master)
+    server = DaemonServer(str(d.joinpath('s.sock')), service)
+    server.config = config
+
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,),
+                              daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_default_socket(monkeypatch):
+    monkeypatch.setenv('INICHECK_SOCKET', '/run/inicheck.sock')
+    assert default_socket() == '/run/inicheck.sock'
+
+    monkeypatch.delenv('INICHECK_SOCKET')
+    monkeypatch.setenv('XDG_RUNTIME_DIR', '/run/user/1000')
+    assert default_socket() == '/run/user/1000/inicheck.sock'
+
+    monkeypatch.delenv('XDG_RUNTIME_DIR')
+    assert default_socket().endswith(
+        os.path.join('inicheck-{}'.format(os.getuid()), 'inicheck.sock'))
+
+
+def test_private_directory(tmp_path):
+    d = tmp_path.joinpath('private')
+    private_directory(str(d))
+    assert stat.S_IMODE(d.stat().st_mode) == 0o700
+
+    # Existing directories are reused when only the user can access them
+    private_directory(str(d))
+
+    d.chmod(0o755)
+    with pytest.raises(OSError):
+        private_directory(str(d))
+
+    f = tmp_path.joinpath('file')
+    f.write_text('')
+    with pytest.raises(OSError):
+        private_directory(str(f))
+
+
+class TestDaemon():
+
+    def test_send_request(self, daemon):
+        r = send_request({'path': daemon.config},
+                         socket_path=daemon.socket_path)
+
+        assert r['path'] == daemon.config
+        assert len(r['errors']) == 1
+        assert r['failure'] is None
+
+    def test_send_requests(self, daemon):
+        """
+        Many requests share a connection and invalid ones are answered with
+        the failure
+        """
+        responses = send_requests([{'command': 'ping'},
+                                   {'command': 'cast', 'path': daemon.config,
+                                    'text': "[settings]\nnum_users: 3\n"},
+                                   {'command': 'shutdown'}],
+                                  socket_path=daemon.socket_path)
+
+        assert responses[0]['reloads'] == 1
+        assert responses[1]['cfg']['settings']['num_users'] == 3
+        assert responses[2]['failure'].startswith('ValueError')
+
+    def test_already_running(self, daemon):
+        with pytest.raises(OSError):
+            DaemonServer(daemon.socket_path, daemon.service)
+
+    def test_stale_socket(self, daemon):
+        """
+        A socket left behind by a daemon that is gone is replaced
+        """
+        path = daemon.socket_path + '2'
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.bind(path)
+        s.close()
+
+        server = DaemonServer(path, daemon.service)
+        server.server_close()
+
+        assert not os.path.exists(path)
+
+    def test_socket_private(self, daemon):
+        mode = os.stat(daemon.socket_path).st_mode
+        assert stat.S_ISSOCK(mode)
+        assert stat.S_IMODE(mode) == 0o600
+
+    def test_other_file_kept(self, tmp_path, daemon):
+        """
+        Files other than sockets are never removed or connected to
+        """
+        path = tmp_path.joinpath('s.sock')
+        path.write_text('')
+
+        with pytest.raises(OSError):
+            DaemonServer(str(path), daemon.service)
+
+        with pytest.raises(OSError):
+            send_request({'command': 'ping'}, socket_path=str(path))
+
+        assert path.is_file()
+
+    @pytest.mark.parametrize('argv, stdin, code, countable_str, count', [
+        ([], None, 1, 'ERRORS', 1),
+        (['--stdin'], "[settings]\nnum_users: 3\n", 0, 'OK', 1),
+        (['--stdin'], "[settings]\nlog: missing.txt\n", 0, 'WARNINGS', 1),
+        (['--reload'], None, 1, 'Expecting int', 1),
+    ])
+    def test_client_main(self, daemon, monkeypatch, argv, stdin, code,
+                         countable_str, count):
+        monkeypatch.setattr(sys, 'argv', ['inicheck-client', '-s',
+                                          daemon.socket_path,
+                                          daemon.config] + argv)
+        monkeypatch.setattr(sys, 'stdin', io.StringIO(stdin or ''))
+
+        result = {}
+
+        def run():
+            result['code'] = client_main()
+
+        s = capture_print(run)
+
+        assert result['code'] == code
+        assert s.count(countable_str) == count
+
+    def test_client_profile(self, daemon, tmp_path, monkeypatch):
+        out = str(tmp_path.joinpath('client.prof'))
+        monkeypatch.setattr(sys, 'argv', ['inicheck-client', '-s',
+                                          daemon.socket_path,
+                                          daemon.config, '--profile', out])
+        result = {}
+
+        def run():
+            result['code'] = client_main()
+
+        capture_print(run)
+
+        assert result['code'] == 1
+        assert os.path.isfile(out)
+
+    def test_client_no_daemon(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sys, 'argv', ['inicheck-client', '-s',
+                                          str(tmp_path.joinpath('s.sock')),
+                                          'config.ini'])
+        result = {}
+
+        def run():
+            result['code'] = client_main()
+
+        assert 'Could not reach' in capture_print(run)
+        assert result['code'] == 1
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from inicheck.http_server import (ValidationHandler, ValidationHTTPServer,
+                                  parse_address)
+from inicheck.service import ValidationService
+
+from .conftest import write_configs
+
+
+@pytest.fixture(scope='module')
+def http_server(tmp_path_factory):
+    """
+    Validation server running in a thread on a free port
+    """
+    d = tmp_path_factory.mktemp('http')
+    config, master = write_configs(d, "[settings]\nnum_users: two\n")
+
+    service = ValidationService(master_files=master)
+    server = ValidationHTTPServer(('127.0.0.1', 0), service, workers=4)
+    server.config = config
+
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,),
+                              daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, endpoint, body):
+    """
+    Posts to the server returning the status and the decoded JSON response
+    """
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode('utf-8')
+
+    request = Request(server.url + endpoint, data=body,
+                      headers={'Content-Type': 'application/json'})
+
+    try:
+        with urlopen(request) as r:
+            return r.status, json.loads(r.read().decode('utf-8'))
+
+    except HTTPError as e:
+        return e.code, json.loads(e.read().decode('utf-8'))
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('8000', ('127.0.0.1', 8000)),
+    (8000, ('127.0.0.1', 8000)),
+    ('0.0.0.0:80', ('0.0.0.0', 80)),
+    (':80', ('127.0.0.1', 80)),
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+class TestValidationHTTPServer():
+
+    def test_validate_path(self, http_server):
+        status, r = post(http_server, '/validate',
+                         {'path': http_server.config})
+
+        assert status == 200
+        assert r['path'] == http_server.config
+        assert len(r['errors']) == 1
+        assert r['cfg'] is None
+
+    @pytest.mark.parametrize('endpoint, text, errors, cfg', [
+        ('/validate', "[settings]\nnum_users: 3\n", 0, None),
+        ('/cast', "[settings]\nnum_users: 3\n", 0, 3),
+        ('/cast', "[settings]\nnum_users: three\n", 1, 'three'),
+    ])
+    def test_text(self, http_server, endpoint, text, errors, cfg):
+        status, r = post(http_server, endpoint, {'text': text})
+
+        assert status == 200
+        assert len(r['errors']) == errors
+
+        if cfg is None:
+            assert r['cfg'] is None
+        else:
+            assert r['cfg']['settings']['num_users'] == cfg
+
+    def test_unreadable_config(self, http_server):
+        status, r = post(http_server, '/validate', {'text': "not a config"})
+
+        assert status == 200
+        assert r['failure'] is not None
+
+    @pytest.mark.parametrize('endpoint, body, status', [
+        ('/validate', b'not json', 400),
+        ('/validate', [1, 2], 400),
+        ('/validate', {}, 400),
+        ('/check', {'text': ''}, 404),
+    ])
+    def test_bad_requests(self, http_server, endpoint, body, status):
+        code, r = post(http_server, endpoint, body)
+
+        assert code == status
+        assert r['failure'] is not None
+
+    def test_health(self, http_server):
+        with urlopen(http_server.url + '/health') as r:
+            assert json.loads(r.read().decode('utf-8'))['reloads'] == 1
+
+    def test_concurrent(self, http_server):
+        """
+        Requests made at the same time are each answered with their own
+        result
+        """
+        def run(i):
+            return post(http_server, '/cast',
+                        {'text': "[settings]\nnum_users: {}\n".format(i)})
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(run, range(32)))
+
+        assert [r['cfg']['settings']['num_users'] for _, r in results] == \
+            list(range(32))
+
+    def test_idle_connection_dropped(self, http_server, monkeypatch):
+        """
+        Clients that connect and send nothing are disconnected after the
+        timeout instead of holding a worker
+        """
+        assert ValidationHandler.timeout is not None
+        monkeypatch.setattr(ValidationHandler, 'timeout', 0.2)
+        start = time.perf_counter()
+
+        with socket.create_connection(http_server.server_address[:2],
+                                      timeout=5) as s:
+            assert s.recv(1024) == b''
+
+        assert time.perf_counter() - start < 4
+
+        with urlopen(http_server.url + '/health') as r:
+            assert r.status == 200
+
+    @pytest.mark.parametrize('length', ['abc', '-1'])
+    def test_bad_content_length(self, http_server, length):
+        with socket.create_connection(http_server.server_address[:2],
+                                      timeout=5) as s:
+            s.sendall("POST /validate HTTP/1.1\r\nContent-Length: {}\r\n\r\n"
+                      "".format(length).encode('ascii'))
+            response = s.makefile('rb').read().decode('utf-8')
+
+        assert response.startswith('HTTP/1.0 400')
+        assert 'Content-Length' in response
+
+
+class BlockingService(object):
+    """
+    Service answering requests only once released
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def handle(self, request):
+        self.release.wait(5)
+        return {'path': None}
+
+
+def test_busy():
+    """
+    Connections beyond the workers and pending ones are answered with 503
+    """
+    service = BlockingService()
+    server = ValidationHTTPServer(('127.0.0.1', 0), service, workers=1,
+                                  max_pending=1)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,),
+                              daemon=True)
+    thread.start()
+
+    try:
+        with ThreadPoolExecutor(2) as executor:
+            waiting = [executor.submit(post, server, '/validate', {'text': ''})
+                       for i in range(2)]
+
+            # Wait until both are handled or waiting on the worker
+            for i in range(100):
+                if not server._slots.acquire(blocking=False):
+                    break
+
+                server._slots.release()
+                time.sleep(0.02)
+
+            status, r = post(server, '/validate', {'text': ''})
+            assert status == 503
+            assert r['failure'] is not None
+
+            service.release.set()
+            assert [f.result()[0] for f in waiting] == [200, 200]
+
+        # Finished requests free their slots
+        assert post(server, '/validate', {'text': ''})[0] == 200
+
+    finally:
+        service.release.set()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import io
+import pstats
+import sys
+import tracemalloc
+
+import pytest
+
+from inicheck.profiling import (REPORT_LINES, add_profile_arguments,
+                                memprofile_lines, profiled, report_memory)
+
+
+@profiled
+def work(n):
+    return len([str(i) for i in range(n)])
+
+
+@profiled
+def fail():
+    sys.exit(2)
+
+
+class TestProfiling():
+
+    @pytest.fixture(autouse=True)
+    def clean_env(self, monkeypatch):
+        monkeypatch.delenv('INICHECK_PROFILE', raising=False)
+        monkeypatch.delenv('INICHECK_MEMPROFILE', raising=False)
+        monkeypatch.setattr(sys, 'argv', ['inicheck'])
+
+    def test_not_profiled(self, capsys):
+        assert work(10) == 10
+        assert not tracemalloc.is_tracing()
+        assert capsys.readouterr().err == ''
+
+    def test_profile(self, monkeypatch, tmp_path, capsys):
+        out = str(tmp_path.joinpath('run.prof'))
+        monkeypatch.setattr(sys, 'argv', ['inicheck', '-f', 'x.ini',
+                                          '--profile', out])
+
+        assert work(1000) == 1000
+
+        err = capsys.readouterr().err
+        assert "Profile saved to {}".format(out) in err
+        assert 'cumulative' in err
+        assert 'Memory Report' not in err
+
+        stats = pstats.Stats(out)
+        assert any(f[2] == 'work' for f in stats.stats.keys())
+
+    def test_memprofile(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, 'argv', ['inicheck', '--memprofile'])
+
+        assert work(1000) == 1000
+
+        err = capsys.readouterr().err
+        assert 'Memory Report' in err
+        assert 'peak' in err
+        assert 'Profile saved' not in err
+        assert not tracemalloc.is_tracing()
+
+    def test_environment(self, monkeypatch, tmp_path, capsys):
+        out = str(tmp_path.joinpath('env.prof'))
+        monkeypatch.setenv('INICHECK_PROFILE', out)
+        monkeypatch.setenv('INICHECK_MEMPROFILE', '3')
+
+        work(100)
+
+        err = capsys.readouterr().err
+        assert tmp_path.joinpath('env.prof').is_file()
+        assert 'Memory Report' in err
+
+        # Only the number of lines asked for are listed
+        report = err.split('Memory Report:')[1].strip().split('\n')
+        assert len(report) <= 3 + 3
+
+    def test_exit_reported(self, monkeypatch, tmp_path, capsys):
+        """
+        Scripts exiting with sys.exit are still reported
+        """
+        out = str(tmp_path.joinpath('exit.prof'))
+        monkeypatch.setattr(sys, 'argv', ['inicheck', '--profile', out])
+
+        with pytest.raises(SystemExit):
+            fail()
+
+        assert "Profile saved" in capsys.readouterr().err
+        assert tmp_path.joinpath('exit.prof').is_file()
+
+    @pytest.mark.parametrize('value, expected', [
+        (None, None),
+        ('', None),
+        ('1', 1),
+        ('yes', REPORT_LINES),
+        ('10', 10),
+    ])
+    def test_memprofile_lines(self, monkeypatch, value, expected):
+        if value is not None:
+            monkeypatch.setenv('INICHECK_MEMPROFILE', value)
+
+        assert memprofile_lines() == expected
+
+    def test_arguments(self):
+        parser = argparse.ArgumentParser()
+        add_profile_arguments(parser)
+
+        args = parser.parse_args([])
+        assert args.profile is None
+        assert not args.memprofile
+
+        args = parser.parse_args(['--profile', 'out.prof', '--memprofile'])
+        assert args.profile == 'out.prof'
+        assert args.memprofile
+
+    def test_report_memory(self):
+        out = io.StringIO()
+        tracemalloc.start()
+
+        try:
+            data = [str(i) for i in range(1000)]
+            report_memory(lines=2, out=out)
+
+        finally:
+            tracemalloc.stop()
+
+        lines = out.getvalue().strip().split('\n')
+        assert lines[0] == 'Memory Report:'
+        assert len(lines) <= 4 + 2
+        assert len(data) == 1000
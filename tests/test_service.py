@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from inicheck.service import ValidationService
+
+from .conftest import MASTER
+
+
+@pytest.fixture
+def files(config_files):
+    return config_files("[settings]\nnum_users: 2\n", files={'log.txt': ''})
+
+
+@pytest.fixture
+def master(files):
+    return files[1]
+
+
+@pytest.fixture
+def config(files):
+    return files[0]
+
+
+@pytest.fixture
+def service(master):
+    return ValidationService(master_files=master)
+
+
+def touch_master(master, text):
+    """
+    Rewrites the master making sure its modification time changes
+    """
+    st = os.stat(master)
+
+    with open(master, 'w') as fp:
+        fp.write(text)
+
+    os.utime(master, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class TestValidationService():
+
+    def test_requires_master(self):
+        with pytest.raises(IOError):
+            ValidationService()
+
+    @pytest.mark.parametrize('text, errors', [
+        (None, 0),
+        ("[settings]\nnum_users: 2\n", 0),
+        ("[settings]\nnum_users: two\n", 1),
+        ("[settings]\nnum_users: two\nlog: missing.txt\n", 1),
+    ])
+    def test_validate(self, service, config, text, errors):
+        """
+        Configs are read from disk or from the text given
+        """
+        result = service.validate(config, text=text)
+
+        assert result.failure is None
+        assert len(result.errors) == errors
+        assert result.cfg is None
+
+    def test_validate_relative_text(self, service, config):
+        """
+        Paths in a config given as text are relative to its path
+        """
+        text = "[settings]\nlog: missing.txt\n"
+
+        result = service.validate(config, text=text)
+        assert len(result.warnings) == 1
+
+        result = service.validate(config, text=text.replace('missing',
+                                                            'log'))
+        assert result.warnings == []
+
+    def test_validate_cast(self, service, config):
+        result = service.validate(config, cast=True)
+        assert result.cfg['settings']['num_users'] == 2
+
+    def test_validate_missing(self, service, tmp_path):
+        result = service.validate(str(tmp_path.joinpath('missing.ini')))
+        assert result.failure.startswith('OSError')
+
+    def test_reload_if_changed(self, service, master, config):
+        """
+        Edits to the master are picked up on the next request and a broken
+        master keeps the previous one in use
+        """
+        assert not service.reload_if_changed()
+        assert service.reloads == 1
+
+        touch_master(master, MASTER.replace('type = int', 'type = string'))
+        assert service.validate(config, cast=True).cfg['settings'][
+            'num_users'] == '2'
+        assert service.reloads == 2
+
+        touch_master(master, "not a master")
+        assert not service.reload_if_changed()
+        assert service.reload_error is not None
+        assert service.validate(config).failure is None
+        assert service.reloads == 2
+
+        touch_master(master, MASTER)
+        assert service.reload_if_changed()
+        assert service.reload_error is None
+
+    @pytest.mark.parametrize('request_dict, keys', [
+        ({'command': 'ping'}, ['reloads', 'reload_error', 'master_files']),
+        ({'command': 'reload'}, ['reloads', 'reload_error', 'master_files']),
+        ({}, ['path', 'warnings', 'errors', 'cfg', 'failure']),
+        ({'command': 'cast'}, ['path', 'warnings', 'errors', 'cfg',
+                               'failure']),
+    ])
+    def test_handle(self, service, config, request_dict, keys):
+        if 'command' not in request_dict or request_dict['command'] == 'cast':
+            request_dict = dict(request_dict, path=config)
+
+        assert list(service.handle(request_dict).keys()) == keys
+
+    @pytest.mark.parametrize('request_dict', [
+        {'command': 'validate'},
+        {'command': 'shutdown'},
+    ])
+    def test_handle_invalid(self, service, request_dict):
+        with pytest.raises(ValueError):
+            service.handle(request_dict)
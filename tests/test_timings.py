@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+
+from inicheck.timings import Timings, bind, count, stage
+
+
+class TestTimings():
+
+    def test_not_recording(self):
+        """
+        Stages and counts outside of a Timings are ignored
+        """
+        t = Timings()
+
+        with stage('parse'):
+            count('stat calls')
+
+        assert t.stages == {}
+        assert t.counters == {}
+
+    def test_recording(self):
+        with Timings() as t:
+            for n in range(3):
+                with stage('parse'):
+                    count('stat calls', 2)
+
+            with stage('recipes'):
+                pass
+
+        with stage('parse'):
+            count('stat calls')
+
+        assert list(t.stages.keys()) == ['parse', 'recipes']
+        assert t.stages['parse'][0] == 3
+        assert t.seconds('parse') >= 0
+        assert t.seconds('missing') == 0
+        assert t.counters == {'stat calls': 6}
+
+    def test_nested(self):
+        """
+        Every Timings recording gets the stages and counts
+        """
+        with Timings() as outer:
+            count('stat calls')
+
+            with Timings() as inner:
+                with stage('parse'):
+                    count('stat calls')
+
+        assert outer.counters == {'stat calls': 2}
+        assert inner.counters == {'stat calls': 1}
+        assert outer.stages['parse'][0] == inner.stages['parse'][0] == 1
+
+    def test_threads(self):
+        """
+        Work on other threads is recorded when bound to the Timings
+        """
+        def work():
+            for n in range(1000):
+                count('stat calls')
+
+        with Timings() as t:
+            threads = [threading.Thread(target=bind(work)) for n in range(4)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        assert t.counters == {'stat calls': 4000}
+
+    def test_concurrent_recordings(self):
+        """
+        Timings recording on different threads only get their own counts
+        """
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def work(n):
+            with Timings() as t:
+                barrier.wait()
+
+                for i in range(100 * (n + 1)):
+                    count('stat calls')
+
+                barrier.wait()
+
+            results[n] = t.counters
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert results == {n: {'stat calls': 100 * (n + 1)} for n in range(4)}
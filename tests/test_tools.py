@@ -7,10 +7,17 @@ test_recipe
 Tests for `inicheck.Tools` module.
 """
 
+import os
+import stat
+
 import pytest
+from inicheck.timings import Timings
 from inicheck.tools import *
+from inicheck.tools import _iter_sections
+from collections import OrderedDict
 from datetime import datetime
 from os.path import join
+
 from .conftest import TEST_ROOT
 
 
@@ -33,6 +40,67 @@ def test_get_checkers(fn_kwargs, expected_types):
         assert v in checkers
 
 
+class TestCheckerRegistry:
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        """
+        Keeps registrations from leaking into other tests
+        """
+        from inicheck import checkers
+        monkeypatch.setattr(checkers, 'registered_checkers', OrderedDict())
+        monkeypatch.setattr('inicheck.tools.registered_checkers',
+                            checkers.registered_checkers)
+        return checkers
+
+    def test_get_checkers_memoized(self):
+        first = get_checkers()
+        first.pop('bool')
+
+        assert 'bool' in get_checkers()
+        assert get_checkers() is not get_checkers()
+
+    def test_register_decorator(self, registry, full_ucfg):
+        @registry.register_checker
+        class CheckStation(registry.CheckString):
+            pass
+
+        @registry.register_checker(name='Station ID')
+        class StationIdValidator(registry.CheckString):
+            pass
+
+        all_checks = get_merged_checkers(full_ucfg)
+        assert all_checks['station'] is CheckStation
+        assert all_checks['stationid'] is StationIdValidator
+        assert all_checks['bool'] is registry.CheckBool
+
+        with pytest.raises(TypeError):
+            registry.register_checker(dict)
+
+    def test_entry_points(self, registry, monkeypatch, full_ucfg):
+        import importlib.metadata
+
+        class CheckFromPlugin(registry.CheckString):
+            pass
+
+        class EntryPoint:
+            name = 'plugin'
+
+            def load(self):
+                return CheckFromPlugin
+
+        class EntryPoints(list):
+            def select(self, group):
+                assert group == 'inicheck.checkers'
+                return self
+
+        monkeypatch.setattr(importlib.metadata, 'entry_points',
+                            lambda: EntryPoints([EntryPoint()]))
+        monkeypatch.setattr(registry, '_entry_points_loaded', False)
+
+        assert get_merged_checkers(full_ucfg)['plugin'] is CheckFromPlugin
+
+
 def test_check_config(full_ucfg):
     """
     Tests the check_config func in tools
@@ -41,6 +109,426 @@ def test_check_config(full_ucfg):
     assert len(errors) == 11
 
 
+def test_check_and_cast_matches_check_config(full_config_ini, master_ini):
+    """
+    The single pass in get_user_config reports the same issues as checking
+    the casted config afterwards
+    """
+    ucfg = get_user_config(full_config_ini, master_files=master_ini)
+    cached = check_config(ucfg)
+
+    assert cached == format_issues(_iter_sections(ucfg))
+
+
+@pytest.mark.parametrize('kind, value', [
+    ('CriticalFilename', 'data.txt'),
+    ('CriticalDirectory', 'data'),
+])
+def test_check_config_rechecks_paths(tmp_path, make_ucfg, kind, value):
+    """
+    Reusing the results of get_user_config still picks up paths created or
+    removed since
+    """
+    ucfg = make_ucfg("[files]\npath: {}\n".format(value),
+                     master="[files]\npath:\ntype = {},\n"
+                            "description = a path\n".format(kind))
+    assert len(check_config(ucfg)[1]) == 1
+
+    path = tmp_path.joinpath(value)
+
+    if kind == 'CriticalDirectory':
+        path.mkdir()
+    else:
+        path.write_text('')
+
+    assert check_config(ucfg) == ([], [])
+
+    if kind == 'CriticalDirectory':
+        path.rmdir()
+    else:
+        path.unlink()
+
+    assert len(check_config(ucfg)[1]) == 1
+
+
+class TestIterIssues:
+
+    @pytest.fixture
+    def ucfg(self, full_config_ini, master_ini):
+        """
+        Config that has not been checked yet
+        """
+        ucfg = get_user_config(full_config_ini, master_files=master_ini)
+        ucfg.issues = None
+        return ucfg
+
+    @pytest.mark.parametrize('checked', [False, True])
+    def test_matches_check_config(self, ucfg, checked):
+        """
+        Formatting the issues gives check_config whether or not the results
+        of get_user_config are reused
+        """
+        expected = check_config(ucfg)
+
+        if checked:
+            check_and_cast(ucfg)
+
+        issues = list(iter_issues(ucfg))
+
+        assert all(isinstance(issue, Issue) for issue in issues)
+        assert format_issues(issues) == expected
+
+    def test_records(self, tmp_path, test_config_dir):
+        f = tmp_path.joinpath('config.ini')
+        f.write_text("[basic]\nnum_users: abc\nusers: a\n"
+                     "[other]\nitem: 1\n")
+
+        ucfg = get_user_config(str(f),
+                               master_files=join(test_config_dir,
+                                                 'master.ini'))
+
+        assert list(iter_issues(ucfg)) == [
+            Issue('basic', 'num_users', None, 'error',
+                  'Expecting int received str', 'int'),
+            Issue('basic', 'users', None, 'warning',
+                  'Not a registered option.', None),
+            Issue('other', ' ', None, 'error', 'Not a valid section.', None)]
+
+    @pytest.mark.parametrize('kwargs, errors', [
+        ({}, 11),
+        ({'max_errors': 3}, 3),
+        ({'fail_fast': True}, 1),
+        ({'max_errors': 100}, 11),
+    ])
+    def test_max_errors(self, ucfg, kwargs, errors):
+        issues = list(iter_issues(ucfg, **kwargs))
+        assert len([i for i in issues if i.level == 'error']) == errors
+
+        check_and_cast(ucfg)
+        issues = list(iter_issues(ucfg, **kwargs))
+        assert len([i for i in issues if i.level == 'error']) == errors
+
+    def test_stops_early(self, ucfg, monkeypatch):
+        """
+        Items after the chunk with the last error wanted are never checked
+        """
+        from inicheck.tools import _start_items
+
+        checked = []
+
+        def start_items(config_obj, keys, *args):
+            checked.extend(keys)
+            return _start_items(config_obj, keys, *args)
+
+        monkeypatch.setattr('inicheck.tools.ISSUE_CHUNK', 4)
+        monkeypatch.setattr('inicheck.tools._start_items', start_items)
+
+        list(iter_issues(ucfg))
+        total = len(checked)
+
+        del checked[:]
+        issues = list(iter_issues(ucfg, fail_fast=True))
+
+        assert 0 < len(checked) < total
+        assert len(checked) % 4 == 0
+        assert (issues[-1].section, issues[-1].item) in checked[-4:]
+
+
+def test_get_user_config_timings(tmp_path, test_config_dir):
+    """
+    Timings of each stage are recorded and attached to the config
+    """
+    f = tmp_path.joinpath('config.ini')
+    f.write_text("[basic]\nnum_users: 2\nstart_date: 2 days after 2019-05-07"
+                 "\nlog: log.txt\n")
+
+    timings = Timings()
+    ucfg = get_user_config(str(f),
+                           master_files=join(test_config_dir, 'master.ini'),
+                           timings=timings)
+
+    assert ucfg.timings is timings
+    assert list(timings.stages.keys())[:4] == ['master config', 'parse',
+                                               'change log', 'recipes']
+    assert timings.stages['check and cast'][0] == 1
+    assert timings.stages['checker int'][0] == 1
+    assert timings.counters['dateparser calls'] == 1
+    assert timings.counters['stat calls'] == 1
+
+    assert get_user_config(str(f), master_files=join(test_config_dir,
+                                                     'master.ini')).timings \
+        is None
+
+
+def test_check_and_cast_invalid_values(tmp_path, test_config_dir):
+    """
+    Values that cannot be casted are left for check_config to report
+    instead of raising
+    """
+    f = tmp_path.joinpath('config.ini')
+    f.write_text("[basic]\nnum_users: abc\ntime_out: 2.0\n")
+
+    ucfg = get_user_config(str(f),
+                           master_files=join(test_config_dir, 'master.ini'))
+    warnings, errors = check_config(ucfg)
+
+    assert ucfg.cfg['basic']['num_users'] == 'abc'
+    assert ucfg.cfg['basic']['time_out'] == 2.0
+    assert len(errors) == 1
+    assert 'Expecting int received str' in errors[0]
+
+
+def test_check_config_path_workers(make_ucfg):
+    """
+    Path checks run in a thread pool report the same messages in the same
+    order as checking them one at a time
+    """
+    master = ["[files]"]
+    lines = ["[files]"]
+    files = {}
+
+    for n in range(20):
+        name = 'f{}.txt'.format(n)
+
+        # Every third file is missing
+        if n % 3:
+            files[name] = ''
+
+        master += ["file_{}:".format(n), "type = filename,",
+                   "description = file {}".format(n)]
+        lines.append("file_{}: {}".format(n, name))
+
+    master += ["[basic]", "num_users:", "type = int,",
+               "description = an int"]
+    lines += ["[basic]", "num_users: abc"]
+
+    ucfg = make_ucfg("\n".join(lines) + "\n",
+                     master="\n".join(master) + "\n", files=files)
+    serial = check_config(ucfg, workers=1)
+    threaded = check_config(ucfg, workers=4)
+
+    assert serial == threaded
+    assert len(serial[0]) == 7
+    assert 'file_0 ' in serial[0][0]
+    assert 'file_18 ' in serial[0][-1]
+    assert len(serial[1]) == 1
+
+
+class TestValidateMany:
+
+    @pytest.fixture(scope='class')
+    @classmethod
+    def paths(cls, tmp_path_factory, full_config_ini):
+        d = tmp_path_factory.mktemp('fleet')
+        with open(full_config_ini) as fp:
+            content = fp.read()
+
+        paths = []
+        for n in range(6):
+            f = d.joinpath('member_{}.ini'.format(n))
+            f.write_text(content.replace('0.2', '0.{}'.format(n + 2)))
+            paths.append(str(f))
+
+        return paths + [str(d.joinpath('missing.ini'))]
+
+    @pytest.mark.parametrize('workers', [None, 2])
+    def test_matches_single_validation(self, paths, master_ini, workers):
+        results = list(validate_many(paths, master_files=master_ini,
+                                     workers=workers, chunksize=2))
+
+        assert sorted(r.path for r in results) == sorted(paths)
+
+        for r in results:
+            if r.path.endswith('missing.ini'):
+                assert r.failure.startswith('OSError')
+                continue
+
+            ucfg = get_user_config(r.path, master_files=master_ini)
+            assert r.failure is None
+            assert (r.warnings, r.errors) == check_config(ucfg)
+            assert r.cfg == ucfg.cfg
+
+    def test_lazy_iterable(self, paths, full_mcfg):
+        """
+        Paths can come from a generator and configs can be left out
+        """
+        results = validate_many((p for p in paths[:3]), mcfg=full_mcfg,
+                                workers=2, chunksize=1, return_cfg=False)
+
+        assert [r.cfg for r in results] == [None] * 3
+
+
+class TestResultCache:
+
+    @pytest.fixture
+    def files(self, config_files):
+        """
+        Master with an int and a filename item and a config using both
+        """
+        return config_files("[settings]\nnum_users: 2\nlog: log.txt\n",
+                            files={'log.txt': ''})
+
+    @pytest.fixture(params=[None, 'results'])
+    def cache(self, request, tmp_path):
+        if request.param is None:
+            return ResultCache()
+        return ResultCache(path=str(tmp_path.joinpath(request.param)))
+
+    def validate(self, files, cache, **kwargs):
+        ucfg = get_user_config(files[0], master_files=files[1], cache=cache,
+                               **kwargs)
+        return ucfg, check_config(ucfg)
+
+    def test_reuse(self, files, cache):
+        """
+        The same config is only validated once and the result matches
+        """
+        ucfg, issues = self.validate(files, cache)
+        cached, cached_issues = self.validate(files, cache)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cached is not ucfg
+        assert cached.cfg == ucfg.cfg
+        assert cached_issues == issues
+
+    def test_persistent(self, files, tmp_path):
+        self.validate(files, ResultCache(path=str(tmp_path.joinpath('r'))))
+
+        cache = ResultCache(path=str(tmp_path.joinpath('r')))
+        self.validate(files, cache)
+        assert cache.hits == 1
+
+        cache.clear()
+        self.validate(files, cache)
+        assert cache.misses == 1
+
+    @pytest.mark.parametrize('f, text', [
+        ('config.ini', "[settings]\nnum_users: two\n"),
+        ('master.ini', "[settings]\nnum_users:\ntype = float,\n"
+                       "description = users\n"),
+    ])
+    def test_key_changes(self, files, cache, tmp_path, f, text):
+        """
+        Editing the config or the master config invalidates the result
+        """
+        _, issues = self.validate(files, cache)
+
+        tmp_path.joinpath(f).write_text(text)
+        _, new_issues = self.validate(files, cache)
+
+        assert (cache.hits, cache.misses) == (0, 2)
+        assert new_issues != issues
+
+    def test_text(self, files, cache):
+        text = "[settings]\nnum_users: two\n"
+        _, issues = self.validate(files, cache, text=text)
+        _, cached_issues = self.validate(files, cache, text=text)
+        _, file_issues = self.validate(files, cache)
+
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cached_issues == issues
+        assert len(issues[1]) == 1
+        assert file_issues == ([], [])
+
+    def test_file_system_revalidated(self, files, cache, tmp_path):
+        """
+        Results depending on files that changed are not reused
+        """
+        self.validate(files, cache)
+
+        tmp_path.joinpath('log.txt').unlink()
+        _, issues = self.validate(files, cache)
+
+        assert cache.stale == 1
+        assert len(issues[0]) == 1
+
+        self.validate(files, cache)
+        assert cache.hits == 1
+
+    def test_checksum_tampered(self, tmp_path, config_files):
+        """
+        A file changed after its config was cached no longer matches the
+        digest given with it in the config
+        """
+        import hashlib
+
+        digest = hashlib.sha256(b'elevation').hexdigest()
+        files = config_files(
+            "[topo]\ndem: dem.nc sha256:{}\n".format(digest),
+            master="[topo]\ndem:\ntype = checksummedfilename,\n"
+                   "description = digital elevation model\n",
+            files={'dem.nc': b'elevation'})
+        data = tmp_path.joinpath('dem.nc')
+
+        cache = ResultCache(path=str(tmp_path.joinpath('results')))
+
+        assert self.validate(files, cache)[1] == ([], [])
+        assert self.validate(files, cache)[1] == ([], [])
+        assert cache.hits == 1
+
+        data.write_bytes(b'tampered!')
+        _, issues = self.validate(files, cache)
+
+        assert cache.stale == 1
+        assert len(issues[1]) == 1
+        assert 'does not match its sha256 checksum' in issues[1][0]
+
+    @pytest.mark.skipif(not hasattr(os, 'getuid'),
+                        reason="Ownership is not checked on this platform")
+    def test_untrusted_files_ignored(self, files, tmp_path):
+        """
+        Results in a directory or file others can write to are not used
+        """
+        path = tmp_path.joinpath('results')
+        cache = ResultCache(path=str(path))
+
+        assert stat.S_IMODE(os.stat(str(path)).st_mode) & 0o077 == 0
+
+        self.validate(files, cache)
+        self.validate(files, cache)
+        assert cache.hits == 1
+
+        # Files writable by others
+        pickled = [f for f in path.iterdir() if f.suffix == '.pickle']
+        assert len(pickled) == 1
+        os.chmod(str(pickled[0]), 0o666)
+        self.validate(files, cache)
+        assert cache.misses == 2
+
+        # Directories writable by others, nothing is read or saved
+        cache.clear()
+        os.chmod(str(path), 0o777)
+        self.validate(files, cache)
+        self.validate(files, cache)
+        assert cache.misses == 4
+        assert list(path.iterdir()) == []
+
+        # Files owned by another user
+        if os.getuid() == 0:
+            os.chmod(str(path), 0o700)
+            self.validate(files, cache)
+            pickled = [f for f in path.iterdir() if f.suffix == '.pickle']
+            os.chown(str(pickled[0]), 12345, -1)
+            self.validate(files, cache)
+            assert cache.misses == 6
+
+    def test_required_changes_not_cached(self, old_smrf_config_ini,
+                                         master_ini, changelog_ini):
+        cache = ResultCache()
+
+        for n in range(2):
+            get_user_config(old_smrf_config_ini, master_files=master_ini,
+                            changelog_file=changelog_ini, cli=True,
+                            cache=cache)
+
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_lazy_not_cached(self, files, cache):
+        self.validate(files, cache, lazy=True)
+        assert (cache.hits, cache.misses) == (0, 0)
+
+
+
 @pytest.mark.parametrize("section, item, str_value, expected_type", [
     ('time', 'start_date', "10-1-2019", datetime),
     ('air_temp', 'dk_ncores', "1.0", int),
@@ -59,6 +547,33 @@ def test_cast_all_variables(full_config_ini, core_ini, section, item, str_value,
     assert type(ucfg.cfg[section][item]) == expected_type
 
 
+class TestLazyCasting:
+
+    @pytest.fixture(scope='class')
+    @classmethod
+    def lazy_ucfg(cls, full_config_ini, master_ini):
+        return get_user_config(full_config_ini, master_files=master_ini,
+                               lazy=True)
+
+    def test_cast_on_access(self, lazy_ucfg):
+        """
+        Values are only casted when they are accessed
+        """
+        section = lazy_ucfg.cfg['time']
+        assert not section.is_cast('end_date')
+        assert isinstance(section['end_date'], datetime)
+        assert section.is_cast('end_date')
+
+    def test_lazy_matches_eager(self, lazy_ucfg, full_ucfg):
+        """
+        Lazily casted configs produce the same values and checks
+        """
+        for section, items in full_ucfg.cfg.items():
+            assert dict(lazy_ucfg.cfg[section]) == dict(items)
+
+        assert check_config(lazy_ucfg) == check_config(full_ucfg)
+
+
 def test_get_user_config_exception():
     """
     Tests getting the user config
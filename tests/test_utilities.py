@@ -7,11 +7,14 @@ test_utilities
 Tests for `inicheck.utilities` module.
 """
 from datetime import datetime, date
+import dateparser
 import pytest
+from inicheck import utilities
 from inicheck.tools import get_inicheck_cmd
 from inicheck.utilities import parse_date, remove_comment, \
     remove_chars, mk_lst, is_valid, is_kw_matched, get_kw_match, \
-    get_relative_to_cfg, find_options_in_recipes
+    get_relative_to_cfg, find_options_in_recipes, parse_date_string, \
+    get_ordered_pairs, DATEPARSER_SETTINGS
 
 
 @pytest.mark.parametrize("value, expected", [
@@ -153,6 +156,22 @@ def test_get_inicheck_cmd(full_config_ini):
     assert cmd == 'inicheck -f {} -m inicheck'.format(full_config_ini)
 
 
+def test_get_ordered_pairs():
+    """
+    Items are paired by name before falling back to the first opposite
+    """
+    pairs = get_ordered_pairs(('stop_sim', 'start_date', 'begin_sim',
+                               'end_date', 'start_decay', 'time_step'))
+
+    assert pairs == {'start_date': ('end_date', True),
+                     'begin_sim': ('stop_sim', True),
+                     'start_decay': ('stop_sim', True),
+                     'stop_sim': ('begin_sim', False),
+                     'end_date': ('start_date', False)}
+
+    assert get_ordered_pairs(('start_date',)) == {'start_date': (None, True)}
+
+
 class TestUtilitiesDateParse():
     def test_string_date_only(self):
         """
@@ -196,3 +215,44 @@ class TestUtilitiesDateParse():
     def test_parse_date_fails_with_unknown_string(self):
         with pytest.raises(TypeError):
             parse_date("10 F")
+
+    @pytest.mark.parametrize('value', [
+        '2019-10-01', '2019-10-1 10:00', '2019-10-01T10:00:30',
+        '1998-01-14 15:00:00.5', '2019/10/01', '1-02-2019', '10/01/2019 10:00',
+        '13-01-2019', '1 October 2019', '2019-10-01T10:00:00+02:00'
+    ])
+    def test_matches_dateparser(self, value):
+        """
+        The faster formats read dates the same as dateparser does
+        """
+        expected = dateparser.parse(value, settings=DATEPARSER_SETTINGS)
+        assert parse_date(value) == expected
+
+    @pytest.mark.parametrize('value', [
+        '2019-10-01', '2019-10-01T10:00:30', '1998-01-14 15:00:00.5',
+        '2019-10-01T10:00:00+02:00'
+    ])
+    def test_without_fromisoformat(self, monkeypatch, value):
+        """
+        Python 3.6 has no datetime.fromisoformat, ISO dates still parse
+        """
+        monkeypatch.setattr(utilities, 'HAS_FROMISOFORMAT', False)
+        parse_date_string.cache_clear()
+
+        expected = dateparser.parse(value, settings=DATEPARSER_SETTINGS)
+        assert parse_date(value) == expected
+
+        parse_date_string.cache_clear()
+
+    @pytest.mark.parametrize('value', ['02-31-20', '2019-02-30', '2019-10-1 25:00'])
+    def test_parse_date_fails_invalid_date(self, value):
+        with pytest.raises(TypeError):
+            parse_date(value)
+
+    def test_memoized(self):
+        parse_date_string.cache_clear()
+
+        for n in range(3):
+            parse_date("2019-10-1 10:00")
+
+        assert parse_date_string.cache_info().hits == 2
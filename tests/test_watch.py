@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from inicheck.tools import check_config, get_user_config
+from inicheck.watch import ConfigWatcher
+
+from .conftest import MASTER
+
+CONFIG = "[settings]\nnum_users: 2\nlog: log.txt\n"
+
+
+def rewrite(path, text):
+    """
+    Rewrites a file making sure its modification time changes
+    """
+    st = os.stat(path)
+
+    with open(path, 'w') as fp:
+        fp.write(text)
+
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def watcher(config_files):
+    config, master = config_files(CONFIG, files={'log.txt': ''})
+
+    return ConfigWatcher(config, master_files=master)
+
+
+class TestConfigWatcher():
+
+    def test_requires_master(self, tmp_path):
+        with pytest.raises(IOError):
+            ConfigWatcher(str(tmp_path.joinpath('config.ini')))
+
+    def test_no_changes(self, watcher):
+        assert watcher.poll() is None
+        assert watcher.full_runs == 1
+
+    @pytest.mark.parametrize('text, diff, full_runs, incremental_runs', [
+        # Same contents
+        (CONFIG, [0, 0, 0, 0], 1, 1),
+        # Changed value
+        (CONFIG.replace('2', 'two'), [0, 1, 0, 0], 1, 1),
+        # Added item
+        (CONFIG + "time_out: 5\n", [1, 0, 0, 0], 2, 0),
+        # Removed item
+        (CONFIG.replace('log: log.txt\n', ''), [0, 0, 0, 0], 2, 0),
+        # Changed path
+        (CONFIG.replace('log.txt', 'missing.txt'), [1, 0, 0, 0], 1, 1),
+        # Unknown section
+        (CONFIG + "[other]\nitem: 1\n", [0, 1, 0, 0], 2, 0),
+        # Unreadable
+        ("not a config", [0, 0, 0, 0], 2, 0),
+    ])
+    def test_poll(self, watcher, text, diff, full_runs, incremental_runs):
+        """
+        Changes to the config are validated incrementally when possible and
+        the result always matches validating from scratch
+        """
+        rewrite(watcher.config_file, text)
+
+        assert [len(d) for d in watcher.poll()] == diff
+        assert watcher.full_runs == full_runs
+        assert watcher.incremental_runs == incremental_runs
+
+        if watcher.failure is None:
+            ucfg = get_user_config(watcher.config_file, mcfg=watcher.mcfg)
+            warnings, errors = check_config(ucfg)
+
+            assert sorted(warnings) == sorted(watcher.warnings)
+            assert sorted(errors) == sorted(watcher.errors)
+
+    def test_edit_during_validation(self, watcher, monkeypatch):
+        """
+        An edit saved while the previous one is being validated is
+        validated by the next poll
+        """
+        update = watcher.update
+
+        def edit_while_updating():
+            update()
+            rewrite(watcher.config_file, CONFIG.replace('2', 'two'))
+
+        monkeypatch.setattr(watcher, 'update', edit_while_updating)
+        rewrite(watcher.config_file, CONFIG.replace('2', '3'))
+
+        assert watcher.poll() is not None
+        assert watcher.errors == []
+
+        monkeypatch.setattr(watcher, 'update', update)
+        new_w, new_e, res_w, res_e = watcher.poll()
+
+        assert len(new_e) == 1
+        assert 'num_users' in new_e[0]
+
+    def test_poll_resolved(self, watcher):
+        rewrite(watcher.config_file, CONFIG.replace('2', 'two'))
+        watcher.poll()
+
+        rewrite(watcher.config_file, CONFIG)
+        assert [len(d) for d in watcher.poll()] == [0, 0, 0, 1]
+        assert watcher.errors == []
+        assert watcher.incremental_runs == 2
+
+    def test_poll_failure_recovers(self, watcher):
+        rewrite(watcher.config_file, "not a config")
+        watcher.poll()
+        assert watcher.failure is not None
+
+        rewrite(watcher.config_file, CONFIG.replace('2', 'two'))
+        assert [len(d) for d in watcher.poll()] == [0, 1, 0, 0]
+        assert watcher.failure is None
+
+    def test_poll_master(self, watcher):
+        """
+        A changed master starts over, a broken one keeps the last results
+        """
+        master = watcher.mcfg.paths[0]
+
+        rewrite(master, MASTER.replace('type = int', 'type = bool'))
+        assert [len(d) for d in watcher.poll()] == [0, 1, 0, 0]
+        assert watcher.full_runs == 2
+
+        rewrite(master, "not a master")
+        assert watcher.poll() == ([], [], [], [])
+        assert watcher.failure is not None
+        assert len(watcher.errors) == 1